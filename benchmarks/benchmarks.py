@@ -0,0 +1,6 @@
+# Benchmarks for asv (airspeed velocity). The suites themselves live in
+# pynitefields.bench, which can also be run directly with
+# python -m pynitefields.bench.
+
+from pynitefields.bench import (FieldBenchmarks, SelfDualBasisBenchmarks,
+                                ParallelBenchmarks, ErasureBenchmarks, TowerBenchmarks)
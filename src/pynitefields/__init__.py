@@ -1,3 +1,18 @@
 from pynitefields.galoisfield import *
 from pynitefields.fieldelement import *
+from pynitefields.fieldbasis import *
+from pynitefields.normalbasis import *
+from pynitefields.polynomial import *
 from pynitefields.pthrootofunity import *
+from pynitefields.subproducttree import *
+from pynitefields.factorization import *
+from pynitefields.fieldmatrix import *
+from pynitefields.binarymatrix import *
+from pynitefields.parallel import *
+from pynitefields.reedsolomon import *
+from pynitefields.memory import memory_usage
+from pynitefields.discretelog import *
+from pynitefields.subfield import *
+from pynitefields.towerfield import *
+from pynitefields.characters import *
+from pynitefields.profiling import FieldProfiler
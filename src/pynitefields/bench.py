@@ -0,0 +1,498 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# bench.py: Benchmarks of field construction and arithmetic.
+#
+# © 2016 Olivia Di Matteo (odimatte@uwaterloo.ca)
+#
+# This file is part of the project PyniteFields.
+#
+# Licensed under BSD-3-Clause
+#
+# Run the whole suite with
+#
+#     python -m pynitefields.bench [--quick] [--filter TEXT] [--output FILE]
+#                                  [--baseline FILE] [--threshold RATIO]
+#
+# The benchmark classes follow the conventions of asv (airspeed velocity):
+# params and param_names, a setup method, and time_* methods, so the same
+# classes are picked up by asv from the benchmarks/ directory.
+#
+
+import sys
+import json
+import time
+import argparse
+import datetime
+import itertools
+import platform
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from pynitefields.galoisfield import GaloisField, tr, gchar
+from pynitefields.reedsolomon import ReedSolomon
+from pynitefields.parallel import (parallel_mul, parallel_mul_add, parallel_matvec,
+                                   DEFAULT_CHUNK_SIZE)
+
+# The exponents n benchmarked for each characteristic p.
+FIELD_SIZES = {2: [2, 3, 4, 5, 8, 12], 3: [2, 3, 5, 7], 5: [1, 2, 3, 4, 5], 7: [1, 2, 3, 4]}
+
+# With --quick, only fields up to this size are benchmarked.
+QUICK_MAX_DIM = 256
+
+# The number of elements in the arrays of the bulk benchmarks, and of
+# FieldElements in the scalar ones.
+BULK_SIZE = 1 << 16
+SCALAR_SIZE = 256
+
+# Polynomials and self-dual bases from the table in the README.
+SELF_DUAL_BASES = {(2, 2): ([1, 1, 1], [1, 2]),
+                   (2, 3): ([1, 1, 0, 1], [3, 5, 6]),
+                   (2, 4): ([1, 1, 0, 0, 1], [3, 7, 12, 13]),
+                   (2, 5): ([1, 0, 1, 0, 0, 1], [3, 5, 11, 22, 24]),
+                   (2, 8): ([1, 0, 1, 1, 1, 0, 0, 0, 1], [5, 18, 30, 44, 106, 135, 147, 249])}
+
+_fields = {}
+
+def field_names(quick = False):
+    """ The names "p^n" of the benchmarked fields, smallest first within each p. """
+    return [str(p) + "^" + str(n) for p in sorted(FIELD_SIZES) for n in FIELD_SIZES[p]
+            if not quick or p ** n <= QUICK_MAX_DIM]
+
+
+def primitive_polynomial(p, n):
+    """ Find a primitive polynomial of degree n over GF(p).
+
+        The candidates are tried in order, and x is checked to have order
+        exactly :math:`p^n - 1` modulo each; this also proves that the
+        polynomial is irreducible.
+
+        Returns:
+            The coefficients, constant term first, as taken by GaloisField.
+    """
+    order = p ** n - 1
+    factors = [q for q in range(2, order + 1) if order % q == 0 and
+               all([q % d != 0 for d in range(2, int(q ** 0.5) + 1)])]
+    one = [1] + [0] * (n - 1)
+    for tail in itertools.product(range(p), repeat = n):
+        coefs = list(tail[::-1]) + [1]
+        if coefs[0] == 0:
+            continue
+        if (_x_power(coefs, order, p) == one and
+                all([_x_power(coefs, order // q, p) != one for q in factors])):
+            return coefs
+
+
+def make_field(name):
+    """ The (cached) field with the given name "p^n". """
+    if name not in _fields:
+        p, n = [int(part) for part in name.split("^")]
+        _fields[name] = GaloisField(p) if n == 1 else GaloisField(p, n, _field_polynomial(p, n))
+    return _fields[name]
+
+
+class FieldBenchmarks():
+    """ Construction, arithmetic, traces and evaluation in each field. """
+    params = [field_names()]
+    param_names = ["field"]
+
+    def setup(self, name):
+        self.field = field = make_field(name)
+        rng = np.random.RandomState(0)
+        self.a = rng.randint(0, field.dim, BULK_SIZE)
+        self.b = rng.randint(1, field.dim, BULK_SIZE)
+        self.x = [field[int(i)] for i in rng.randint(1, field.dim, SCALAR_SIZE)]
+        self.y = [field[int(i)] for i in rng.randint(1, field.dim, SCALAR_SIZE)]
+        self.curve = [field[int(i)] for i in rng.randint(0, field.dim, 6)]
+        self.curve_indices = np.array([c.prim_power for c in self.curve])
+
+    def time_construction(self, name):
+        field = self.field
+        if field.n == 1:
+            GaloisField(field.p)
+        else:
+            GaloisField(field.p, field.n, _field_polynomial(field.p, field.n))
+
+    def time_scalar_add(self, name):
+        for x, y in zip(self.x, self.y):
+            x + y
+
+    def time_scalar_mul(self, name):
+        for x, y in zip(self.x, self.y):
+            x * y
+
+    def time_scalar_div(self, name):
+        for x, y in zip(self.x, self.y):
+            x / y
+
+    def time_scalar_pow(self, name):
+        for x in self.x:
+            x ** 5
+
+    def time_scalar_inv(self, name):
+        for y in self.y:
+            y.inv()
+
+    def time_bulk_add(self, name):
+        self.field.add(self.a, self.b)
+
+    def time_bulk_mul(self, name):
+        self.field.mul(self.a, self.b)
+
+    def time_bulk_div(self, name):
+        self.field.div(self.a, self.b)
+
+    def time_bulk_power(self, name):
+        self.field.power(self.a, 5)
+
+    def time_bulk_invert(self, name):
+        self.field.invert(self.b)
+
+    def time_trace(self, name):
+        for x in self.x:
+            tr(x)
+
+    def time_gchar(self, name):
+        for x in self.x:
+            gchar(x)
+
+    def time_evaluate(self, name):
+        for x in self.x:
+            self.field.evaluate(self.curve, x)
+
+    def time_evaluate_all(self, name):
+        self.field.evaluate_all(self.curve_indices)
+
+
+class SelfDualBasisBenchmarks():
+    """ Switching to and checking self-dual bases, for the fields that have
+        one in SELF_DUAL_BASES.
+    """
+    params = [[str(p) + "^" + str(n) for (p, n) in sorted(SELF_DUAL_BASES)]]
+    param_names = ["field"]
+
+    def setup(self, name):
+        self.field = make_field(name)
+        self.sdb = SELF_DUAL_BASES[(self.field.p, self.field.n)][1]
+
+    def time_to_sdb(self, name):
+        # to_sdb keeps the basis it builds; drop it, so that each call
+        # times the conversion rather than a lookup
+        self.field._basis_views.clear()
+        self.field.to_sdb(self.sdb)
+        self.field.to_poly()
+
+    def time_verify_sdb(self, name):
+        self.field.verify_sdb(self.sdb)
+
+
+class ParallelBenchmarks():
+    """ The threaded bulk operations over GF(2^8) with different numbers of threads. """
+    params = [[1, 2, 4, 8]]
+    param_names = ["workers"]
+
+    def setup(self, workers):
+        self.field = make_field("2^8")
+        rng = np.random.RandomState(0)
+        self.a, self.b, self.c = rng.randint(0, 256, (3, 1 << 20))
+        self.matrix, self.vector = self.a.reshape(1024, 1024), self.b[:1024]
+        self.executor = ThreadPoolExecutor(max_workers = workers)
+
+    def teardown(self, workers):
+        self.executor.shutdown()
+
+    def time_mul(self, workers):
+        parallel_mul(self.field, self.a, self.b, executor = self.executor)
+
+    def time_mul_add(self, workers):
+        parallel_mul_add(self.field, self.c, self.a, self.b, executor = self.executor)
+
+    def time_matvec(self, workers):
+        parallel_matvec(self.field, self.matrix, self.vector, executor = self.executor)
+
+
+class ErasureBenchmarks():
+    """ Encoding and decoding 10 MB with a (10, 4) code over GF(2^8). """
+    params = [["rs", "cauchy"]]
+    param_names = ["code"]
+
+    def setup(self, code):
+        self.code = ReedSolomon(make_field("2^8"), 10, 4, cauchy = (code == "cauchy"))
+        rng = np.random.RandomState(0)
+        self.data = [rng.randint(0, 256, 1 << 20).astype(np.uint8).tobytes() for j in range(10)]
+        self.damaged = [None] * 4 + (self.data + self.code.encode(self.data))[4:]
+
+    def time_encode(self, code):
+        self.code.encode(self.data)
+
+    def time_decode(self, code):
+        self.code.decode(self.damaged)
+
+
+class TowerBenchmarks():
+    """ Bulk arithmetic in tower fields against the flat fields of the same
+        order; GF(2^16) is lazy, with only its coefficient table.
+    """
+    params = [["2^8", "(2^4)^2", "2^16", "(2^8)^2"]]
+    param_names = ["representation"]
+
+    def setup(self, name):
+        rng = np.random.RandomState(0)
+        if name == "2^8":
+            self.field = make_field("2^8")
+        elif name == "2^16":
+            self.field = GaloisField(2, 16, primitive_polynomial(2, 16), memory_limit = 1 << 24)
+        elif name == "(2^4)^2":
+            self.field = make_field("2^4").extend([1, 1, 15])
+        else:
+            self.field = make_field("2^8").extend([7, 1, 255])
+        if isinstance(self.field, GaloisField):
+            self.a, self.b = rng.randint(1, self.field.dim, (2, BULK_SIZE))
+        else:
+            self.a, self.b = rng.randint(1, self.field.base.dim, (2, BULK_SIZE, 2)).astype(self.field.dtype)
+
+    def time_mul(self, name):
+        self.field.mul(self.a, self.b)
+
+    def time_invert(self, name):
+        self.field.invert(self.a)
+
+
+BENCHMARKS = [FieldBenchmarks, SelfDualBasisBenchmarks, ParallelBenchmarks, ErasureBenchmarks, TowerBenchmarks]
+
+def run(quick = False, pattern = None, repeat = 3, min_time = 0.02, log = None):
+    """ Run the benchmarks.
+
+        Each benchmark is called enough times in a row to take at least
+        min_time seconds, and this is repeated; the best time per call is kept.
+
+        Args:
+            quick (bool): Only use fields up to QUICK_MAX_DIM elements.
+            pattern (str): Only run benchmarks whose names contain this.
+            repeat (int): The number of timings of each benchmark.
+            min_time (float): The least duration of each timing, in seconds.
+            log (file): Where to print each result as it comes, if anywhere.
+
+        Returns:
+            A dict from benchmark names, "Class.method[param]", to seconds.
+    """
+    allowed = set(field_names(quick))
+    results = {}
+    for suite in BENCHMARKS:
+        methods = sorted([name for name in dir(suite) if name.startswith("time_")])
+        for param in suite.params[0]:
+            if suite.param_names == ["field"] and param not in allowed:
+                continue
+            names = [suite.__name__ + "." + method + "[" + str(param) + "]" for method in methods]
+            selected = [(name, method) for name, method in zip(names, methods)
+                        if pattern is None or pattern in name]
+            if len(selected) == 0:
+                continue
+
+            instance = suite()
+            instance.setup(param)
+            for name, method in selected:
+                function = getattr(instance, method)
+                results[name] = _time(lambda: function(param), repeat, min_time)
+                if log is not None:
+                    print("{0:<55} {1:12.3e} s".format(name, results[name]), file = log)
+            if hasattr(instance, "teardown"):
+                instance.teardown(param)
+    return results
+
+
+def save(results, filename):
+    """ Write results to a JSON file, along with a description of the machine. """
+    document = {"date": datetime.datetime.now().isoformat(),
+                "machine": {"python": platform.python_version(), "numpy": np.__version__,
+                            "platform": platform.platform(), "processor": platform.processor()},
+                "results": results}
+    with open(filename, "w") as output:
+        json.dump(document, output, indent = 2, sort_keys = True)
+
+
+def load(filename):
+    """ Read the results saved in a JSON file. """
+    with open(filename) as source:
+        return json.load(source)["results"]
+
+
+def compare(results, baseline, threshold = 1.25):
+    """ Find the benchmarks that got slower than a baseline.
+
+        Args:
+            results (dict): New results, from run.
+            baseline (dict): Old results, from run or load.
+            threshold (float): The ratio of new to old time above which a
+                benchmark counts as a regression.
+
+        Returns:
+            A list of (name, old seconds, new seconds, ratio), worst first, for
+            the benchmarks in both sets that regressed.
+    """
+    regressions = []
+    for name in results:
+        if name in baseline and baseline[name] > 0:
+            ratio = results[name] / baseline[name]
+            if ratio > threshold:
+                regressions.append((name, baseline[name], results[name], ratio))
+    return sorted(regressions, key = lambda row: -row[3])
+
+
+def parallel_scaling(field = None, size = 1 << 22, workers = (1, 2, 4, 8),
+                     chunk_size = DEFAULT_CHUNK_SIZE, repeat = 3):
+    """ Time the threaded bulk operations for different numbers of threads.
+
+        Args:
+            field (GaloisField): The field to work in; GF(2^8) by default.
+            size (int): The number of elements of the arrays (and of entries
+                of the matrix, for the matrix-vector product).
+            workers (tuple): The numbers of threads to try.
+            chunk_size (int): The chunk size passed to the operations.
+            repeat (int): Each timing is the best of this many runs.
+
+        Returns:
+            A list of dicts with the operation, number of threads, time in
+            seconds, and speedup over the first number of threads.
+    """
+    if field is None:
+        field = make_field("2^8")
+    rng = np.random.RandomState(0)
+    a, b, c = [rng.randint(0, field.dim, size) for i in range(3)]
+    side = int(np.sqrt(size))
+    matrix, vector = a[:side * side].reshape(side, side), b[:side]
+
+    operations = [("mul", lambda ex: parallel_mul(field, a, b, chunk_size, ex)),
+                  ("mul_add", lambda ex: parallel_mul_add(field, c, a, b, chunk_size, ex)),
+                  ("matvec", lambda ex: parallel_matvec(field, matrix, vector, chunk_size, ex))]
+
+    results = []
+    for name, operation in operations:
+        baseline = None
+        for count in workers:
+            with ThreadPoolExecutor(max_workers = count) as executor:
+                seconds = _time(lambda: operation(executor), repeat, 0)
+            baseline = seconds if baseline is None else baseline
+            results.append({"operation": name, "workers": count, "seconds": seconds,
+                            "speedup": baseline / seconds})
+    return results
+
+
+def erasure_throughput(k = 10, m = 4, shard_size = 1 << 20, cauchy = False, repeat = 3):
+    """ Measure the single-threaded throughput of erasure coding over GF(2^8).
+
+        Args:
+            k (int): The number of data shards.
+            m (int): The number of parity shards.
+            shard_size (int): The number of bytes in each shard.
+            cauchy (bool): Whether to use a Cauchy code.
+            repeat (int): Each timing is the best of this many runs.
+
+        Returns:
+            A dict with the encoding and decoding rates in MB/s of data, where
+            decoding recovers min(k, m) lost data shards.
+    """
+    code = ReedSolomon(make_field("2^8"), k, m, cauchy)
+    rng = np.random.RandomState(0)
+    data = [rng.randint(0, 256, shard_size).astype(np.uint8).tobytes() for j in range(k)]
+    shards = data + code.encode(data)
+    lost = min(k, m)
+    damaged = [None] * lost + shards[lost:]
+
+    megabytes = k * shard_size / 1e6
+    return {"k": k, "m": m, "cauchy": cauchy,
+            "encode": megabytes / _time(lambda: code.encode(data), repeat, 0),
+            "decode": megabytes / _time(lambda: code.decode(damaged), repeat, 0)}
+
+
+def main(arguments = None):
+    """ Run the suite from the command line; the exit status is 1 if there
+        are regressions against the baseline.
+    """
+    parser = argparse.ArgumentParser(prog = "python -m pynitefields.bench",
+                                     description = "Benchmark PyniteFields.")
+    parser.add_argument("--quick", action = "store_true",
+                        help = "only benchmark fields of up to " + str(QUICK_MAX_DIM) + " elements")
+    parser.add_argument("--filter", default = None, help = "only run benchmarks whose names contain this")
+    parser.add_argument("--repeat", type = int, default = 3, help = "timings of each benchmark")
+    parser.add_argument("--output", default = None, help = "save the results to this JSON file")
+    parser.add_argument("--baseline", default = None, help = "compare with results saved in this JSON file")
+    parser.add_argument("--threshold", type = float, default = 1.25,
+                        help = "slowdown ratio flagged as a regression (default 1.25)")
+    options = parser.parse_args(arguments)
+
+    results = run(options.quick, options.filter, options.repeat, log = sys.stdout)
+    if options.output is not None:
+        save(results, options.output)
+    if options.baseline is None:
+        return 0
+
+    regressions = compare(results, load(options.baseline), options.threshold)
+    for name, old, new, ratio in regressions:
+        print("REGRESSION {0}: {1:.3e} s -> {2:.3e} s (x{3:.2f})".format(name, old, new, ratio))
+    if len(regressions) == 0:
+        print("No regressions against " + options.baseline + ".")
+    return 1 if len(regressions) > 0 else 0
+
+
+def _field_polynomial(p, n):
+    """ The polynomial used for the benchmark field GF(p^n). """
+    if (p, n) in SELF_DUAL_BASES:
+        return SELF_DUAL_BASES[(p, n)][0]
+    return primitive_polynomial(p, n)
+
+
+def _x_power(coefs, exponent, p):
+    """ The coefficients of :math:`x^e` modulo a monic polynomial over GF(p). """
+    n = len(coefs) - 1
+    result, base = [1] + [0] * (n - 1), [0, 1] + [0] * (n - 2) if n > 1 else [(-coefs[0]) % p]
+    while exponent > 0:
+        if exponent & 1:
+            result = _mul_mod(result, base, coefs, p)
+        base = _mul_mod(base, base, coefs, p)
+        exponent >>= 1
+    return result
+
+
+def _mul_mod(a, b, coefs, p):
+    """ The product of two polynomials modulo a monic one, over GF(p). """
+    n = len(coefs) - 1
+    product = [0] * (2 * n - 1)
+    for i, x in enumerate(a):
+        if x:
+            for j, y in enumerate(b):
+                product[i + j] += x * y
+    for i in range(2 * n - 2, n - 1, -1):
+        top = product[i] % p
+        if top:
+            for j in range(n):
+                product[i - n + j] -= top * coefs[j]
+    return [c % p for c in product[:n]]
+
+
+def _time(function, repeat, min_time):
+    """ The best time per call of function, over repeat timings of at least
+        min_time seconds each.
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for i in range(number):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+
+    best = elapsed / number
+    for i in range(repeat - 1):
+        start = time.perf_counter()
+        for j in range(number):
+            function()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+if __name__ == "__main__":
+    sys.exit(main())
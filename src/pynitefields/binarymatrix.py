@@ -0,0 +1,355 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# binarymatrix.py: Bit-packed matrices over GF(2).
+#
+# © 2016 Olivia Di Matteo (odimatte@uwaterloo.ca)
+#
+# This file is part of the project PyniteFields.
+#
+# Licensed under BSD-3-Clause
+#
+
+import numpy as np
+
+from pynitefields.fieldmatrix import FieldMatrix
+
+# The number of rows (or pivots) combined into each lookup table of the
+# Method of Four Russians; tables have 2 ** RUSSIAN_BITS rows.
+RUSSIAN_BITS = 8
+
+class BinaryMatrix():
+    """ A matrix over GF(2) with its rows packed into 64-bit words.
+
+        Column j of a row is bit j % 64 of word j // 64, so adding rows is a
+        XOR of a few words. Products use the Method of Four Russians: the
+        rows of the right-hand matrix are taken 8 at a time, all 256 of their
+        sums are tabulated, and each row of the product picks out one entry
+        of the table per group. Row reduction (M4RI) works the same way,
+        clearing up to 8 columns below and above their pivots at once with a
+        table of sums of the pivot rows.
+
+        Matrices over GF(:math:`2^n`) can be expanded into binary matrices
+        n times larger with from_field_matrix, by replacing every entry with
+        its multiplication matrix. Products, ranks and inverses of the
+        expanded matrices are those of the originals.
+
+        Args:
+            bits (list or np.ndarray): The entries of the matrix, as a
+                2-dimensional array of 0s and 1s.
+
+        Attributes:
+            shape (tuple): The number of rows and columns.
+            words (np.ndarray): The packed rows, as a (rows, ceil(columns / 64))
+                array of 64-bit unsigned integers.
+    """
+
+    def __init__(self, bits):
+        bits = np.asarray(bits)
+        if bits.ndim != 2:
+            raise ValueError("Matrix entries must be two-dimensional.")
+        self.shape = bits.shape
+        self.words = _pack(bits)
+
+
+    @staticmethod
+    def from_words(words, columns):
+        """ Make a matrix straight from packed rows.
+
+            Args:
+                words (np.ndarray): The packed rows, as for the words attribute.
+                    Bits past the last column must be 0.
+                columns (int): The number of columns.
+        """
+        matrix = BinaryMatrix.__new__(BinaryMatrix)
+        matrix.words = np.ascontiguousarray(words, dtype = np.uint64)
+        matrix.shape = (matrix.words.shape[0], columns)
+        return matrix
+
+
+    @staticmethod
+    def identity(size):
+        """ The size x size identity matrix. """
+        return BinaryMatrix(np.eye(size, dtype = np.uint8))
+
+
+    @staticmethod
+    def from_field_matrix(matrix):
+        """ Expand a matrix over GF(:math:`2^n`) into a binary matrix.
+
+            Each entry a is replaced by its n x n multiplication matrix
+            (see GaloisField.multiplication_matrix), so that if the rows of
+            a matrix of coefficients are multiplied by the expansion, the
+            result is the expansion of the product over GF(:math:`2^n`).
+
+            Args:
+                matrix (FieldMatrix): A matrix over a field of characteristic 2.
+
+            Returns:
+                A BinaryMatrix n times as tall and as wide.
+        """
+        field = matrix.field
+        if field.p != 2:
+            raise ValueError("Error, binary matrices need a field of characteristic 2.")
+        rows, columns = matrix.shape
+        blocks = field.multiplication_matrix(matrix.entries)
+        return BinaryMatrix(np.transpose(blocks, (0, 2, 1, 3)).reshape(rows * field.n, columns * field.n))
+
+
+    def to_field_matrix(self, field):
+        """ Collapse the expansion of a matrix over GF(:math:`2^n`).
+
+            Args:
+                field (GaloisField): The field of characteristic 2 the matrix
+                    was expanded from.
+
+            Returns:
+                The FieldMatrix whose expansion this is. Only the first row of
+                each n x n block is read, which holds the coefficients of the
+                entry itself.
+        """
+        n = field.n
+        bits = self.to_array()
+        coefs = bits[::n].reshape(self.shape[0] // n, self.shape[1] // n, n)
+        return FieldMatrix(field, field._indices_from_coefs(coefs.astype(np.int64)))
+
+
+    def to_array(self):
+        """ The entries of the matrix as an array of 0s and 1s. """
+        return _unpack(self.words, self.shape[1])
+
+
+    def __getitem__(self, key):
+        """ The entry (0 or 1) at a given row and column. """
+        row, column = key
+        return int((self.words[row, column // 64] >> np.uint64(column % 64)) & np.uint64(1))
+
+
+    def __add__(self, other):
+        """ Entrywise addition, which is XOR. """
+        if self.shape != other.shape:
+            raise ValueError("Error, cannot add matrices of different shapes.")
+        return BinaryMatrix.from_words(self.words ^ other.words, self.shape[1])
+
+
+    def __matmul__(self, other):
+        """ Matrix multiplication with the Method of Four Russians. """
+        if self.shape[1] != other.shape[0]:
+            raise ValueError("Error, cannot multiply matrices of shapes " +
+                             str(self.shape) + " and " + str(other.shape) + ".")
+        product = np.zeros((self.shape[0], other.words.shape[1]), dtype = np.uint64)
+        for start in range(0, self.shape[1], RUSSIAN_BITS):
+            stop = min(start + RUSSIAN_BITS, self.shape[1])
+            table = _sum_table(other.words[start:stop])
+            product ^= table[_column_bits(self.words, start, stop - start)]
+        return BinaryMatrix.from_words(product, other.shape[1])
+
+
+    def __eq__(self, other):
+        """ Matrices are equal if they have the same entries. """
+        if not isinstance(other, BinaryMatrix):
+            return False
+        return self.shape == other.shape and np.array_equal(self.words, other.words)
+
+
+    def __repr__(self):
+        """ Print the matrix as rows of bits. """
+        return "BinaryMatrix(" + str(self.to_array().tolist()) + ")"
+
+
+    def transpose(self):
+        """ The transpose of the matrix. """
+        return BinaryMatrix(self.to_array().T)
+
+
+    def row_reduce(self):
+        """ Put the matrix in reduced row echelon form with M4RI.
+
+            Returns:
+                A pair (reduced, pivots) of the reduced BinaryMatrix and the
+                list of the columns holding the pivot of each non-zero row.
+        """
+        words, pivots = _row_reduce(self.words, self.shape[1])
+        return BinaryMatrix.from_words(words, self.shape[1]), pivots
+
+
+    def rank(self):
+        """ The rank of the matrix over GF(2). """
+        return len(_row_reduce(self.words, self.shape[1])[1])
+
+
+    def inverse(self):
+        """ The inverse of a square matrix.
+
+            Raises:
+                ZeroDivisionError: If the matrix is singular.
+        """
+        size = self.shape[0]
+        if size != self.shape[1]:
+            raise ValueError("Error, inverse of non-square matrix.")
+        augmented = np.hstack([self.to_array(), np.eye(size, dtype = np.uint8)])
+        words, pivots = _row_reduce(_pack(augmented), 2 * size, size)
+        if len(pivots) < size:
+            raise ZeroDivisionError("Error, matrix is singular.")
+        return BinaryMatrix(_unpack(words, 2 * size)[:, size:])
+
+
+    def nullspace(self):
+        """ A basis of the null space :math:`\\{ x : A x = 0 \\}`.
+
+            Returns:
+                A BinaryMatrix whose rows form a basis of the null space.
+        """
+        words, pivots = _row_reduce(self.words, self.shape[1])
+        columns = self.shape[1]
+        pivot_set = set(pivots)
+        free = [col for col in range(columns) if col not in pivot_set]
+
+        basis = np.zeros((len(free), columns), dtype = np.uint8)
+        basis[np.arange(len(free)), free] = 1
+        if len(pivots) > 0 and len(free) > 0:
+            basis[:, pivots] = _unpack(words[:len(pivots)], columns)[:, free].T
+        return BinaryMatrix(basis)
+
+
+    def solve(self, rhs):
+        """ Solve the linear system :math:`A x = b` over GF(2).
+
+            Args:
+                rhs (np.ndarray or BinaryMatrix): The right hand side b as a
+                    vector of bits, or a BinaryMatrix with one column for each
+                    system to solve.
+
+            Returns:
+                A solution x of the same type as rhs, with free variables 0.
+
+            Raises:
+                ValueError: If the system has no solution.
+        """
+        vector = not isinstance(rhs, BinaryMatrix)
+        b = np.asarray(rhs, dtype = np.uint8).reshape(-1, 1) if vector else rhs.to_array()
+        if b.shape[0] != self.shape[0]:
+            raise ValueError("Error, right hand side has the wrong number of rows.")
+
+        columns = self.shape[1]
+        augmented = np.hstack([self.to_array(), b])
+        words, pivots = _row_reduce(_pack(augmented), augmented.shape[1], columns)
+        reduced = _unpack(words, augmented.shape[1])
+        if np.any(reduced[len(pivots):, columns:]):
+            raise ValueError("Error, the system has no solution.")
+
+        solution = np.zeros((columns, b.shape[1]), dtype = np.uint8)
+        solution[pivots] = reduced[:len(pivots), columns:]
+        return solution[:, 0] if vector else BinaryMatrix(solution)
+
+
+def _pack(bits):
+    """ Pack the rows of an array of bits into 64-bit words. """
+    rows, columns = bits.shape
+    num_words = max(1, -(-columns // 64))
+    padded = np.zeros((rows, num_words * 64), dtype = np.uint8)
+    padded[:, :columns] = np.asarray(bits) & 1
+    packed = np.packbits(padded, axis = 1, bitorder = 'little')
+    return np.ascontiguousarray(packed).view('<u8').astype(np.uint64)
+
+
+def _unpack(words, columns):
+    """ Unpack rows of 64-bit words into an array of bits. """
+    as_bytes = np.ascontiguousarray(words.astype('<u8')).view(np.uint8)
+    return np.unpackbits(as_bytes, axis = 1, bitorder = 'little')[:, :columns]
+
+
+def _column_bits(words, start, count):
+    """ Read count (at most 8) consecutive columns of every row as an integer. """
+    first = (words[:, start // 64] >> np.uint64(start % 64)).astype(np.int64)
+    if start % 64 + count > 64:
+        first |= (words[:, start // 64 + 1] << np.uint64(64 - start % 64)).astype(np.int64)
+    return first & ((1 << count) - 1)
+
+
+def _sum_table(rows):
+    """ All sums of a few packed rows; entry m is the sum of the rows i for
+        which bit i of m is set.
+    """
+    table = np.zeros((1, rows.shape[1]), dtype = np.uint64)
+    for row in rows:
+        table = np.vstack([table, table ^ row])
+    return table
+
+
+def _row_reduce(words, columns, pivot_columns = None):
+    """ Reduced row echelon form by the Method of Four Russians (M4RI).
+
+        Columns are taken in groups. Pivots for a group are looked for by
+        clearing only the bits of the group, which are a few small integers
+        per row. The chosen pivot rows are reduced among themselves, and then
+        a single table lookup per row clears the group from every other row.
+
+        Args:
+            words (np.ndarray): The packed rows of the matrix.
+            columns (int): The number of columns.
+            pivot_columns (int): Only look for pivots among the first columns
+                (e.g. for an augmented matrix). By default, all of them.
+
+        Returns:
+            A pair (words, pivots) of the packed reduced matrix and the list
+            of pivot columns.
+    """
+    words = words.copy()
+    num_rows = words.shape[0]
+    if pivot_columns is None:
+        pivot_columns = columns
+
+    pivots = []
+    start = 0
+    while start < pivot_columns and len(pivots) < num_rows:
+        rank = len(pivots)
+        count = min(RUSSIAN_BITS, pivot_columns - start)
+
+        # Find the pivots of this group of columns using only their bits
+        group = _column_bits(words[rank:], start, count)
+        chosen, chosen_bits, group_pivots = [], [], []
+        for bit in range(count):
+            candidates = np.nonzero((group >> bit) & 1)[0]
+            candidates = candidates[~np.isin(candidates, chosen)]
+            if len(candidates) == 0:
+                continue
+            row = candidates[0]
+            has_bit = ((group >> bit) & 1).astype(bool)
+            has_bit[row] = False
+            group[has_bit] ^= group[row]
+            chosen.append(row)
+            group_pivots.append(start + bit)
+
+        start += count
+        if len(chosen) == 0:
+            continue
+
+        # Move the pivot rows up to the top of the remaining rows
+        chosen = rank + np.array(chosen)
+        rest = np.setdiff1d(np.arange(rank, num_rows), chosen)
+        words[rank:] = words[np.concatenate([chosen, rest])]
+
+        # Reduce the pivot rows among themselves, so that they're the
+        # identity in the pivot columns
+        k = len(group_pivots)
+        for i in range(k):
+            for j in range(k):
+                if i != j and _bit(words[rank + j], group_pivots[i]):
+                    words[rank + j] ^= words[rank + i]
+
+        # Clear the pivot columns from all the other rows at once
+        table = _sum_table(words[rank:rank + k])
+        selectors = np.zeros(num_rows, dtype = np.int64)
+        for i, column in enumerate(group_pivots):
+            selectors |= _column_bits(words, column, 1) << i
+        selectors[rank:rank + k] = 0
+        words ^= table[selectors]
+        pivots.extend(group_pivots)
+
+    return words, pivots
+
+
+def _bit(row, column):
+    """ The bit of a packed row at a given column. """
+    return (int(row[column // 64]) >> (column % 64)) & 1
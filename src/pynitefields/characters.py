@@ -0,0 +1,133 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# characters.py: Additive and multiplicative characters of finite fields,
+#                and Gauss and Jacobi sums computed with the FFT.
+#
+# © 2016 Olivia Di Matteo (odimatte@uwaterloo.ca)
+#
+# This file is part of the project PyniteFields.
+#
+# Licensed under BSD-3-Clause
+#
+
+import numpy as np
+
+from pynitefields.fieldbasis import _as_indices
+
+def additive_characters(field, indices = None):
+    """ Evaluate the canonical additive character on many field elements.
+
+        This is the numerical counterpart of FieldElement.gchar,
+        :math:`\\psi(\\alpha) = \\omega_p^{\\text{tr}(\\alpha)}` with
+        :math:`\\omega_p = e^{2 \\pi i / p}`, using the trace table of the
+        field.
+
+        Args:
+            field (GaloisField): The field.
+            indices (np.ndarray): The indices of the elements. By default,
+                all elements of the field in order.
+
+        Returns:
+            A complex array of the values, with the shape of indices.
+    """
+    return _roots_of_unity(field.traces(indices), field.p)
+
+
+def multiplicative_characters(field, j, indices = None):
+    """ Evaluate multiplicative characters on many field elements.
+
+        The multiplicative group is cyclic of order :math:`N = p^n - 1`,
+        generated by :math:`\\sigma`, so its characters are the
+        :math:`\\chi_j(\\sigma^k) = e^{2 \\pi i jk / N}` for
+        :math:`0 \\leq j < N`, which only need the index of the element. As
+        usual, every character (including the trivial one, :math:`j = 0`)
+        is extended by :math:`\\chi_j(0) = 0`.
+
+        Args:
+            field (GaloisField): The field.
+            j (int or np.ndarray): Which characters to evaluate.
+            indices (np.ndarray): The indices of the elements. By default,
+                all elements of the field in order.
+
+        Returns:
+            A complex array of shape j.shape + indices.shape, of the values
+            of each character on each element.
+    """
+    indices = np.arange(field.dim) if indices is None else np.asarray(_as_indices(indices), dtype = np.int64)
+    order = field.dim - 1
+    logs = field.to_powers(np.where(indices == 0, field._one, indices))
+    exponents = np.multiply.outer(np.asarray(j, dtype = np.int64) % order, logs) % order
+    return np.where(indices == 0, 0, _roots_of_unity(exponents, order))
+
+
+def gauss_sums(field):
+    """ Compute the Gauss sums of all the multiplicative characters at once.
+
+        The Gauss sum of :math:`\\chi_j` is
+
+        .. math::
+
+            G(\\chi_j) = \\sum_{\\alpha \\neq 0} \\chi_j(\\alpha) \\psi(\\alpha)
+                      = \\sum_{k = 0}^{N - 1} e^{2 \\pi i jk / N} \\psi(\\sigma^k),
+
+        so the Gauss sums of all N characters are a single discrete Fourier
+        transform of the additive character along the powers of
+        :math:`\\sigma`, which takes :math:`O(N \\log N)` operations with the
+        FFT rather than :math:`O(N^2)`. For :math:`j \\neq 0`,
+        :math:`|G(\\chi_j)| = p^{n/2}`, and :math:`G(\\chi_0) = -1`.
+
+        Args:
+            field (GaloisField): The field.
+
+        Returns:
+            A complex array whose entry j is :math:`G(\\chi_j)`.
+    """
+    order = field.dim - 1
+    psi = additive_characters(field, field.from_powers(np.arange(order)))
+    return order * np.fft.ifft(psi)
+
+
+def jacobi_sums(field, a = None):
+    """ Compute Jacobi sums of pairs of multiplicative characters.
+
+        The Jacobi sum of :math:`\\chi_a` and :math:`\\chi_b` is
+
+        .. math::
+
+            J(\\chi_a, \\chi_b) = \\sum_{\\alpha} \\chi_a(\\alpha) \\chi_b(1 - \\alpha)
+                               = \\sum_{m = 0}^{N - 1} \\chi_a(1 - \\sigma^m) e^{2 \\pi i bm / N},
+
+        so for a fixed a, the sums for every b are one FFT of
+        :math:`\\chi_a(1 - \\sigma^m)`. For all pairs at once, the sum is the
+        two-dimensional transform of the table with a 1 at
+        :math:`(\\log(1 - \\sigma^m), m)` for each m, which takes
+        :math:`O(N^2 \\log N)` operations and :math:`O(N^2)` memory. The
+        convention :math:`\\chi(0) = 0` is used for every character here, so
+        that :math:`J(\\chi_0, \\chi_0) = p^n - 2`.
+
+        Args:
+            field (GaloisField): The field.
+            a (int): The first character. By default, all of them.
+
+        Returns:
+            A complex array whose entry b is :math:`J(\\chi_a, \\chi_b)` if a
+            is given, or whose entry (a, b) is, if not.
+    """
+    order = field.dim - 1
+    # The elements 1 - sigma^m; only m = 0 gives 0
+    differences = field.sub(field._one, field.from_powers(np.arange(order)))
+
+    if a is not None:
+        weights = multiplicative_characters(field, a, differences)
+        return order * np.fft.ifft(weights)
+
+    logs = field.to_powers(differences[1:])
+    table = np.zeros((order, order))
+    table[logs, np.arange(1, order)] = 1
+    return order * order * np.fft.ifft2(table)
+
+
+def _roots_of_unity(exponents, m):
+    """ The complex numbers :math:`e^{2 \\pi i k / m}` for an array of k. """
+    return np.exp(2j * np.pi * (np.asarray(exponents) % m) / m)
@@ -0,0 +1,365 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# discretelog.py: Discrete logarithms without tables, by Pohlig-Hellman.
+#
+# © 2016 Olivia Di Matteo (odimatte@uwaterloo.ca)
+#
+# This file is part of the project PyniteFields.
+#
+# Licensed under BSD-3-Clause
+#
+
+import math
+import random
+import weakref
+
+import numpy as np
+
+# The most baby steps stored for any prime factor of the group order. Larger
+# factors take more giant steps instead, so that memory stays bounded.
+MAX_BABY_STEPS = 1 << 20
+
+# Solvers already set up, per field
+_solvers = weakref.WeakKeyDictionary()
+
+class DiscreteLog():
+    """ Discrete logarithms in the multiplicative group of a field.
+
+        Finds k such that :math:`\\sigma^k = x`, where :math:`\\sigma` is the
+        primitive element of the field (the smallest primitive root for prime
+        fields), without tables of the whole field. The order
+        :math:`p^n - 1` of the group is factored, and by Pohlig-Hellman the
+        logarithm is found modulo each prime power :math:`q^e` dividing it,
+        one base q digit at a time, with a baby-step giant-step search in
+        the subgroup of order q; the results are put together by the Chinese
+        remainder theorem. Everything computed from the field alone (the
+        factorization, the generators of the subgroups and the baby step
+        tables) is done once, in the constructor; each call to log then
+        works on a whole array of elements at once.
+
+        Elements are given as integers packed as in GaloisField.from_integers:
+        for prime fields, the value of the element, and for extension fields,
+        the polynomial basis coefficients as base p digits. Arithmetic is done
+        on the coefficients directly, so this works in lazy fields too.
+
+        Args:
+            field (GaloisField): The field.
+            max_baby_steps (int): The most baby steps to store for a factor.
+
+        Attributes:
+            field (GaloisField): The field.
+            order (int): The order :math:`p^n - 1` of the multiplicative group.
+            factors (dict): The prime factors of the order, with multiplicities.
+            generator (int): The packed primitive element.
+    """
+    def __init__(self, field, max_baby_steps = MAX_BABY_STEPS):
+        if max_baby_steps < 1:
+            raise ValueError("Error, the number of baby steps must be positive.")
+        self.field = field
+        self.order = field.dim - 1
+        self.factors = factor_integer(self.order)
+        self._arithmetic = _Arithmetic(field)
+
+        arithmetic = self._arithmetic
+        if field.n == 1:
+            self.generator = _primitive_root(field.p, self.factors)
+        else:
+            self.generator = field.p
+        generator = arithmetic.unpack(self.generator)
+
+        # For each prime power q^e: the generator of the subgroup of order q^e,
+        # and the baby steps (sorted packed powers) of the subgroup of order q
+        self._subgroups = []
+        for q, e in sorted(self.factors.items()):
+            sub_generator = arithmetic.power(generator, self.order // q ** e)
+            gamma = arithmetic.power(sub_generator, q ** (e - 1))
+            steps = min(math.isqrt(q - 1) + 1, max_baby_steps)
+            powers = [arithmetic.one()]
+            for _ in range(1, steps):
+                powers.append(arithmetic.mul(powers[-1], gamma))
+            packed = arithmetic.pack(np.stack(powers))
+            order = np.argsort(packed)
+            giant = arithmetic.power(gamma, (-steps) % q)
+            self._subgroups.append((q, e, sub_generator, packed[order], order, giant))
+
+
+    def log(self, values):
+        """ Find the discrete logarithms of many non-zero elements.
+
+            Args:
+                values (np.ndarray): The packed elements (see above).
+
+            Returns:
+                An integer array of the logarithms, in [0, p^n - 1), with the
+                shape of values. Raises a ValueError if an element is 0.
+        """
+        values = np.asarray(values)
+        if np.any(values == 0):
+            raise ValueError("Error, 0 is not a power of the primitive element.")
+        arithmetic = self._arithmetic
+        shape = values.shape
+        x = arithmetic.unpack(values.ravel())
+
+        logs = np.zeros(len(values.ravel()), dtype = object)
+        modulus = 1
+        for q, e, sub_generator, baby, baby_exponents, giant in self._subgroups:
+            # Project onto the subgroup of order q^e, and read off the digits
+            # of the logarithm there from the most significant down
+            target = arithmetic.power(x, self.order // q ** e)
+            inverse = arithmetic.power(sub_generator, q ** e - 1)
+            digits = np.zeros(len(logs), dtype = object)
+            for k in range(e):
+                # Remove the digits found so far; what's left has order q
+                reduced = arithmetic.mul(target, arithmetic.power(inverse, digits))
+                reduced = arithmetic.power(reduced, q ** (e - 1 - k))
+                digits = digits + q ** k * self._bsgs(reduced, q, baby, baby_exponents, giant)
+
+            # Chinese remaindering with what is known so far
+            step = (digits - logs) * pow(modulus, -1, q ** e) % q ** e
+            logs = logs + modulus * step
+            modulus *= q ** e
+
+        return _as_int_array(logs % self.order).reshape(shape)
+
+
+    def exp(self, exponents):
+        """ Compute the powers :math:`\\sigma^k` of the primitive element.
+
+            Args:
+                exponents (np.ndarray): The exponents k.
+
+            Returns:
+                An array of the packed elements, with the shape of exponents.
+        """
+        exponents = np.asarray(exponents, dtype = object)
+        arithmetic = self._arithmetic
+        flat = exponents.ravel() % self.order
+        powers = arithmetic.power(arithmetic.unpack(self.generator), flat)
+        return arithmetic.pack(powers).reshape(exponents.shape)
+
+
+    def _bsgs(self, targets, q, baby, baby_exponents, giant):
+        """ Logarithms of elements of order dividing q, to the base gamma.
+
+            baby holds the sorted packed powers gamma^j, j < m, and giant is
+            gamma^(-m). Targets still unsolved are multiplied by the giant
+            step until they land in the table.
+        """
+        arithmetic = self._arithmetic
+        steps = len(baby)
+        result = np.zeros(len(targets), dtype = object)
+        pending = np.arange(len(targets))
+        current = targets
+        for i in range(-(-q // steps)):
+            packed = arithmetic.pack(current)
+            position = np.minimum(np.searchsorted(baby, packed), steps - 1)
+            found = baby[position] == packed
+            result[pending[found]] = i * steps + baby_exponents[position[found]]
+            pending, current = pending[~found], current[~found]
+            if len(pending) == 0:
+                break
+            current = arithmetic.mul(current, giant)
+        return result
+
+
+def discrete_log(field, values):
+    """ Find discrete logarithms with a DiscreteLog kept for the field.
+
+        The precomputation is done the first time it is needed for a field,
+        and reused from then on.
+
+        Args:
+            field (GaloisField): The field.
+            values (np.ndarray): The packed non-zero elements.
+
+        Returns:
+            An array of their logarithms.
+    """
+    return log_solver(field).log(values)
+
+
+def log_solver(field):
+    """ The DiscreteLog kept for a field, set up the first time it is needed. """
+    if field not in _solvers:
+        _solvers[field] = DiscreteLog(field)
+    return _solvers[field]
+
+
+def factor_integer(m):
+    """ Factor a positive integer.
+
+        Small factors are found by trial division, and the rest with Pollard's
+        rho method (in Brent's form), splitting until every factor passes the
+        Miller-Rabin test.
+
+        Args:
+            m (int): The integer to factor.
+
+        Returns:
+            A dict mapping each prime factor to its multiplicity.
+    """
+    factors = {}
+    m = int(m)
+    for d in [2, 3, 5] + list(range(7, 1000, 2)):
+        while m % d == 0:
+            factors[d] = factors.get(d, 0) + 1
+            m //= d
+    remaining = [m] if m > 1 else []
+    while remaining:
+        m = remaining.pop()
+        if _is_probable_prime(m):
+            factors[m] = factors.get(m, 0) + 1
+        else:
+            d = _pollard_brent(m)
+            remaining += [d, m // d]
+    return dict(sorted(factors.items()))
+
+
+def _is_probable_prime(m):
+    """ Miller-Rabin test; deterministic for m < 3.3 * 10^24. """
+    if m < 2:
+        return False
+    bases = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41]
+    for b in bases:
+        if m % b == 0:
+            return m == b
+    d, s = m - 1, 0
+    while d % 2 == 0:
+        d, s = d // 2, s + 1
+    for b in bases:
+        x = pow(b, d, m)
+        if x in (1, m - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % m
+            if x == m - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _pollard_brent(m):
+    """ A non-trivial factor of the composite m. """
+    rng = random.Random(m)
+    while True:
+        y, c, batch = rng.randrange(1, m), rng.randrange(1, m), 128
+        g, r, product = 1, 1, 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % m
+            k = 0
+            while k < r and g == 1:
+                saved = y
+                for _ in range(min(batch, r - k)):
+                    y = (y * y + c) % m
+                    product = product * abs(x - y) % m
+                g = math.gcd(product, m)
+                k += batch
+            r *= 2
+        if g == m:
+            # The batch overshot; redo it one step at a time
+            g = 1
+            while g == 1:
+                saved = (saved * saved + c) % m
+                g = math.gcd(abs(x - saved), m)
+        if g != m:
+            return g
+
+
+def _primitive_root(p, factors):
+    """ The smallest primitive root modulo the prime p. """
+    for g in range(1, p):
+        if all(pow(g, (p - 1) // q, p) != 1 for q in factors):
+            return g
+
+
+def _as_int_array(values):
+    """ Turn an object array of Python ints into int64, if they all fit. """
+    if len(values) == 0 or max(values) < 2 ** 63:
+        return values.astype(np.int64)
+    return values
+
+
+class _Arithmetic():
+    """ Multiplication in a field on arrays of elements, without tables.
+
+        Elements of prime fields are integers; those of extension fields are
+        rows of polynomial basis coefficients, multiplied as polynomials
+        modulo the irreducible polynomial of the field (which is monic).
+        Integers are Python objects when products wouldn't fit in 64 bits.
+    """
+    def __init__(self, field):
+        self.p, self.n = field.p, field.n
+        self.dtype = np.int64 if self.p < 2 ** 31 else object
+        self.shape = () if self.n == 1 else (self.n,)
+        if self.n > 1:
+            self.place_values = np.array([self.p ** i for i in range(self.n)], dtype = object)
+            self.reduction = np.array([(-c) % self.p for c in field.coefs[:self.n]], dtype = np.int64)
+
+
+    def one(self):
+        return self.unpack(1)
+
+
+    def array(self, a):
+        # Python ints from object arithmetic must not become int64 again
+        return np.asarray(a, dtype = self.dtype if self.n == 1 else np.int64)
+
+
+    def unpack(self, packed):
+        packed = np.asarray(packed, dtype = object)
+        if self.n == 1:
+            return packed.astype(self.dtype)
+        digits = (packed[..., np.newaxis] // self.place_values) % self.p
+        return digits.astype(np.int64)
+
+
+    def pack(self, elements):
+        if self.n == 1:
+            return np.asarray(elements)
+        if self.p ** self.n < 2 ** 63:
+            return np.dot(elements, self.place_values.astype(np.int64))
+        return np.dot(elements.astype(object), self.place_values)
+
+
+    def mul(self, a, b):
+        a, b = self.array(a), self.array(b)
+        if self.n == 1:
+            return (a * b) % self.p
+        a, b = np.broadcast_arrays(a, b)
+        product = np.zeros(a.shape[:-1] + (2 * self.n - 1,), dtype = np.int64)
+        for i in range(self.n):
+            product[..., i:i + self.n] += a[..., i:i + 1] * b
+            product %= self.p
+        for k in range(2 * self.n - 2, self.n - 1, -1):
+            product[..., k - self.n:k] += product[..., k:k + 1] * self.reduction
+            product[..., k - self.n:k] %= self.p
+        return product[..., :self.n]
+
+
+    def power(self, a, exponents):
+        """ a to the given power(s): one exponent, or an array with one per element. """
+        if np.ndim(exponents) == 0:
+            exponent, result = int(exponents), None
+            while exponent > 0:
+                if exponent & 1:
+                    result = a if result is None else self.mul(result, a)
+                exponent >>= 1
+                if exponent:
+                    a = self.mul(a, a)
+            return np.broadcast_to(self.one(), np.shape(a)).copy() if result is None else self.array(result)
+
+        exponents = np.asarray(exponents, dtype = object)
+        a = np.broadcast_to(self.array(a), exponents.shape + self.shape)
+        result = np.broadcast_to(self.one(), a.shape).copy()
+        while np.any(exponents > 0):
+            odd = (exponents % 2 == 1).astype(bool)
+            if np.any(odd):
+                mask = odd.reshape(odd.shape + (1,) * len(self.shape))
+                result = np.where(mask, self.mul(result, a), result)
+            exponents = exponents // 2
+            a = self.mul(a, a)
+        return result
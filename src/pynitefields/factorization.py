@@ -0,0 +1,271 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# factorization.py: Factoring polynomials and finding their roots.
+#
+# © 2016 Olivia Di Matteo (odimatte@uwaterloo.ca)
+#
+# This file is part of the project PyniteFields.
+#
+# Licensed under BSD-3-Clause
+#
+
+import numpy as np
+
+from pynitefields.subproducttree import SubproductTree
+
+# In fields up to this size, roots are found by evaluating on every element,
+# which is quicker than factoring.
+ROOT_SCAN_THRESHOLD = 256
+
+# The number of degrees whose factors are looked for with a single GCD in
+# the distinct-degree factorization.
+DDF_BLOCK_SIZE = 8
+
+def factor(poly):
+    """ Factor a polynomial into irreducible factors.
+
+        Factoring goes in three stages: the polynomial is split into
+        square-free parts, each of those into products of irreducible factors
+        of equal degree (distinct-degree factorization), and those are split
+        with the randomized equal-degree algorithm of Cantor and Zassenhaus.
+        All of this takes time polynomial in the degree and in
+        :math:`\\log(p^n)`.
+
+        Args:
+            poly (Polynomial): A non-zero polynomial.
+
+        Returns:
+            A list of pairs (factor, multiplicity), where the factors are
+            distinct monic irreducible Polynomials. The leading coefficient of
+            poly is left out. Factors are sorted by degree and then by their
+            coefficients.
+    """
+    if poly.is_zero():
+        raise ValueError("Error, cannot factor the zero polynomial.")
+
+    rng = np.random.RandomState(0)
+    factors = []
+    for part, multiplicity in squarefree_factors(poly):
+        for product, degree in distinct_degree_factors(part):
+            for irreducible in equal_degree_factors(product, degree, rng):
+                factors.append((irreducible, multiplicity))
+    return sorted(factors, key = lambda pair: (pair[0].degree(), pair[0].coefs.tolist()))
+
+
+def squarefree_factors(poly):
+    """ Split a polynomial into square-free parts.
+
+        Args:
+            poly (Polynomial): A non-zero polynomial.
+
+        Returns:
+            A list of pairs (part, multiplicity), where each part is monic,
+            square-free and of positive degree, the parts are coprime, and
+            the product of all part ** multiplicity is poly.monic().
+    """
+    field = poly.field
+    poly = poly.monic()
+    if poly.degree() < 1:
+        return []
+
+    parts = []
+    common = poly.gcd(poly.derivative())
+    remaining = poly // common
+    multiplicity = 1
+    while remaining.degree() > 0:
+        shared = remaining.gcd(common)
+        part = remaining // shared
+        if part.degree() > 0:
+            parts.append((part, multiplicity))
+        remaining = shared
+        common = common // shared
+        multiplicity += 1
+
+    # Whatever is left has a zero derivative, so it's a p-th power
+    if common.degree() > 0:
+        for part, inner in squarefree_factors(_pth_root(common)):
+            parts.append((part, inner * field.p))
+    return parts
+
+
+def distinct_degree_factors(poly):
+    """ Split a square-free polynomial by the degrees of its irreducible factors.
+
+        The irreducible factors of degree d are the common factors of poly and
+        :math:`x^{q^d} - x`, where :math:`q = p^n`. To save on GCDs, the
+        :math:`x^{q^d} - x` for a block of consecutive d are multiplied
+        together and only split up again if they share a factor with poly.
+
+        Args:
+            poly (Polynomial): A monic, square-free polynomial.
+
+        Returns:
+            A list of pairs (product, d) where product is the product of all
+            the irreducible factors of degree d.
+    """
+    field = poly.field
+    x = poly._new([0, field._one])
+    products = []
+    remaining = poly
+    power = x % remaining
+    degree = 0
+    while remaining.degree() >= 2 * (degree + 1):
+        block = []
+        accumulated = poly._new([field._one])
+        while len(block) < DDF_BLOCK_SIZE and remaining.degree() >= 2 * (degree + 1):
+            degree += 1
+            power = power.pow_mod(field.dim, remaining)
+            block.append((degree, power - x))
+            accumulated = (accumulated * block[-1][1]) % remaining
+
+        common = remaining.gcd(accumulated)
+        if common.degree() > 0:
+            remaining = remaining // common
+            power = power % remaining
+            for d, difference in block:
+                part = common.gcd(difference)
+                if part.degree() > 0:
+                    products.append((part, d))
+                    common = common // part
+
+    if remaining.degree() > 0:
+        products.append((remaining, remaining.degree()))
+    return products
+
+
+def equal_degree_factors(poly, degree, rng = None):
+    """ Split a product of distinct irreducible factors of the same degree.
+
+        Uses the randomized algorithm of Cantor and Zassenhaus: for a random
+        r, the map :math:`r \\rightarrow r^{(q^d - 1)/2}` (or in
+        characteristic 2, the trace map to GF(2)) takes each factor to 0 or
+        :math:`\\pm 1` independently, so the GCD with the image minus 1 (or
+        with the trace) splits poly about half of the time.
+
+        Args:
+            poly (Polynomial): A monic product of distinct irreducible
+                polynomials of the given degree.
+            degree (int): The degree d of each irreducible factor.
+            rng (np.random.RandomState): The source of random polynomials.
+
+        Returns:
+            The list of monic irreducible factors.
+    """
+    if poly.degree() <= degree:
+        return [poly]
+    if rng is None:
+        rng = np.random.RandomState(0)
+
+    field = poly.field
+    one = poly._new([field._one])
+    while True:
+        r = poly._new(rng.randint(0, field.dim, poly.degree()))
+        if r.degree() < 1:
+            continue
+        if field.p == 2:
+            term = image = r
+            for i in range(field.n * degree - 1):
+                term = (term * term) % poly
+                image = image + term
+        else:
+            image = r.pow_mod((field.dim ** degree - 1) // 2, poly) - one
+
+        split = poly.gcd(image)
+        if 0 < split.degree() < poly.degree():
+            return (equal_degree_factors(split, degree, rng) +
+                    equal_degree_factors(poly // split, degree, rng))
+
+
+def roots(poly):
+    """ Find the distinct roots of a polynomial in its field.
+
+        The roots are those of :math:`\\gcd(f, x^q - x)`, which is a product
+        of distinct linear factors and is split with the equal-degree
+        algorithm, so no search through the field is needed. In small fields,
+        the polynomial is simply evaluated on every element.
+
+        Args:
+            poly (Polynomial): A non-zero polynomial.
+
+        Returns:
+            A sorted array of the indices of the roots, without multiplicity.
+    """
+    return roots_many([poly])[0]
+
+
+def roots_many(polys):
+    """ Find the roots of many polynomials over the same field.
+
+        The distinct linear factors of each polynomial are found separately,
+        but they are all split together from their product, and the roots are
+        then sorted out by evaluating each polynomial on them with a
+        SubproductTree. In small fields, all the polynomials are
+        evaluated on every element at once instead.
+
+        Args:
+            polys (list): Non-zero Polynomials over the same field.
+
+        Returns:
+            A list holding the sorted array of the indices of the distinct
+            roots of each polynomial.
+    """
+    if len(polys) == 0:
+        return []
+    if any([poly.is_zero() for poly in polys]):
+        raise ValueError("Error, every element is a root of the zero polynomial.")
+
+    field = polys[0].field
+    if field.dim <= ROOT_SCAN_THRESHOLD:
+        length = max([len(poly.coefs) for poly in polys])
+        coefs = np.array([np.pad(poly.coefs, (0, length - len(poly.coefs))) for poly in polys])
+        values = field.evaluate_all(coefs)
+        return [np.nonzero(row == 0)[0] for row in values]
+
+    # Keep only the linear factors of each polynomial, and find all the roots
+    # together from the product of those
+    linear = [_linear_part(poly) for poly in polys]
+    if len(polys) == 1:
+        return [_split_linear(linear[0])]
+
+    product = polys[0]._new([field._one])
+    for part in linear:
+        product = product * part
+    found = _split_linear(_linear_part(product))
+    if len(found) == 0:
+        return [found for poly in polys]
+
+    tree = SubproductTree(field, found)
+    return [found[tree.evaluate(part) == 0] for part in linear]
+
+
+def _linear_part(poly):
+    """ The product of the distinct linear factors of a non-zero polynomial,
+        :math:`\\gcd(f, x^q - x)`.
+    """
+    x = poly._new([0, poly.field._one])
+    poly = poly.monic()
+    if poly.degree() < 1:
+        return poly
+    return poly.gcd(x.pow_mod(poly.field.dim, poly) - x)
+
+
+def _split_linear(poly):
+    """ The sorted indices of the roots of a product of distinct linear factors. """
+    if poly.degree() < 1:
+        return np.zeros(0, dtype = np.int64)
+    found = [poly.field.neg(factor.coefs[0]) for factor in equal_degree_factors(poly, 1)]
+    return np.sort(np.array(found, dtype = np.int64))
+
+
+def _pth_root(poly):
+    """ The p-th root of a polynomial whose derivative is 0.
+
+        Such a polynomial only has terms of degrees that are multiples of p,
+        and the p-th root of a field element a is :math:`a^{p^{n-1}}`.
+    """
+    field = poly.field
+    coefs = poly.coefs[::field.p]
+    if field.n > 1:
+        coefs = field.power(coefs, field.p ** (field.n - 1))
+    return poly._new(coefs)
@@ -0,0 +1,235 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# fieldbasis.py: Views of a finite field expanded in a different basis.
+#
+# © 2016 Olivia Di Matteo (odimatte@uwaterloo.ca)
+#
+# This file is part of the project PyniteFields.
+# Licensed under BSD-3-Clause
+#
+
+import copy
+
+import numpy as np
+
+class FieldBasis():
+    """ A view of a GaloisField in which elements are expanded in a basis 
+        other than the polynomial basis.
+
+        Any :math:`n` linearly independent elements :math:`b_i` form a basis.
+        The coefficients of an element :math:`\\alpha` in this basis are 
+        :math:`\\text{tr}(\\alpha d_i)`, where the :math:`d_i` make up the 
+        (trace) dual basis, satisfying :math:`\\text{tr}(b_i d_j) = \\delta_{ij}`.
+        The dual basis is found by inverting the Gram matrix 
+        :math:`G_{ij} = \\text{tr}(b_i b_j)` over GF(:math:`p`). For a 
+        self-dual basis, :math:`G` is the identity and :math:`d_i = b_i`.
+
+        A FieldBasis shares the element tables of the field it was made from,
+        and holds its own table of expansion coefficients for every element.
+        Nothing about the underlying field is changed, so many views in
+        different bases can be used side by side (or from different threads).
+        Views are usually obtained through GaloisField.in_basis rather than
+        constructed directly.
+
+        Args:
+            field (GaloisField): The field to take a view of.
+            element_indices (list): The indices of the FieldElements
+                (as powers of the primitive element) that make up the basis.
+
+        Attributes:
+            field (GaloisField): The field this is a view of.
+            p (int): The prime dimension of the field
+            n (int): The degree of the field extension
+            dim (int): The full order of the field, :math:`p^n`.
+            element_indices (list): The indices of the basis elements. 
+            gram (np.ndarray): The n x n trace Gram matrix of the basis.
+            norms (list): The trace of each basis element squared, i.e. the
+                diagonal of the Gram matrix.
+            is_self_dual (bool): Whether the basis is (almost) self-dual, i.e.
+                whether its elements are trace-orthogonal.
+            dual_indices (list): The indices of the elements of the dual basis.
+            to_poly_matrix (np.ndarray): The n x n matrix taking coefficients
+                in this basis (as a row vector) to polynomial basis 
+                coefficients. Row i holds the polynomial basis coefficients 
+                of basis element i.
+            from_poly_matrix (np.ndarray): The n x n matrix taking polynomial
+                basis coefficients (as a row vector) to coefficients in this
+                basis; the inverse of to_poly_matrix over GF(:math:`p`).
+            coord_table (np.ndarray): A (dim, n) integer array whose row i
+                holds the expansion coefficients in this basis of the element
+                at index i of the field.
+            ranks (np.ndarray): The position of each element when the field is
+                sorted by its expansion coefficients in this basis. Used for
+                constant-time ordering of elements.
+    """
+
+    def __init__(self, field, element_indices):
+        if len(element_indices) != field.n:
+            raise ValueError("Incorrect number of elements in proposed basis.")
+
+        self.field = field
+        self.p = field.p
+        self.n = field.n
+        self.dim = field.dim
+        self.element_indices = [int(x) for x in element_indices]
+
+        basis_array = np.array(self.element_indices)
+        if np.any(basis_array == 0):
+            raise ValueError("Basis elements must be linearly independent.")
+
+        # Gram matrix of traces tr(b_i b_j), and its inverse
+        self.gram = field._traces(field._index_products(basis_array[:, np.newaxis], 
+                                                        basis_array[np.newaxis, :]))
+        gram_inverse = _inverse_mod_p(self.gram, self.p)
+        if gram_inverse is None:
+            raise ValueError("Basis elements must be linearly independent.")
+
+        self.norms = np.diag(self.gram).tolist()
+        self.is_self_dual = bool(np.count_nonzero(self.gram - np.diag(np.diag(self.gram))) == 0)
+
+        # The dual basis elements are d_j = sum_k G^{-1}_{kj} b_k.
+        self.to_poly_matrix = field.coef_table[basis_array]
+        dual_coefs = np.dot(gram_inverse.T, self.to_poly_matrix) % self.p
+        self.dual_indices = field._indices_from_coefs(dual_coefs).tolist()
+
+        # The trace is linear, so coefficient i of an element is the dot
+        # product of its polynomial basis coefficients with tr(x^j * d_i)
+        # for j = 0, ..., n - 1. We build that n x n change of basis matrix
+        # once, and then convert the whole field with a single matrix product.
+        one = 1 if self.n == 1 else self.dim - 1
+        poly_basis = np.array([one] + list(range(1, self.n)))
+        poly_traces = field._traces(field._index_products(poly_basis[:, np.newaxis],
+                                                          basis_array[np.newaxis, :]))
+        self.from_poly_matrix = np.dot(poly_traces, gram_inverse) % self.p
+
+        self.coord_table = np.dot(field.coef_table, self.from_poly_matrix) % self.p
+        self.coord_table.setflags(write = False)
+
+        self.ranks = _coordinate_ranks(self.coord_table, self.p)
+        self.ranks.setflags(write = False)
+
+
+    def __getitem__(self, idx):
+        """ Access specific elements of the field, expanded in this basis.
+
+            Args:
+                idx (int): The index of the element to retrieve, as a power of
+                    the primitive element.
+
+            Returns:
+                A FieldElement equal to the element at the specified index in
+                the field, which reports its coefficients in this basis.
+        """
+        element = copy.copy(self.field[idx])
+        element.basis = self
+        return element
+
+
+    def __iter__(self):
+        """ Iterate over the field elements, expanded in this basis. """
+        return (self[idx] for idx in range(self.dim))
+
+
+    def __len__(self):
+        """ The number of elements in the field. """
+        return self.dim
+
+
+    def coords(self, indices):
+        """ Look up the expansion coefficients in this basis.
+
+            Args:
+                indices (int, FieldElement or np.ndarray): An element, the
+                    index of an element, or an array of indices.
+
+            Returns:
+                The coefficients of the element as a list, or for an array of
+                indices, an array with one extra trailing axis of length n.
+        """
+        if hasattr(indices, "prim_power"):
+            return self.coord_table[indices.prim_power].tolist()
+        if np.ndim(indices) == 0:
+            return self.coord_table[indices].tolist()
+        return self.coord_table[_as_indices(indices)]
+
+
+    def from_coords(self, coords):
+        """ Reconstruct elements from their expansion coefficients in this basis.
+
+            Args:
+                coords (list or np.ndarray): The coefficients of a single 
+                    element, or an array of coefficients whose last axis has 
+                    length n.
+
+            Returns:
+                The index of the element (as a power of the primitive element)
+                for a single element, or an array of indices with the last
+                axis of coords removed.
+        """
+        coords = np.asarray(coords, dtype = np.int64) % self.p
+        indices = self.field._indices_from_coefs(np.dot(coords, self.to_poly_matrix) % self.p)
+        if coords.ndim == 1:
+            return int(indices)
+        return indices
+
+
+    def dual(self):
+        """ The trace dual of this basis.
+
+            Returns:
+                The FieldBasis made of the dual basis elements. The dual of a
+                self-dual basis (with all norms 1) is the basis itself. 
+        """
+        return self.field.in_basis(self.dual_indices)
+
+
+def _as_indices(elements):
+    """ Turn a FieldElement, or an array or list of them, into indices. """
+    if hasattr(elements, "prim_power"):
+        return elements.prim_power
+    if isinstance(elements, (list, tuple)) and len(elements) > 0 and hasattr(elements[0], "prim_power"):
+        return np.array([el.prim_power for el in elements])
+    return np.asarray(elements, dtype = np.int64)
+
+
+def _inverse_mod_p(matrix, p):
+    """ Invert a square integer matrix over GF(:math:`p`) by Gauss-Jordan elimination.
+
+        Returns:
+            The inverse as an integer array, or None if the matrix is singular.
+    """
+    size = len(matrix)
+    augmented = np.hstack([np.asarray(matrix, dtype = np.int64) % p, 
+                           np.eye(size, dtype = np.int64)])
+
+    for col in range(size):
+        pivots = np.nonzero(augmented[col:, col])[0]
+        if len(pivots) == 0:
+            return None
+        pivot = col + pivots[0]
+        augmented[[col, pivot]] = augmented[[pivot, col]]
+
+        augmented[col] = (augmented[col] * pow(int(augmented[col, col]), p - 2, p)) % p
+        factors = augmented[:, col].copy()
+        factors[col] = 0
+        augmented = (augmented - np.outer(factors, augmented[col])) % p
+
+    return augmented[:, size:]
+
+
+def _coordinate_ranks(coord_table, p):
+    """ Rank the rows of a coordinate table in the order used by FieldElement.
+
+        Elements are ordered by comparing their coefficient lists joined into
+        strings. For :math:`p \\leq 10` every coefficient is a single digit,
+        which is the same as sorting the rows lexicographically.
+    """
+    if p <= 10:
+        order = np.lexsort(coord_table.T[::-1])
+        ranks = np.empty(len(coord_table), dtype = np.int64)
+        ranks[order] = np.arange(len(coord_table))
+        return ranks
+
+    keys = np.array(["".join([str(x) for x in row]) for row in coord_table.tolist()])
+    return np.unique(keys, return_inverse = True)[1].astype(np.int64)
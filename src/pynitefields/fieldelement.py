@@ -10,9 +10,41 @@
 # 
 
 import math
+import warnings
 
+from pynitefields import profiling
 from pynitefields.pthrootofunity import pthRootOfUnity
 
+class ElementList(list):
+    """ The list of the string representations of the elements of a field,
+        shared by all of them (FieldElement.field_list). 
+
+        Looking up the position of a string is a dict lookup rather than a
+        search of the list, so that making a FieldElement takes constant time.
+        It also carries the profiler of the field, if any, so that elements
+        can report to it.
+    """
+    profiler = None
+
+    def index(self, str_rep):
+        positions = self.__dict__.get("_positions")
+        if positions is None or len(positions) != len(self):
+            # The list is only appended to while the field is built
+            positions = {rep: i for i, rep in enumerate(self)}
+            self._positions = positions
+        if str_rep not in positions:
+            raise ValueError(repr(str_rep) + " is not in list")
+        return positions[str_rep]
+
+
+    def __eq__(self, other):
+        return self is other or list.__eq__(self, other)
+
+
+    def __ne__(self, other):
+        return not self == other
+
+
 class FieldElement():
     """ Class for an element in a finite field.
 
@@ -33,6 +65,12 @@ class FieldElement():
                      each element always knows its position, or power of the 
                      primitive element in the field. I'm not proud of it being
                      implemented this way, but this is the best I can do now.
+            is_sdb, sdb_field_list, sdb_coefs: Deprecated; the basis of an
+                     element now comes from basis. is_sdb with sdb_field_list
+                     (the comma-separated self-dual basis coefficients of 
+                     every element), or sdb_coefs, still set the coefficients
+                     reported by sdb_coefs, with a DeprecationWarning.
+            basis (FieldBasis): The basis this element is expressed in.
 
         Attributes:
             p (int): The prime order of the field this element is in.
@@ -43,19 +81,30 @@ class FieldElement():
                               primitive element of the field.
             exp_coefs (list): The set of expansion coefficients of this element
                               in terms of the polynomial basis.
+            basis (FieldBasis): The basis this element is expressed in, 
+                                usually a self-dual one, or None for the 
+                                polynomial basis. None by default.
             is_sdb (bool): Indicates whether this element is expressed in
-                           the self-dual basis or not. False by default.
+                           the self-dual (or another) basis rather than the
+                           polynomial basis. False by default.
             sdb_coefs (list): The set of expansion coefficients in the self-
-                              dual basis. Empty by default.
+                              dual (or other) basis. Empty by default.
             str_rep (string): A representation of the exp_coefs as a string.
             field_list (list of FieldElements) - A copy of the list of all 
                      elements in the GaloisField this element is in.
     """
 
-    def __init__(self, p, n, exp_coefs, field_list = [], is_sdb = False, sdb_field_list = [], sdb_coefs = []):
+    # Set only through the deprecated arguments and setters below; class
+    # attributes, so that other elements don't carry them.
+    _is_sdb = None
+    _sdb_coefs = None
+    sdb_field_list = ()
+
+    def __init__(self, p, n, exp_coefs, field_list = [], is_sdb = None, sdb_field_list = None, 
+                 sdb_coefs = None, basis = None):
         self.p = p
         self.n = n
-        self.dim = int(math.pow(p, n))
+        self.dim = p ** n
 
         # Set the expansion coefficients.
         # If we're in a prime field, the basis is 1, and
@@ -68,6 +117,8 @@ class FieldElement():
         # for power of prime fields. However, when we perform operations on
         # elements such as addition, multiplication, we will need to 
         self.field_list = field_list
+        if profiling.active:
+            profiling.record(self, "element.alloc")
 
         if len(field_list) != 0:
             self.prim_power = self.field_list.index(self.str_rep)
@@ -79,16 +130,55 @@ class FieldElement():
         if self.n == 1:
             self.prim_power = exp_coefs[0]
 
-        # These parameters will be something other than their default value
-        # only if the to_sdb function is called on the GaloisField.
-        self.is_sdb = is_sdb
-        self.sdb_field_list = sdb_field_list
-        self.sdb_coefs = sdb_coefs 
+        # This will be something other than its default value only if the
+        # element comes from a GaloisField in (or a view of) a different basis.
+        # The basis holds the coefficients of every element in the field.
+        self.basis = basis
+
+        # The old way of setting the self-dual basis, one element at a time
+        if is_sdb is not None or sdb_field_list is not None or sdb_coefs is not None:
+            warnings.warn("The is_sdb, sdb_field_list and sdb_coefs arguments of FieldElement are deprecated; "
+                          "use GaloisField.in_basis instead.", DeprecationWarning, stacklevel = 2)
+            self._is_sdb = is_sdb
+            if sdb_field_list is not None:
+                self.sdb_field_list = sdb_field_list
+            if sdb_coefs is not None:
+                self._sdb_coefs = sdb_coefs
+            elif is_sdb and len(self.sdb_field_list) > 0:
+                self._sdb_coefs = [int(x) for x in self.sdb_field_list[self.prim_power].split(',')]
+
+
+    @property
+    def is_sdb(self):
+        """ Whether this element is expressed in the self-dual basis. """
+        if self._is_sdb is not None:
+            return bool(self._is_sdb)
+        return self.basis is not None
+
+
+    @is_sdb.setter
+    def is_sdb(self, value):
+        warnings.warn("Setting FieldElement.is_sdb is deprecated; use GaloisField.in_basis instead.",
+                      DeprecationWarning, stacklevel = 2)
+        self._is_sdb = value
+
+
+    @property
+    def sdb_coefs(self):
+        """ The expansion coefficients in the self-dual basis, if any. """
+        if self._sdb_coefs is not None:
+            return self._sdb_coefs
+        if self.basis is None:
+            return []
+        return self.basis.coord_table[self.prim_power].tolist()
+
+
+    @sdb_coefs.setter
+    def sdb_coefs(self, value):
+        warnings.warn("Setting FieldElement.sdb_coefs is deprecated; use GaloisField.in_basis instead.",
+                      DeprecationWarning, stacklevel = 2)
+        self._sdb_coefs = value
 
-        # Reset the sdb coefficients after an operation if need be.
-        if self.is_sdb:
-            self.sdb_coefs = [int(x) for x in self.sdb_field_list[self.prim_power].split(',')] 
-      
 
     def __add__(self, el):
         """ Addition.
@@ -101,6 +191,9 @@ class FieldElement():
                 this is simply addition modulo :math:`p`, for power-of-prime
                 fields we must add using the exp_coefs.
         """
+        if profiling.active:
+            profiling.record(self, "scalar.add")
+
         # Make sure we're in the same field!
         if (self.p != el.p) or (self.n != el.n):
             print("Error, cannot add elements from different fields!")
@@ -112,7 +205,7 @@ class FieldElement():
         else: # Power of prime case
             # Coefficients simply add modulo p
             new_coefs = [(self.exp_coefs[i] + el.exp_coefs[i]) % self.p for i in range(0, self.n)]
-            return FieldElement(self.p, self.n, new_coefs, self.field_list, self.is_sdb, self.sdb_field_list)
+            return FieldElement(self.p, self.n, new_coefs, self.field_list, basis = self.basis)
 
 
     def __radd__(self, el):
@@ -136,6 +229,9 @@ class FieldElement():
                 this is simply subtraction modulo :math:`p`, for power-of-prime
                 fields we must subtract using the exp_coefs.
         """
+        if profiling.active:
+            profiling.record(self, "scalar.sub")
+
         # Make sure we're in the same field!
         if (self.p != el.p) or (self.n != el.n):
             print("Error, cannot subtract elements from different fields!")
@@ -147,7 +243,7 @@ class FieldElement():
         else:  # Power of prime case
             # Coefficients subtract modulo p
             new_coefs = [(self.exp_coefs[i] - el.exp_coefs[i]) % self.p for i in range(0, self.n)]
-            return FieldElement(self.p, self.n, new_coefs, self.field_list, self.is_sdb, self.sdb_field_list)
+            return FieldElement(self.p, self.n, new_coefs, self.field_list, basis = self.basis)
 
 
     def __mul__(self, el):
@@ -165,9 +261,12 @@ class FieldElement():
                 and the one from el; we then use field_list to find the 
                 corresponding FieldElement and return it.
         """
+        if profiling.active:
+            profiling.record(self, "scalar.mul")
+
         # Multiplication by a constant (must be on the right!)
         if isinstance(el, int):
-            return FieldElement(self.p, self.n, [(el * exp_coef) % self.p for exp_coef in self.exp_coefs] , self.field_list, self.is_sdb, self.sdb_field_list)
+            return FieldElement(self.p, self.n, [(el * exp_coef) % self.p for exp_coef in self.exp_coefs] , self.field_list, basis = self.basis)
 
         # Multiplication by another FieldElement
         elif isinstance(el, FieldElement):
@@ -187,7 +286,7 @@ class FieldElement():
                 # Multiplying by 0, nothing to see here
                 if el.prim_power == 0 or self.prim_power == 0: 
                     zeros = [0] * self.n
-                    return FieldElement(self.p, self.n, zeros, self.field_list, self.is_sdb, self.sdb_field_list)
+                    return FieldElement(self.p, self.n, zeros, self.field_list, basis = self.basis)
                 else:
                     new_exp = self.prim_power + el.prim_power # New exponent
                     # If the exponent calculated is outside the range of primitive element
@@ -195,8 +294,10 @@ class FieldElement():
                     # the last field element is 1.
                     if new_exp > self.dim - 1: 
                         new_exp = ((new_exp - 1) % (self.dim - 1)) + 1
+                    if profiling.active:
+                        profiling.record(self, "lookup.field_list")
                     new_exp_coefs = [int(x) for x in self.field_list[new_exp].split(',')] 
-                    return FieldElement(self.p, self.n, new_exp_coefs, self.field_list, self.is_sdb, self.sdb_field_list)
+                    return FieldElement(self.p, self.n, new_exp_coefs, self.field_list, basis = self.basis)
         else:
             raise TypeError("Unsupported operator")
 
@@ -219,6 +320,9 @@ class FieldElement():
             Returns:
                 This element / el. Returns None if el = 0. 
         """
+        if profiling.active:
+            profiling.record(self, "scalar.div")
+
         if isinstance(el, FieldElement):
             if (self.p != el.p) or (self.n != el.n):
                 print("Error, cannot divide elements from different fields.")
@@ -269,6 +373,9 @@ class FieldElement():
                 modulo p for primes. For power-of-primes, we define that the
                 power of any element to 0 is the 0 element, and *not* 1.
         """
+        if profiling.active:
+            profiling.record(self, "scalar.pow")
+
         # Prime case
         if self.n == 1:
             return FieldElement(self.p, self.n, [int(math.pow(self.prim_power, exponent)) % self.p])
@@ -282,8 +389,10 @@ class FieldElement():
                 new_exp = self.prim_power * exponent
                 if new_exp > self.dim - 1:
                     new_exp = ((new_exp - 1) % (self.dim - 1)) + 1
+                if profiling.active:
+                    profiling.record(self, "lookup.field_list")
                 new_coefs = [int(x) for x in self.field_list[new_exp].split(',')] 
-            return FieldElement(self.p, self.n, new_coefs, self.field_list, self.is_sdb, self.sdb_field_list)
+            return FieldElement(self.p, self.n, new_coefs, self.field_list, basis = self.basis)
             
 
     def __eq__(self, el):
@@ -327,8 +436,11 @@ class FieldElement():
             else:
                 return False
         else:
-            # If there is a sdb defined, use that, otherwise use exp_coefs
-            if self.is_sdb:
+            # If there is a sdb defined, use that, otherwise use exp_coefs.
+            # Elements of the same basis can use its precomputed ordering.
+            if self.is_sdb and self.basis is el.basis:
+                return bool(self.basis.ranks[self.prim_power] < self.basis.ranks[el.prim_power])
+            elif self.is_sdb:
                 this_exp_str = [str(x) for x in self.sdb_coefs]
                 that_exp_str = [str(x) for x in el.sdb_coefs]
                 if "".join(this_exp_str) < "".join(that_exp_str):
@@ -371,11 +483,16 @@ class FieldElement():
             Note: The trace of an element can be invoked in two ways. One can
             do el.inv() or inv(el).
         """
+        if profiling.active:
+            profiling.record(self, "scalar.inv")
+
         if self.n == 1: # Prime case - brute force :(
             if self.prim_power == 0:
                 print("Error, 0 has no multiplicative inverse.")
                 return
 
+            if profiling.active:
+                profiling.record(self, "fallback.inverse_search")
             for i in range(0, self.p):
                 if (self.prim_power * i) % self.p == 1:
                     return FieldElement(self.p, self.n, [i])
@@ -388,8 +505,10 @@ class FieldElement():
                 return self 
             # All other elements, find exponent which sums to dim - 1
             else:
+                if profiling.active:
+                    profiling.record(self, "lookup.field_list")
                 new_coefs = [int(x) for x in self.field_list[self.dim - self.prim_power - 1].split(',')]
-                return FieldElement(self.p, self.n, new_coefs, self.field_list, self.is_sdb, self.sdb_field_list)
+                return FieldElement(self.p, self.n, new_coefs, self.field_list, basis = self.basis)
 
 
     def tr(self):
@@ -410,6 +529,9 @@ class FieldElement():
             Note: The trace of an element can be invoked in two ways. One can
             do el.tr() or tr(el).
         """
+        if profiling.active:
+            profiling.record(self, "scalar.tr")
+
         s = self
 
         if self.n == 1:
@@ -440,6 +562,9 @@ class FieldElement():
             Note: The trace of an element can be invoked in two ways. One can
             do el.gchar() or gchar(el).
         """
+        if profiling.active:
+            profiling.record(self, "scalar.gchar")
+
         if self.p == 2:
             return ((-1) **  self.tr())
         else:
@@ -0,0 +1,442 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# fieldmatrix.py: Dense matrices with entries in a finite field.
+#
+# © 2016 Olivia Di Matteo (odimatte@uwaterloo.ca)
+#
+# This file is part of the project PyniteFields.
+#
+# Licensed under BSD-3-Clause
+#
+
+import numpy as np
+
+from pynitefields.fieldelement import FieldElement
+
+# Row reduction is done on panels of this many columns at a time; within a
+# panel rows are reduced one by one, and the rest of the matrix is updated
+# with matrix products.
+PANEL_WIDTH = 64
+
+class FieldMatrix():
+    """ A dense matrix with entries in a finite field.
+
+        Entries are stored as a NumPy array of element indices (the idx of
+        gf[idx]). Matrix products are done on the polynomial basis
+        coefficients of the entries with floating point matrix products,
+        which are exact as long as the sums involved are small enough: several
+        coefficients are packed into each number when there is room, and the
+        sums are reduced modulo p in blocks when there isn't. Row reduction
+        is blocked so that most of its work is done by matrix products as
+        well, so systems with thousands of unknowns are practical.
+
+        Args:
+            field (GaloisField): The field the entries are in.
+            entries (list or np.ndarray): The rows of the matrix, given as
+                lists of FieldElements and integers (as for
+                GaloisField.evaluate), or a 2-dimensional NumPy integer array
+                of element indices.
+
+        Attributes:
+            field (GaloisField): The field the entries are in.
+            entries (np.ndarray): The indices of the entries.
+            shape (tuple): The number of rows and columns.
+    """
+
+    def __init__(self, field, entries):
+        self.field = field
+        if isinstance(entries, np.ndarray):
+            self.entries = entries.astype(np.int64)
+        else:
+            self.entries = np.array([field._curve_indices(list(row)) for row in entries],
+                                    dtype = np.int64)
+        if self.entries.ndim != 2:
+            raise ValueError("Matrix entries must be two-dimensional.")
+        self.shape = self.entries.shape
+
+
+    @staticmethod
+    def identity(field, size):
+        """ The size x size identity matrix over field. """
+        entries = np.zeros((size, size), dtype = np.int64)
+        entries[np.arange(size), np.arange(size)] = field._one
+        return FieldMatrix(field, entries)
+
+
+    def __getitem__(self, key):
+        """ Access an entry, or a submatrix.
+
+            Args:
+                key: A pair of integers (i, j) for a single entry, or any
+                    index that gives a 2-dimensional slice of a NumPy array.
+
+            Returns:
+                The FieldElement at row i and column j, or a FieldMatrix.
+        """
+        selected = self.entries[key]
+        if np.ndim(selected) == 0:
+            return self.field[int(selected)]
+        return FieldMatrix(self.field, np.atleast_2d(selected))
+
+
+    def __add__(self, other):
+        """ Entrywise addition. """
+        return FieldMatrix(self.field, self.field.add(self.entries, other.entries))
+
+
+    def __sub__(self, other):
+        """ Entrywise subtraction. """
+        return FieldMatrix(self.field, self.field.sub(self.entries, other.entries))
+
+
+    def __neg__(self):
+        """ Negation. """
+        return FieldMatrix(self.field, self.field.neg(self.entries))
+
+
+    def __mul__(self, scalar):
+        """ Multiplication by a FieldElement or an integer. """
+        if isinstance(scalar, FieldElement):
+            return FieldMatrix(self.field, self.field.mul(self.entries, scalar.prim_power))
+        elif isinstance(scalar, int):
+            return FieldMatrix(self.field, self.field.mul(self.entries, self.field._curve_indices([scalar])[0]))
+        else:
+            raise TypeError("Unsupported operator")
+
+
+    def __rmul__(self, scalar):
+        """ Multiplication by a scalar from the left. """
+        return self * scalar
+
+
+    def __matmul__(self, other):
+        """ Matrix multiplication. """
+        if self.shape[1] != other.shape[0]:
+            raise ValueError("Error, cannot multiply matrices of shapes " +
+                             str(self.shape) + " and " + str(other.shape) + ".")
+        return FieldMatrix(self.field, _matmul(self.field, self.entries, other.entries))
+
+
+    def __eq__(self, other):
+        """ Matrices are equal if they're over the same field and have the
+            same entries.
+        """
+        if not isinstance(other, FieldMatrix):
+            return False
+        if (self.field.p != other.field.p) or (self.field.n != other.field.n):
+            return False
+        return np.array_equal(self.entries, other.entries)
+
+
+    def __repr__(self):
+        """ Print the matrix as a list of rows of FieldElements. """
+        return "FieldMatrix(" + str([[self.field[int(x)] for x in row] for row in self.entries]) + ")"
+
+
+    def transpose(self):
+        """ The transpose of the matrix. """
+        return FieldMatrix(self.field, self.entries.T.copy())
+
+
+    def row_reduce(self):
+        """ Put the matrix in reduced row echelon form.
+
+            Returns:
+                A pair (reduced, pivots) of the reduced FieldMatrix, and the
+                list of the columns holding the pivot of each non-zero row.
+        """
+        reduced, pivots, scale = _row_reduce(self.field, self.entries)
+        return FieldMatrix(self.field, reduced), pivots
+
+
+    def rank(self):
+        """ The rank of the matrix. """
+        return len(_row_reduce(self.field, self.entries)[1])
+
+
+    def det(self):
+        """ The determinant of a square matrix.
+
+            Returns:
+                The determinant as a FieldElement.
+        """
+        if self.shape[0] != self.shape[1]:
+            raise ValueError("Error, determinant of non-square matrix.")
+        reduced, pivots, scale = _row_reduce(self.field, self.entries)
+        return self.field[int(scale) if len(pivots) == self.shape[0] else 0]
+
+
+    def inverse(self):
+        """ The inverse of a square matrix.
+
+            Raises:
+                ZeroDivisionError: If the matrix is singular.
+        """
+        size = self.shape[0]
+        if size != self.shape[1]:
+            raise ValueError("Error, inverse of non-square matrix.")
+        augmented = np.hstack([self.entries, FieldMatrix.identity(self.field, size).entries])
+        reduced, pivots, scale = _row_reduce(self.field, augmented, size)
+        if len(pivots) < size:
+            raise ZeroDivisionError("Error, matrix is singular.")
+        return FieldMatrix(self.field, reduced[:, size:])
+
+
+    def nullspace(self):
+        """ A basis of the null space :math:`\\{ x : A x = 0 \\}`.
+
+            Returns:
+                A FieldMatrix whose rows form a basis of the null space. It
+                has no rows if the columns are linearly independent.
+        """
+        reduced, pivots, scale = _row_reduce(self.field, self.entries)
+        columns = self.shape[1]
+        pivot_set = set(pivots)
+        free = [col for col in range(columns) if col not in pivot_set]
+
+        basis = np.zeros((len(free), columns), dtype = np.int64)
+        basis[np.arange(len(free)), free] = self.field._one
+        if len(pivots) > 0 and len(free) > 0:
+            basis[:, pivots] = self.field.neg(reduced[:len(pivots), free].T)
+        return FieldMatrix(self.field, basis)
+
+
+    def solve(self, rhs):
+        """ Solve the linear system :math:`A x = b`.
+
+            Args:
+                rhs (FieldMatrix or np.ndarray): The right hand side b, as a
+                    FieldMatrix with one column for each system to solve, or
+                    a 1-dimensional array of the indices of its entries.
+
+            Returns:
+                A solution x, of the same type and shape as rhs (taking free
+                variables to be 0 if there are many solutions).
+
+            Raises:
+                ValueError: If the system has no solution.
+        """
+        vector = not isinstance(rhs, FieldMatrix)
+        b = np.asarray(rhs, dtype = np.int64).reshape(-1, 1) if vector else rhs.entries
+        if b.shape[0] != self.shape[0]:
+            raise ValueError("Error, right hand side has the wrong number of rows.")
+
+        columns = self.shape[1]
+        reduced, pivots, scale = _row_reduce(self.field, np.hstack([self.entries, b]), columns)
+        if np.any(reduced[len(pivots):, columns:] != 0):
+            raise ValueError("Error, the system has no solution.")
+
+        solution = np.zeros((columns, b.shape[1]), dtype = np.int64)
+        solution[pivots] = reduced[:len(pivots), columns:]
+        return solution[:, 0] if vector else FieldMatrix(self.field, solution)
+
+
+def _matmul(field, a, b, subtract_from = None):
+    """ Multiply two matrices of element indices (and optionally subtract the
+        product from a third, c - a b, without an extra pass over the indices).
+
+        The product is computed on the polynomial basis coefficients of the
+        entries with floating point matrix products. Each number holds w
+        consecutive coefficients spaced s bits apart, so that one product of
+        packed matrices gives 2w - 1 coefficients of the product polynomials
+        at once; products that land on the same coefficients are added up
+        before they are unpacked. The largest w is used for which all the 
+        sums still fit in the 53 bits of a double; if even w = 1 doesn't fit,
+        the inner dimension is split into blocks, reducing modulo p after each.
+    """
+    p, n = field.p, field.n
+    rows, inner = a.shape
+    columns = b.shape[1]
+    if rows == 0 or columns == 0 or inner == 0:
+        product = np.zeros((rows, columns), dtype = np.int64)
+        return product if subtract_from is None else subtract_from.copy()
+
+    if (p - 1) ** 2 >= 2 ** 53:
+        # Too large for doubles at all; only possible for prime fields
+        field._count("fallback.object_matmul")
+        product = np.dot(a.astype(object), b.astype(object))
+        if subtract_from is not None:
+            product = subtract_from.astype(object) - product
+        return (product % p).astype(np.int64)
+
+    width, block = _packing(p, n, inner)
+    groups = -(-n // width)
+    spacing = int(groups * width * block * (p - 1) ** 2).bit_length()
+    shifts = 2.0 ** (spacing * np.arange(width))
+
+    def pack(indices):
+        # Returns an array of shape (groups,) + indices.shape
+        padded = np.zeros((groups * width,) + indices.shape)
+        padded[:n] = np.moveaxis(field.coef_table[indices], 2, 0)
+        return np.tensordot(shifts, padded.reshape((groups, width) + indices.shape), axes = (0, 1))
+
+    a_packed, b_packed = pack(a), pack(b)
+    mask = (1 << spacing) - 1
+    product = np.zeros((2 * groups * width - 1, rows, columns), dtype = np.int64)
+    for start in range(0, inner, block):
+        stop = min(start + block, inner)
+        for diagonal in range(2 * groups - 1):
+            packed = np.zeros((rows, columns))
+            for i in range(max(0, diagonal - groups + 1), min(diagonal, groups - 1) + 1):
+                packed += np.dot(a_packed[i, :, start:stop], b_packed[diagonal - i, start:stop, :])
+            packed = packed.astype(np.int64)
+            for k in range(2 * width - 1):
+                product[diagonal * width + k] += (packed >> (spacing * k)) & mask
+        if block < inner:
+            product %= p
+
+    if n == 1:
+        if subtract_from is not None:
+            return (subtract_from - product[0]) % p
+        return product[0] % p
+
+    # Reduce the product polynomials using the powers of the primitive
+    # element, in floating point if that is still exact
+    powers = field.coef_table[[field._one] + list(range(1, 2 * n - 1))]
+    if (2 * n - 1) * (p - 1) * 2 ** (spacing + 1) >= 2 ** 53:
+        product %= p
+    coefs = np.tensordot(product[:2 * n - 1].astype(np.float64), powers.astype(np.float64), axes = (0, 0))
+    coefs = coefs.astype(np.int64)
+    if subtract_from is not None:
+        coefs = field.coef_table[subtract_from] - coefs
+    return field._indices_from_coefs(coefs % p)
+
+
+def _packing(p, n, inner):
+    """ Choose how many coefficients to pack together in each number, and how
+        long a block of the inner dimension to sum before reducing modulo p.
+    """
+    largest = (p - 1) ** 2
+    for width in range(n, 0, -1):
+        groups = -(-n // width)
+        if (2 * width - 1) * int(groups * width * inner * largest).bit_length() <= 53:
+            return width, inner
+    return 1, max(1, (2 ** 53 - 1) // (n * largest))
+
+
+def _row_reduce(field, matrix, columns = None):
+    """ Blocked Gauss-Jordan elimination of a matrix of element indices.
+
+        The columns are taken in panels. The pivots of a panel are found by
+        reducing only the panel itself; if they sit in rows P and columns C,
+        the rows P are replaced by :math:`B^{-1} M_P` where
+        :math:`B = M_{P, C}`, and every other row r becomes
+        :math:`M_r - M_{r, C} B^{-1} M_P`. Both updates are matrix products.
+
+        Args:
+            matrix (np.ndarray): The indices of the entries.
+            columns (int): Only look for pivots among the first columns
+                (e.g. for an augmented matrix). By default, all of them.
+
+        Returns:
+            A tuple (reduced, pivots, scale), where reduced is the reduced row
+            echelon form, pivots are the pivot columns, and scale is the index
+            of the determinant of the matrix if it is square and invertible.
+    """
+    reduced = np.array(matrix, dtype = np.int64)
+    num_rows = reduced.shape[0]
+    if columns is None:
+        columns = reduced.shape[1]
+
+    pivots = []
+    scale = field._one
+    minus_one = field.neg(field._one)
+    for start in range(0, columns, PANEL_WIDTH):
+        rank = len(pivots)
+        if rank == num_rows:
+            break
+        stop = min(start + PANEL_WIDTH, columns)
+
+        # Usually a few rows are enough to find a pivot in every column of
+        # the panel; if not, use all of them
+        panel_rows, panel_cols = _gauss_jordan(field, reduced[rank:rank + 2 * PANEL_WIDTH, start:stop])[1:3]
+        if len(panel_cols) < stop - start and rank + 2 * PANEL_WIDTH < num_rows:
+            panel_rows, panel_cols = _gauss_jordan(field, reduced[rank:, start:stop])[1:3]
+        if len(panel_cols) == 0:
+            continue
+
+        # Bring the pivot rows up, keeping the others in order
+        chosen = rank + np.array(panel_rows)
+        rest = np.setdiff1d(np.arange(rank, num_rows), chosen)
+        order = np.concatenate([np.arange(rank), chosen, rest])
+        if _permutation_parity(order) == 1:
+            scale = field.mul(scale, minus_one)
+        reduced = reduced[order]
+
+        count = len(panel_cols)
+        cols = start + np.array(panel_cols)
+        block = reduced[rank:rank + count, cols]
+        augmented = np.hstack([block, np.eye(count, dtype = np.int64) * field._one])
+        block_reduced, block_rows, block_cols, block_det = _gauss_jordan(field, augmented, count)
+        scale = field.mul(scale, block_det)
+
+        normalized = _matmul(field, block_reduced[:, count:], reduced[rank:rank + count])
+        others = np.concatenate([np.arange(rank), np.arange(rank + count, num_rows)])
+        if len(others) > 0:
+            reduced[others] = _matmul(field, reduced[others][:, cols], normalized, reduced[others])
+        reduced[rank:rank + count] = normalized
+        pivots.extend(cols.tolist())
+
+    return reduced, pivots, scale
+
+
+def _gauss_jordan(field, matrix, columns = None):
+    """ Gauss-Jordan elimination, one row operation at a time.
+
+        Args:
+            matrix (np.ndarray): The indices of the entries.
+            columns (int): Only look for pivots among the first columns.
+
+        Returns:
+            A tuple (reduced, rows, cols, scale): the reduced matrix, the
+            original positions of the rows used for each pivot and the pivot
+            columns, and the index of the determinant of the matrix if it is
+            square and invertible.
+    """
+    reduced = np.array(matrix, dtype = np.int64)
+    num_rows = reduced.shape[0]
+    if columns is None:
+        columns = reduced.shape[1]
+
+    positions = np.arange(num_rows)
+    rows, cols = [], []
+    scale = field._one
+    for col in range(columns):
+        rank = len(rows)
+        if rank == num_rows:
+            break
+        candidates = np.nonzero(reduced[rank:, col])[0]
+        if len(candidates) == 0:
+            continue
+        pivot = rank + candidates[0]
+        if pivot != rank:
+            reduced[[rank, pivot]] = reduced[[pivot, rank]]
+            positions[[rank, pivot]] = positions[[pivot, rank]]
+            scale = field.neg(scale)
+
+        scale = field.mul(scale, reduced[rank, col])
+        reduced[rank] = field.div(reduced[rank], reduced[rank, col])
+        factors = reduced[:, col].copy()
+        factors[rank] = 0
+        reduced = field.sub(reduced, field.mul(factors[:, np.newaxis], reduced[rank][np.newaxis, :]))
+        rows.append(int(positions[rank]))
+        cols.append(col)
+
+    return reduced, rows, cols, scale
+
+
+def _permutation_parity(order):
+    """ The parity (0 for even, 1 for odd) of a permutation of 0, ..., n - 1. """
+    seen = np.zeros(len(order), dtype = bool)
+    parity = 0
+    for start in range(len(order)):
+        length = 0
+        position = start
+        while not seen[position]:
+            seen[position] = True
+            position = order[position]
+            length += 1
+        if length > 0:
+            parity ^= (length - 1) & 1
+    return parity
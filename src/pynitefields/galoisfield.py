@@ -10,10 +10,41 @@
 # 
 
 import sys
-import math
+import time
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 
-from pynitefields.fieldelement import FieldElement
+import numpy as np
+
+from pynitefields.fieldelement import FieldElement, ElementList
+from pynitefields.fieldbasis import FieldBasis, _as_indices
+from pynitefields.polynomial import Polynomial
+from pynitefields.normalbasis import NormalBasis
 from pynitefields.pthrootofunity import pthRootOfUnity
+from pynitefields.memory import _element_bytes
+from pynitefields.discretelog import log_solver, _Arithmetic
+from pynitefields.towerfield import TowerField
+from pynitefields import profiling
+
+# The number of bytes handled at a time by the byte buffer operations.
+BUFFER_BLOCK_SIZE = 1 << 16
+
+# The default number of elements (or tuples of elements) in each block
+# yielded by iter_blocks and product_blocks.
+ITER_BLOCK_SIZE = 1 << 16
+
+# The bytes of curve value tables kept by each field for evaluate, by
+# default; the least recently used are dropped when there are more.
+CURVE_CACHE_BYTES = 1 << 24
+
+# The number of curves evaluated only once that each field remembers, so
+# that it builds their table if they come back.
+CURVE_SEEN_SIZE = 1024
+
+# The memory ceiling, in bytes, used by fields constructed without one.
+# None means no ceiling: every field makes all its FieldElements up front.
+DEFAULT_MEMORY_LIMIT = None
 
 class GaloisField():
     """ A finite field, or Galois field.
@@ -25,6 +56,10 @@ class GaloisField():
             coefs (list): A list of integers representing the coefficients of
                           an irreducible primitive polynomial of degree n over
                           GF(p). Default is the empty list for prime fields.
+            memory_limit (int): The most memory, in bytes, the field may use
+                          for its FieldElements and their string 
+                          representations. If they would take more, the field
+                          is lazy. By default, DEFAULT_MEMORY_LIMIT.
 
         Attributes:
             p (int): The prime dimension of the field
@@ -34,12 +69,29 @@ class GaloisField():
 
             coefs (list): The coefficients of the irreducible polynomial
             elements (list): A list of all FieldElements in this finite field.
+            coef_table (np.ndarray): A (dim, n) integer array whose row i holds
+                                     the polynomial basis expansion
+                                     coefficients of the element at index i.
             is_sdb (bool): A boolean which tells us whether the elements'
                            expansion coefficients are in the self-dual
                            basis (True) or the polynomial basis (False). 
                            The default is False.
+            sdb_coef_table (np.ndarray): A (dim, n) integer array whose row i
+                                     holds the self-dual basis expansion 
+                                     coefficients of the element at index i.
+                                     None unless to_sdb has been called.
+            basis (FieldBasis): The basis the elements are expanded in, as
+                                set by to_sdb. None for the polynomial basis.
+            lazy (bool): Whether the field keeps only coef_table, making its 
+                         FieldElements (and the strings they look each other
+                         up by) on demand. Lazy fields are built with NumPy
+                         rather than element by element, and their elements
+                         are new objects every time they are accessed, but 
+                         otherwise behave the same.
     """
-    def __init__(self, p, n = 1, coefs = []):
+    def __init__(self, p, n = 1, coefs = [], memory_limit = None):
+        start_time = time.perf_counter()
+
         # TODO implement check for prime number
         self.p = p
 
@@ -56,7 +108,7 @@ class GaloisField():
             self.coefs = []
         
         # Set separate parameter for the field dimension
-        self.dim = int(math.pow(p, n))
+        self.dim = p ** n
 
         # Initialize the pth root of unity
         self.w = pthRootOfUnity(p)
@@ -74,8 +126,29 @@ class GaloisField():
                 sys.exit()
 
 
+        # Decide whether the FieldElements fit under the memory ceiling; if
+        # not, only the table of coefficients is kept.
+        if memory_limit is None:
+            memory_limit = DEFAULT_MEMORY_LIMIT
+        self.memory_limit = memory_limit
+        self.lazy = memory_limit is not None and _eager_bytes(self.p, self.n) > memory_limit
+        if self.lazy and _lazy_bytes(self.p, self.n) > memory_limit:
+            raise MemoryError("Error, even without its FieldElements, GF(" + str(self.p) + "^" + str(self.n) + 
+                              ") needs about " + str(_lazy_bytes(self.p, self.n)) + 
+                              " bytes, over the memory limit of " + str(memory_limit) + ".")
+
+        self._place_values = self.p ** np.arange(self.n, dtype = np.int64)
+        self._index_of_packed = None
+        self._packed_of_index = None
+        self._field_list = None
+
         # Generate the actual field elements
-        if self.n == 1:
+        if self.lazy:
+            self.coef_table = self._power_table()
+            if self.n > 1:
+                self._field_list = _LazyFieldList(self)
+            self.elements = _LazyElements(self)
+        elif self.n == 1:
             # Prime case is easy. No field basis, just the numbers from 0 to p,
             # stored as FieldElements.
             self.elements = []
@@ -91,7 +164,7 @@ class GaloisField():
             # Hold all the coefficients for each element
             # For simplicity, rather than a list of list, represent each field element as a 
             # string of coefficients, i.e. [0, 1, 1] -> "011"  
-            field_list = []
+            field_list = ElementList()
 
             # The polynomial basis contains n elements
             # The first element is always 0
@@ -110,6 +183,9 @@ class GaloisField():
             self.elements.append(FieldElement(self.p, self.n, nth_coefs))
             field_list.append(",".join([str(x) for x in nth_coefs]))
 
+            # Keep a set alongside field_list so checking for repeats is cheap
+            seen_reps = set(field_list)
+
             # For the remaining powers, multiply the previous element by primitive element
             for el in range(self.n + 1, self.dim):
                 # Shift all coefficients ahead by 1 power of x and take the sum because
@@ -127,9 +203,10 @@ class GaloisField():
                 # TODO Make sure that this element is not already in the list - if it is, then
                 # we did not use a true primitive polynomial.
                 str_rep = ",".join([str(x) for x in sum.exp_coefs])
-                if str_rep not in field_list:
+                if str_rep not in seen_reps:
                     self.elements.append(sum)
                     field_list.append(str_rep)
+                    seen_reps.add(str_rep)
                 else:
                     raise ValueError("Repeated field element detected; please make sure your irreducible polynomial is primitive.")
                  
@@ -138,12 +215,51 @@ class GaloisField():
             for i in range(len(self.elements)):
                 (self.elements[i]).field_list = field_list 
                 (self.elements[i]).prim_power = i
+            self._field_list = field_list
+
+        # Expansion coefficients of every element as a single integer array, 
+        # indexed in the same way as self.elements. Basis changes and traces
+        # are linear, so they can be done on this table all at once.
+        if not self.lazy:
+            self.coef_table = np.array([el.exp_coefs for el in self.elements], dtype = np.int64)
+
+        # Index of the multiplicative identity, and tables for bulk arithmetic
+        # which are built the first time they are needed.
+        self._one = 1 if self.n == 1 else self.dim - 1
+        self._zech_table = None
+        self._prime_log = None
+        self._prime_exp = None
+        self._byte_products = None
+
+        # Per-element tables (orders, norms, ...), built the first time
+        # they're asked for, keyed by name
+        self._element_tables = {}
+        self._quadratic_solver = None
+
+        # Value tables of the curves given to evaluate, most recent last,
+        # and the curves seen once; evaluate may be called from many threads
+        self.curve_cache_bytes = CURVE_CACHE_BYTES
+        self._curve_tables = OrderedDict()
+        self._curves_seen = OrderedDict()
+        self._curve_lock = threading.Lock()
+        self._curve_cache_hits = 0
+        self._curve_cache_misses = 0
 
         # SDB information
         self.is_sdb = False # Have we indicated an sdb?
         self.sdb = [] # The indices of the elements that make up the sdb
         self.sdb_norms = [] # The trace of the sdb squared - usually 1, but
                             # if the sdb is almost sd, then one is not 1.
+        self.sdb_coef_table = None # Expansion coefficients in the sdb
+        self.basis = None # The FieldBasis the elements are expanded in
+
+        # Views of this field in other bases, keyed by their element indices
+        self._basis_views = {}
+
+        # Profiling is off until enable_profiling is called, but the time
+        # taken to construct the field is always kept for it.
+        self.profiler = None
+        self._construction_seconds = time.perf_counter() - start_time
 
 
     def __getitem__(self, idx):
@@ -174,11 +290,277 @@ class GaloisField():
         return iter(self.elements)
 
 
+    def iter_blocks(self, block_size = ITER_BLOCK_SIZE, coefs = False):
+        """ Iterate over the field in blocks of element indices.
+
+            Unlike iterating over the field itself, this never touches the
+            FieldElements, so that sweeps over every element can be done with
+            the bulk arithmetic functions, a block at a time, in bounded
+            memory.
+
+            Args:
+                block_size (int): The number of elements in each block (the
+                    last one may be shorter).
+                coefs (bool): Also yield the polynomial basis coefficients of
+                    the elements of each block.
+
+            Returns:
+                A generator of arrays of consecutive indices, in the same order
+                as iterating over the field; or with coefs, of pairs
+                (indices, coefficients) where the coefficients are an array of
+                shape (block size, n).
+        """
+        for indices, coef_rows in product_blocks([self], block_size, coefs = True):
+            yield (indices[:, 0], coef_rows) if coefs else indices[:, 0]
+
+
+    def in_basis(self, element_indices):
+        """ Get a view of this field expanded in some other basis.
+
+            Any set of :math:`n` linearly independent elements can be used,
+            though most often this will be a self-dual basis. Unlike to_sdb, 
+            this leaves the field and its elements untouched. The expansion 
+            coefficients of every element are computed once per basis, and 
+            the view is cached, so asking for the same basis again is free.
+
+            Args:
+                element_indices (list): The indices of the FieldElements 
+                    (as powers of the primitive element) that make up the 
+                    basis.
+
+            Returns:
+                A FieldBasis for the requested basis. Raises a ValueError if
+                the elements are not linearly independent.
+        """
+        key = tuple(element_indices)
+        if key not in self._basis_views:
+            with self._timed("basis_conversion"):
+                self._basis_views[key] = FieldBasis(self, element_indices)
+        return self._basis_views[key]
+
+
+    def normal_basis(self, element_index = None):
+        """ Get a view of this field expanded in a normal basis.
+
+            In a normal basis the Frobenius map is a cyclic rotation of the
+            expansion coefficients, and the trace is their sum; see 
+            NormalBasis. The view is cached like those from in_basis.
+
+            Args:
+                element_index (int): The index of the normal element to build 
+                    the basis from. If None, one is found automatically.
+
+            Returns:
+                A NormalBasis. Raises a ValueError if the element provided is 
+                not normal.
+        """
+        key = ("normal", element_index)
+        if key not in self._basis_views:
+            with self._timed("basis_conversion"):
+                self._basis_views[key] = NormalBasis(self, element_index)
+        return self._basis_views[key]
+
+
+    def memory_usage(self):
+        """ The memory used by this field, broken down by component.
+
+            Returns:
+                A dict of the number of bytes used by "elements" (the 
+                FieldElements the field holds, and their list), "field_list" 
+                (the string representations shared by the elements), 
+                "coef_table", "tables" (the lookup tables for bulk arithmetic,
+                which are built the first time they're needed), "bases" (the
+                expansion coefficients in other bases), and their "total". 
+                The elements a lazy field makes on demand belong to whoever
+                holds on to them, and are not counted.
+        """
+        usage = dict.fromkeys(["elements", "field_list", "coef_table", "tables", "bases"], 0)
+        if not self.lazy:
+            usage["elements"] = sys.getsizeof(self.elements) + sum(_element_bytes(el) for el in self.elements)
+            if self._field_list is not None:
+                usage["field_list"] = sys.getsizeof(self._field_list) + sum(sys.getsizeof(s) for s in self._field_list)
+                usage["field_list"] += sys.getsizeof(self._field_list.__dict__.get("_positions", {}))
+        usage["coef_table"] = self.coef_table.nbytes
+        usage["tables"] = sum(table.nbytes for table in self._tables() if table is not None)
+
+        # Views share some arrays, e.g. the sdb table is that of a view
+        arrays = {}
+        for view in list(self._basis_views.values()) + [self.basis]:
+            for value in vars(view).values() if view is not None else []:
+                if isinstance(value, np.ndarray) and value is not self.coef_table:
+                    arrays[id(value)] = value
+        usage["bases"] = sum(array.nbytes for array in arrays.values())
+
+        usage["total"] = sum(usage.values())
+        return usage
+
+
+    def _tables(self):
+        """ The lookup tables of the field, or None for those not yet built. """
+        with self._curve_lock:
+            curve_tables = list(self._curve_tables.values())
+        return [self._place_values, self._index_of_packed, self._packed_of_index, self._zech_table, 
+                self._prime_log, self._prime_exp, self._byte_products, self._quadratic_solver] + list(self._element_tables.values()) + \
+               curve_tables
+
+
+    def _power_table(self):
+        """ Compute coef_table for a lazy field with NumPy.
+
+            For prime fields, nothing needs to be stored at all.
+            The coefficients of the powers :math:`\\sigma^0, \\ldots, 
+            \\sigma^{m-1}` of the primitive element give those of 
+            :math:`\\sigma^m, \\ldots, \\sigma^{2m-1}` in one matrix product,
+            by the matrix of multiplication by :math:`\\sigma^m`, so the table
+            doubles in length at each step. The coefficients are stored in the
+            smallest integer type that holds them, and the products are done
+            a block of rows at a time, so that no int64 copy of the whole 
+            table is ever made.
+        """
+        if self.n == 1:
+            return _PrimeCoefTable(self.p)
+
+        # Multiplying by sigma shifts the coefficients up by one, and replaces
+        # sigma^n using the (monic) irreducible polynomial.
+        reduction = np.array([(-c) % self.p for c in self.coefs[:self.n]], dtype = np.int64)
+        def times_sigma(rows):
+            shifted = np.roll(rows, 1, axis = -1)
+            shifted[..., 0] = 0
+            return (shifted + rows[..., -1:] * reduction) % self.p
+
+        # Row k holds sigma^k for now
+        powers = np.zeros((self.dim, self.n), dtype = _coef_dtype(self.p))
+        powers[0, 0] = 1
+        filled = 1
+        while filled < self.dim - 1:
+            # Rows sigma^m, ..., sigma^(m + n - 1) of the multiplication matrix
+            matrix = [times_sigma(powers[filled - 1].astype(np.int64))]
+            for _ in range(1, self.n):
+                matrix.append(times_sigma(matrix[-1]))
+            matrix = np.array(matrix)
+            count = min(filled, self.dim - 1 - filled)
+            for start in range(0, count, ITER_BLOCK_SIZE):
+                stop = min(start + ITER_BLOCK_SIZE, count)
+                powers[filled + start:filled + stop] = np.dot(powers[start:stop].astype(np.int64), matrix) % self.p
+            filled += count
+
+        # Zero first, then sigma^1, ..., sigma^(dim - 2), and 1 last
+        powers[-1] = powers[0]
+        powers[0] = 0
+
+        # Fill the packed lookup table, which also finds repeats: an element 
+        # appearing twice leaves some other one missing.
+        index_of_packed = np.full(self.dim, -1, dtype = np.int64)
+        for start in range(0, self.dim, ITER_BLOCK_SIZE):
+            rows = powers[start:start + ITER_BLOCK_SIZE].astype(np.int64)
+            index_of_packed[np.dot(rows, self._place_values)] = np.arange(start, start + len(rows))
+        if np.any(index_of_packed < 0):
+            raise ValueError("Repeated field element detected; please make sure your irreducible polynomial is primitive.")
+        self._index_of_packed = index_of_packed
+        return _CompactCoefTable(powers)
+
+
+    def _fits(self, nbytes):
+        """ Whether a table of nbytes more stays under the memory ceiling.
+
+            The tables for bulk arithmetic are built the first time they are
+            needed; in fields with a ceiling, those that would go over it are
+            not built, and the operations fall back on slower ways that don't
+            need them.
+        """
+        if self.memory_limit is None:
+            return True
+        used = sum(table.nbytes for table in self._tables() if table is not None)
+        used += self.coef_table.nbytes if self.lazy else _eager_bytes(self.p, self.n)
+        return used + nbytes <= self.memory_limit
+
+
+    def enable_profiling(self):
+        """ Start counting the operations done in this field.
+
+            Returns:
+                The FieldProfiler the field reports to (see 
+                pynitefields.profiling), which starts off with the time taken to
+                construct the field. If profiling is already on, the existing
+                profiler is returned.
+        """
+        if self.profiler is None:
+            self.profiler = profiling.FieldProfiler()
+            self.profiler.seconds["construction"] = self._construction_seconds
+            if self.n == 1:
+                profiling._prime_profilers[self.p] = self.profiler
+            else:
+                self._field_list.profiler = self.profiler
+            profiling.active += 1
+        return self.profiler
+
+
+    def disable_profiling(self):
+        """ Stop counting operations; the profiler keeps what it counted. """
+        if self.profiler is not None:
+            if self.n == 1:
+                if profiling._prime_profilers.get(self.p) is self.profiler:
+                    del profiling._prime_profilers[self.p]
+            else:
+                self._field_list.profiler = None
+            self.profiler = None
+            profiling.active -= 1
+
+
+    @contextmanager
+    def profiling(self):
+        """ Count operations only inside a with block.
+
+            For example::
+
+                with gf.profiling() as profiler:
+                    gf.mul(a, b)
+                profiler.snapshot()["counts"]["bulk.mul"]   # 1
+
+            If profiling was already on, it stays on afterwards and the same
+            profiler is used.
+        """
+        was_enabled = self.profiler is not None
+        profiler = self.enable_profiling()
+        try:
+            yield profiler
+        finally:
+            if not was_enabled:
+                self.disable_profiling()
+
+
+    def _count(self, name, amount = 1):
+        """ Add to a count of the profiler, if profiling is on. """
+        if self.profiler is not None:
+            self.profiler.counts[name] += amount
+
+
+    def _tally(self, name, result):
+        """ Count a call of a bulk operation and the number of its results,
+            if profiling is on, and pass the result through.
+        """
+        if self.profiler is not None:
+            self.profiler.counts[name] += 1
+            self.profiler.counts[name + ".elements"] += np.size(result)
+        return result
+
+
+    def _timed(self, name):
+        """ A context manager timing its block for the profiler, if any. """
+        if self.profiler is None:
+            return _untimed()
+        return self.profiler.timer(name)
+
+
     def to_sdb(self, sdb_element_indices):
         """ Transform the expansions coefficients to the self-dual basis.
 
             Currently valid only for fields whose orders are powers of 2.
 
+            This switches every element of the field over to the basis. To 
+            work in a self-dual basis without changing the field for 
+            everyone else using it, use in_basis instead.
+
             Args:
                 sdb_element_indices (list): The indices of the FieldElements 
                     (as powers of the primitive element) that represent the
@@ -207,42 +589,22 @@ class GaloisField():
             print("This is due to the presence of a non-1 normalization coefficient.")
             print("New ordering is " + str(valid_element_indices) + ".")
 
-        # Set the sdb 
-        self.is_sdb = True
-        self.sdb = valid_element_indices
-        self.sdb_norms = valid_sdb_norms
-
-        first_norm_inverse = 1  
+        with self._timed("basis_conversion"):
+            # The coefficients themselves are computed (once) by the view
+            basis = self.in_basis(valid_element_indices)
 
-        if self.p % 2 == 1 and self.n % 2 == 0: # If p odd, n even
-            for i in range(self.p):
-                if (self.sdb_norms[0] * i) % self.p == 1:
-                    first_norm_inverse = i
+            # Set the sdb 
+            self.is_sdb = True
+            self.sdb = basis.element_indices
+            self.sdb_norms = basis.norms
+            self.sdb_coef_table = basis.coord_table
+            self.basis = basis
 
-        # If all goes well, we can start computing the coefficients
-        # in terms of the new elements by using the trace and multiplication
-        # functions.
-        sdb_els = [self.elements[self.sdb[i]] for i in range(0, self.n)]
-        sdb_field_list = []
-        for element in self.elements:
-            sdb_coefs = [] # Expansion coefficients in the sdb
-
-            for i in range(len(sdb_els)):
-                if i == 0:
-                    sdb_coefs.append((first_norm_inverse * tr(element * sdb_els[i])) % self.p)
-                else:
-                    sdb_coefs.append(tr(element * sdb_els[i]))
-
-
-            sdb_field_list.append(",".join([str(x) for x in sdb_coefs]))
-
-            element.is_sdb = True
-            element.sdb_coefs = sdb_coefs
-
-        # Finally, give every element a copy of the sdb coefficients
-        for element in self.elements:
-            element.sdb_field_list = sdb_field_list
-    
+            # Finally, point every element to the new basis. Elements of lazy
+            # fields are made with the basis of the field at the time.
+            if not self.lazy:
+                for element in self.elements:
+                    element.basis = basis
 
 
     def verify_sdb(self, sdb_element_indices):
@@ -277,10 +639,15 @@ class GaloisField():
 
         sdb_norms = []
 
+        # All the traces we need, tr(sdb_i * sdb_j), computed in one go
+        sdb_array = np.array(sdb_element_indices)
+        trace_matrix = self._traces(self._index_products(sdb_array[:, np.newaxis], 
+                                                         sdb_array[np.newaxis, :]))
+
         if self.p == 2: # Qubit case
             for i in range(0, self.n):
                 for j in range(i, self.n): # Don't double compute things
-                    trace_result = tr(self.elements[sdb_element_indices[i]] * self.elements[sdb_element_indices[j]])
+                    trace_result = int(trace_matrix[i][j])
 
                     if i == j: # Same element, should have trace 1
                         if trace_result != 1:
@@ -295,7 +662,7 @@ class GaloisField():
         else: # Qudit case
             for i in range(0, self.n):
                 for j in range(0, self.n):
-                    trace_result = tr(self.elements[sdb_element_indices[i]] * self.elements[sdb_element_indices[j]])
+                    trace_result = int(trace_matrix[i][j])
                     
                     if i == j: # Square the element and trace it
                         # Just needs to be in the prime_field
@@ -372,10 +739,959 @@ class GaloisField():
     def to_poly(self):
         """ Switch back to representation in the polynomial basis. 
         """
-        for el in self.elements:
-            el.is_sdb = False
-            el.sdb_coefs = []
+        with self._timed("basis_conversion"):
+            if not self.lazy:
+                for el in self.elements:
+                    el.basis = None
         self.is_sdb = False
+        self.sdb_coef_table = None
+        self.basis = None
+
+
+    def from_coefs(self, coefs):
+        """ Find many elements from their polynomial basis coefficients.
+
+            This, and the other conversions below, turn external data into 
+            element indices (and back) with NumPy, without making any 
+            FieldElements.
+
+            Args:
+                coefs (np.ndarray): An integer array of shape (..., n), each 
+                    row holding the coefficients of an element in [0, p).
+
+            Returns:
+                An array of shape (...) of the indices of the elements. Raises 
+                a ValueError if the rows are not of length n, or a coefficient 
+                is out of range.
+        """
+        coefs = np.asarray(coefs, dtype = np.int64)
+        if coefs.ndim == 0 or coefs.shape[-1] != self.n:
+            raise ValueError("Error, coefficients must be given in rows of length " + str(self.n) + ".")
+        if coefs.size > 0 and (coefs.min() < 0 or coefs.max() >= self.p):
+            raise ValueError("Error, coefficients must be between 0 and " + str(self.p - 1) + ".")
+        return self._tally("bulk.from_coefs", self._indices_from_coefs(coefs))
+
+
+    def to_coefs(self, indices):
+        """ Get the polynomial basis coefficients of many elements.
+
+            Args:
+                indices (np.ndarray): The indices of the elements.
+
+            Returns:
+                An integer array of shape indices.shape + (n,).
+        """
+        return self._tally("bulk.to_coefs", self.coef_table[_as_indices(indices)])
+
+
+    def from_integers(self, values):
+        """ Find many elements from their coefficients packed into integers.
+
+            The coefficients are read as the digits of an integer in base p,
+            the coefficient of :math:`\\sigma^i` being the i-th digit; e.g.
+            in GF(:math:`2^8`) this is the usual byte representation. In 
+            prime fields, the integer is the element itself.
+
+            Args:
+                values (np.ndarray): Integers between 0 and :math:`p^n - 1`.
+
+            Returns:
+                An array of the indices of the elements. Raises a ValueError if
+                a value is out of range.
+        """
+        values = np.asarray(values, dtype = np.int64)
+        if values.size > 0 and (values.min() < 0 or values.max() >= self.dim):
+            raise ValueError("Error, integers must be between 0 and " + str(self.dim - 1) + ".")
+        if self.n == 1:
+            return self._tally("bulk.from_integers", values.copy())
+        if self._index_of_packed is None:
+            self._indices_from_coefs(self.coef_table[:1])
+        return self._tally("bulk.from_integers", self._index_of_packed[values])
+
+
+    def to_integers(self, indices):
+        """ Pack the coefficients of many elements into integers.
+
+            The inverse of from_integers.
+
+            Args:
+                indices (np.ndarray): The indices of the elements.
+
+            Returns:
+                An array of integers between 0 and :math:`p^n - 1`.
+        """
+        indices = _as_indices(indices)
+        if self.n == 1:
+            return self._tally("bulk.to_integers", indices % self.p)
+        if self._packed_of_index is None and not self._fits(8 * self.dim):
+            return self._tally("bulk.to_integers", np.dot(self.coef_table[indices], self._place_values))
+        if self._packed_of_index is None:
+            self._packed_of_index = np.dot(self.coef_table, self._place_values)
+        return self._tally("bulk.to_integers", self._packed_of_index[indices])
+
+
+    def from_powers(self, exponents):
+        """ Find the powers :math:`\\sigma^k` of the primitive element.
+
+            For prime fields, the primitive element is the smallest primitive
+            root. Lazy prime fields compute the powers directly rather than
+            building a table of them (see DiscreteLog).
+
+            Args:
+                exponents (np.ndarray): The integer exponents k, which may be
+                    negative.
+
+            Returns:
+                An array of the indices of the elements :math:`\\sigma^k`.
+        """
+        exponents = np.asarray(exponents, dtype = np.int64) % (self.dim - 1)
+        if self._without_log_tables():
+            return self._tally("bulk.from_powers", log_solver(self).exp(exponents).astype(np.int64))
+        if self.n == 1:
+            self._count("lookup.log")
+            return self._tally("bulk.from_powers", self._prime_log_tables()[1][exponents])
+        return self._tally("bulk.from_powers", np.where(exponents == 0, self._one, exponents))
+
+
+    def to_powers(self, indices):
+        """ Find the discrete logarithms k of many non-zero elements 
+            :math:`\\sigma^k`, with :math:`0 \\leq k < p^n - 1`.
+
+            The inverse of from_powers. Lazy prime fields find the logarithms
+            by Pohlig-Hellman (see DiscreteLog) rather than with a table.
+
+            Args:
+                indices (np.ndarray): The indices of non-zero elements.
+
+            Returns:
+                An array of the exponents. Raises a ValueError if any element
+                is 0.
+        """
+        indices = _as_indices(indices)
+        if np.any(indices == 0):
+            raise ValueError("Error, 0 is not a power of the primitive element.")
+        if self._without_log_tables():
+            return self._tally("bulk.to_powers", log_solver(self).log(indices))
+        if self.n == 1:
+            self._count("lookup.log")
+            return self._tally("bulk.to_powers", self._prime_log_tables()[0][indices])
+        return self._tally("bulk.to_powers", indices % (self.dim - 1))
+
+
+    def to_elements(self, indices):
+        """ Get the FieldElements at many indices.
+
+            Args:
+                indices (np.ndarray): The indices of the elements.
+
+            Returns:
+                A (nested) list of FieldElements with the shape of indices.
+        """
+        elements = self.elements
+        def build(x):
+            return elements[x] if isinstance(x, int) else [build(y) for y in x]
+        return build(np.asarray(indices, dtype = np.int64).tolist())
+
+
+    def from_elements(self, elements):
+        """ Get the indices of many FieldElements.
+
+            Args:
+                elements (list): A (nested) list of FieldElements of this field.
+
+            Returns:
+                An array of their indices, with the shape of the list.
+        """
+        def build(x):
+            return x.prim_power if hasattr(x, "prim_power") else [build(y) for y in x]
+        return np.array(build(elements), dtype = np.int64)
+
+
+    def in_subfield(self, indices, m):
+        """ Test whether elements lie in the subfield GF(:math:`p^m`).
+
+            The non-zero elements of the subfield are the powers of 
+            :math:`\\sigma^k`, :math:`k = (p^n - 1)/(p^m - 1)`, so this is a
+            test of whether k divides the index, without any exponentiation. 
+            To move elements between the subfield and a GaloisField of its 
+            own, see Embedding.
+
+            Args:
+                indices (np.ndarray): The indices of the elements.
+                m (int): The degree of the subfield, which must divide n.
+
+            Returns:
+                A boolean array with the shape of indices.
+        """
+        if m < 1 or self.n % m != 0:
+            raise ValueError("Error, GF(" + str(self.p) + "^" + str(m) + ") is not a subfield of GF(" + 
+                             str(self.p) + "^" + str(self.n) + ").")
+        step = (self.dim - 1) // (self.p ** m - 1)
+        return np.asarray(_as_indices(indices)) % step == 0
+
+
+    def extend(self, coefs):
+        """ Build the extension GF(:math:`(p^n)^b`) of this field.
+
+            Args:
+                coefs (list): The indices in this field of the coefficients
+                    of a monic irreducible polynomial of degree b over it,
+                    lowest degree first.
+
+            Returns:
+                A TowerField over this field.
+        """
+        return TowerField(self, coefs)
+
+
+    def orders(self, indices = None):
+        """ The multiplicative orders of many field elements.
+
+            This, and the other properties below, follow from the index alone:
+            :math:`\\sigma^k` has order :math:`(p^n - 1) / \\gcd(k, p^n - 1)`.
+            Each is computed for the whole field at once the first time it is
+            asked for, and then looked up; lazy fields compute them for the
+            given elements only, every time.
+
+            Args:
+                indices (np.ndarray): The indices of the elements. By default,
+                    all elements of the field in order.
+
+            Returns:
+                An integer array of the orders, with the shape of indices. The
+                order of 0 is given as 0.
+        """
+        def compute(indices):
+            logs = self._logs(indices)
+            return np.where(indices == 0, 0, (self.dim - 1) // np.gcd(logs, self.dim - 1))
+        return self._element_table("order", compute, indices)
+
+
+    def norms(self, indices = None):
+        """ The norms :math:`N(x) = x^{(p^n - 1)/(p - 1)}` of many field elements.
+
+            The norm is the product of the conjugates of x, and lies in 
+            GF(:math:`p`).
+
+            Args:
+                indices (np.ndarray): The indices of the elements. By default,
+                    all elements of the field in order.
+
+            Returns:
+                An integer array of the norms, as integers mod p.
+        """
+        def compute(indices):
+            if self.n == 1:
+                return indices.copy()
+            powers = self.power(np.where(indices == 0, self._one, indices), (self.dim - 1) // (self.p - 1))
+            return np.where(indices == 0, 0, self.coef_table[powers, 0])
+        return self._element_table("norm", compute, indices)
+
+
+    def traces(self, indices = None):
+        """ The traces of many field elements, as integers mod p.
+
+            Args:
+                indices (np.ndarray): The indices of the elements. By default,
+                    all elements of the field in order.
+
+            Returns:
+                An integer array of the traces.
+        """
+        return self._element_table("trace", self._traces, indices)
+
+
+    def cyclotomic_cosets(self, indices = None):
+        """ The cyclotomic cosets of many field elements.
+
+            The conjugates of :math:`\\sigma^k` are the :math:`\\sigma^{kp^i}`,
+            so the conjugacy class of a non-zero element is given by the 
+            cyclotomic coset of k modulo :math:`p^n - 1`, which we identify by
+            its smallest member (the coset leader).
+
+            Args:
+                indices (np.ndarray): The indices of the elements. By default,
+                    all elements of the field in order.
+
+            Returns:
+                An integer array of the coset leaders; -1 for 0, which is 
+                alone in its class.
+        """
+        def compute(indices):
+            return np.where(indices == 0, -1, self._coset_leaders(self._logs(indices)))
+        return self._element_table("coset", compute, indices)
+
+
+    def minimal_polynomial_ids(self, indices = None):
+        """ Identify the minimal polynomials of many field elements.
+
+            Conjugate elements share their minimal polynomial, so for power of
+            prime fields the id is 0 for the element 0 (whose minimal 
+            polynomial is x), and otherwise 1 plus the position of the 
+            element's coset leader among all coset leaders, in increasing 
+            order. For prime fields, the id of a is a itself, for x - a. Either
+            way, the id is a row of minimal_polynomials().
+
+            Args:
+                indices (np.ndarray): The indices of the elements. By default,
+                    all elements of the field in order.
+
+            Returns:
+                An integer array of the ids.
+        """
+        def compute(indices):
+            if self.n == 1:
+                return indices.copy()
+            leaders = np.unique(self._coset_leaders(np.arange(self.dim - 1)))
+            position = np.searchsorted(leaders, self._coset_leaders(self._logs(indices)))
+            return np.where(indices == 0, 0, position + 1)
+        return self._element_table("minimal_polynomial_id", compute, indices)
+
+
+    def minimal_polynomials(self):
+        """ The minimal polynomials of all the elements of the field.
+
+            Each is computed once, from the leader s of a coset, as the 
+            product of :math:`x - \\sigma^{sp^i}` over the coset, for all the
+            cosets of the same size at once.
+
+            Returns:
+                An integer array whose row i holds the coefficients of the 
+                minimal polynomial with id i (see minimal_polynomial_ids), 
+                lowest degree first, as indices of field elements, padded
+                with zeros to length n + 1.
+        """
+        if "minimal_polynomials" in self._element_tables:
+            return self._element_tables["minimal_polynomials"]
+
+        if self.n == 1:
+            # x - a for each element a
+            table = np.zeros((self.p, 2), dtype = np.int64)
+            table[:, 0] = self.neg(np.arange(self.p))
+            table[:, 1] = self._one
+        else:
+            modulus = self.dim - 1
+            leaders = np.unique(self._coset_leaders(np.arange(modulus)))
+            # The size of the coset of s is the smallest d with s p^d = s
+            sizes = np.full(len(leaders), self.n)
+            for d in range(self.n - 1, 0, -1):
+                if self.n % d == 0:
+                    sizes[leaders * pow(self.p, d, modulus) % modulus == leaders] = d
+
+            table = np.zeros((len(leaders) + 1, self.n + 1), dtype = np.int64)
+            table[0, 1] = self._one
+            for d in np.unique(sizes):
+                rows = np.flatnonzero(sizes == d)
+                roots = self.from_powers(leaders[rows, np.newaxis] * 
+                                         (self.p ** np.arange(d) % modulus) % modulus)
+                # Multiply by (x - r) for each root r in turn
+                poly = np.full((len(rows), 1), self._one, dtype = np.int64)
+                for i in range(d):
+                    product = np.zeros((len(rows), poly.shape[1] + 1), dtype = np.int64)
+                    product[:, 1:] = poly
+                    product[:, :-1] = self.sub(product[:, :-1], self.mul(roots[:, i:i + 1], poly))
+                    poly = product
+                table[rows + 1, :d + 1] = poly
+
+        if not self.lazy and self._fits(table.nbytes):
+            self._element_tables["minimal_polynomials"] = table
+        return table
+
+
+    def minimal_polynomial(self, element):
+        """ The minimal polynomial of a field element over GF(:math:`p`).
+
+            Args:
+                element (FieldElement or int): The element, or its index.
+
+            Returns:
+                The monic irreducible Polynomial of smallest degree with the 
+                element as a root.
+        """
+        poly_id = int(self.minimal_polynomial_ids(np.asarray(_as_indices(element)).reshape(1))[0])
+        if self.lazy and self.n == 1:
+            # Don't build the table of the whole field for one row
+            row = np.array([self.neg(poly_id), self._one])
+        else:
+            row = self.minimal_polynomials()[poly_id]
+        degree = np.flatnonzero(row)[-1]
+        return Polynomial(self, row[:degree + 1])
+
+
+    def _element_table(self, name, compute, indices):
+        """ Look up a per-element table, building it the first time.
+
+            Args:
+                name (str): The name of the table, in self._element_tables.
+                compute (function): Computes the table entries for an array of
+                    indices.
+                indices (np.ndarray): The indices to look up, or None for all.
+
+            Returns:
+                The entries of the table at indices.
+        """
+        indices = np.arange(self.dim) if indices is None else np.asarray(_as_indices(indices), dtype = np.int64)
+        if self.lazy or (name not in self._element_tables and not self._fits(8 * self.dim)):
+            return compute(indices)
+        if name not in self._element_tables:
+            self._element_tables[name] = compute(np.arange(self.dim))
+        self._count("lookup." + name)
+        return self._element_tables[name][indices]
+
+
+    def _logs(self, indices):
+        """ Discrete logs of the elements at indices, with 0 for the element 0. """
+        return self.to_powers(np.where(indices == 0, self._one, indices))
+
+
+    def _coset_leaders(self, logs):
+        """ The smallest member of the cyclotomic coset of each log. """
+        modulus = self.dim - 1
+        leaders, conjugates = logs.copy(), logs
+        for _ in range(1, self.n):
+            conjugates = conjugates * self.p % modulus
+            leaders = np.minimum(leaders, conjugates)
+        return leaders
+
+
+    def is_square(self, indices):
+        """ Test whether many field elements are squares.
+
+            In odd characteristic, :math:`\\sigma^k` is a square exactly when
+            k is even; lazy prime fields, which have no logarithm tables, use
+            Euler's criterion instead. In characteristic 2 every element is
+            a square.
+
+            Args:
+                indices (np.ndarray): The indices of the elements.
+
+            Returns:
+                A boolean array with the shape of indices. 0 is a square.
+        """
+        indices = np.asarray(_as_indices(indices), dtype = np.int64)
+        if self.p == 2:
+            return np.ones(indices.shape, dtype = bool)
+        if self._without_log_tables():
+            arithmetic = _Arithmetic(self)
+            return (indices == 0) | (arithmetic.power(indices.ravel(), (self.p - 1) // 2) == 1).reshape(indices.shape)
+        return (indices == 0) | (self._logs(indices) % 2 == 0)
+
+
+    def sqrt(self, indices):
+        """ Compute square roots of many field elements.
+
+            The square roots of :math:`\\sigma^k`, k even, are 
+            :math:`\\pm \\sigma^{k/2}`, so for fields with tables this is a 
+            halving of the index. In characteristic 2 the square root is the
+            inverse of the Frobenius map, :math:`\\sigma^k \\mapsto 
+            \\sigma^{k 2^{n-1}}`. Lazy prime fields use the Tonelli-Shanks
+            algorithm, on all the elements at once.
+
+            Args:
+                indices (np.ndarray): The indices of the elements.
+
+            Returns:
+                An array with the indices of square roots r; the other root
+                is -r. For prime fields, r is the smaller of the two integers.
+                For power of prime fields in odd characteristic, it is 
+                :math:`\\sigma^{k/2}`. Raises a ValueError if any element is
+                not a square.
+        """
+        indices = np.asarray(_as_indices(indices), dtype = np.int64)
+        if self.p == 2:
+            return self._tally("bulk.sqrt", self.power(indices, 2 ** (self.n - 1)))
+        if not np.all(self.is_square(indices)):
+            raise ValueError("Error, element is not a square.")
+
+        if self._without_log_tables():
+            roots = np.zeros(indices.shape, dtype = np.int64)
+            non_zero = indices != 0
+            roots[non_zero] = self._tonelli_shanks(indices[non_zero])
+        else:
+            roots = np.where(indices == 0, 0, self.from_powers(self._logs(indices) // 2))
+        if self.n == 1:
+            roots = np.minimum(roots, (self.p - roots) % self.p)
+        return self._tally("bulk.sqrt", roots)
+
+
+    def solve_quadratic(self, a, b, c):
+        """ Solve many quadratic equations :math:`ax^2 + bx + c = 0` at once.
+
+            In odd characteristic this is the usual formula 
+            :math:`x = (-b \\pm \\sqrt{b^2 - 4ac}) / 2a`. In characteristic 2
+            the substitution :math:`x = (b/a) y` gives :math:`y^2 + y = \\delta`,
+            :math:`\\delta = ac/b^2`, which has solutions exactly when 
+            :math:`\\text{tr}(\\delta) = 0`. Solving it is linear over GF(2),
+            so its matrix is computed once (with the half-trace 
+            :math:`\\sum_{i=0}^{(n-1)/2} \\delta^{2^{2i}}` when n is odd) and
+            applied to the coefficients of all the :math:`\\delta` at once.
+
+            Args:
+                a, b, c (np.ndarray): Indices of the coefficients, broadcast
+                    together. The elements of a must be non-zero.
+
+            Returns:
+                An integer array with an extra last axis of length 2, holding
+                the indices of the two roots of each equation (the same root
+                twice for a repeated root), or -1 for both if there are none.
+        """
+        a, b, c = np.broadcast_arrays(*[np.asarray(_as_indices(x), dtype = np.int64) for x in (a, b, c)])
+        if np.any(a == 0):
+            raise ValueError("Error, the leading coefficient of a quadratic must be non-zero.")
+
+        if self.p != 2:
+            two = self.from_integers(2)
+            discriminant = self.sub(self.mul(b, b), self.mul(self.add(two, two), self.mul(a, c)))
+            solvable = self.is_square(discriminant)
+            root = self.sqrt(np.where(solvable, discriminant, 0))
+            denominator = self.mul(two, a)
+            roots = np.stack([self.div(self.sub(root, b), denominator),
+                              self.div(self.sub(self.neg(root), b), denominator)], axis = -1)
+            return self._tally("bulk.solve_quadratic", np.where(solvable[..., np.newaxis], roots, -1))
+
+        # With b = 0, x^2 = c/a has the single root sqrt(c/a)
+        ratio = self.div(b, a)
+        delta = self.div(self.mul(a, c), self.mul(b, b) + (b == 0))
+        solvable = (b == 0) | (self.traces(delta) == 0)
+        y = self._indices_from_coefs(np.dot(self.coef_table[delta], self._quadratic_matrix()) % 2)
+        first = np.where(b == 0, self.sqrt(self.div(c, a)), self.mul(ratio, y))
+        roots = np.stack([first, self.add(first, ratio)], axis = -1)
+        return self._tally("bulk.solve_quadratic", np.where(solvable[..., np.newaxis], roots, -1))
+
+
+    def _quadratic_matrix(self):
+        """ The matrix over GF(2) of a solution of :math:`y^2 + y = \\delta`.
+
+            Row i holds the coefficients of the solution for :math:`\\delta = 
+            \\sigma^i`, which is valid for :math:`\\delta` of trace 0. For odd
+            n this is the half-trace. For even n, with :math:`\\tau` of trace
+            1, it is :math:`\\sum_{i=0}^{n-2} \\delta^{2^i} \\sum_{j=i+1}^{n-1}
+            \\tau^{2^j}`.
+        """
+        if self._quadratic_solver is None:
+            basis = self._indices_from_coefs(np.eye(self.n, dtype = np.int64))
+            solutions = np.zeros(self.n, dtype = np.int64)
+            if self.n % 2 == 1:
+                for i in range(0, self.n, 2):
+                    solutions = self.add(solutions, self.power(basis, 2 ** i))
+            else:
+                tau = int(np.flatnonzero(self.traces() == 1)[0])
+                for i in range(self.n - 1):
+                    weight = 0
+                    for j in range(i + 1, self.n):
+                        weight = self.add(weight, self.power(tau, 2 ** j))
+                    solutions = self.add(solutions, self.mul(self.power(basis, 2 ** i), weight))
+            self._quadratic_solver = self.coef_table[solutions]
+        return self._quadratic_solver
+
+
+    def _tonelli_shanks(self, values):
+        """ Square roots of non-zero squares in a prime field, by Tonelli-Shanks. 
+
+            Every element takes its own path through the algorithm, so the
+            loops run over all of them at once with masks.
+        """
+        arithmetic = _Arithmetic(self)
+        q, s = self.p - 1, 0
+        while q % 2 == 0:
+            q, s = q // 2, s + 1
+        z = 2
+        while pow(z, (self.p - 1) // 2, self.p) != self.p - 1:
+            z += 1
+
+        m = np.full(len(values), s, dtype = object)
+        c = arithmetic.power(np.full(len(values), z, dtype = arithmetic.dtype), q)
+        t = arithmetic.power(values, q)
+        root = arithmetic.power(values, (q + 1) // 2)
+        while np.any(t != 1):
+            pending = t != 1
+            # The least i with t^(2^i) = 1
+            i, found, square = np.zeros(len(values), dtype = object), ~pending, t
+            for k in range(1, s):
+                square = arithmetic.mul(square, square)
+                new = ~found & (square == 1)
+                i[new], found = k, found | new
+            b = arithmetic.power(c, np.where(pending, 2 ** np.maximum(m - i - 1, 0), 0))
+            root = np.where(pending, arithmetic.mul(root, b), root)
+            c = np.where(pending, arithmetic.mul(b, b), c)
+            t = np.where(pending, arithmetic.mul(t, c), t)
+            m = np.where(pending, i, m)
+        return root.astype(np.int64)
+
+
+    def add(self, a, b):
+        """ Add arrays of field elements.
+
+            This, and the other bulk arithmetic functions below, work on 
+            NumPy arrays of element indices (i.e. the idx of gf[idx]) rather 
+            than on FieldElements, and follow NumPy broadcasting rules. Lists
+            of FieldElements are accepted as well.
+
+            For power of prime fields, addition uses a table of Zech 
+            logarithms: :math:`\\sigma^a + \\sigma^b = \\sigma^a (1 + \\sigma^{b - a})`,
+            and the index of :math:`1 + \\sigma^k` is looked up for each k.
+
+            Args:
+                a, b (np.ndarray): Indices of the elements to add.
+
+            Returns:
+                An array with the indices of the sums.
+        """
+        a, b = _as_indices(a), _as_indices(b)
+        if self.n == 1 and self.p >= 2 ** 62:
+            return self._tally("bulk.add", _large_prime_result((a.astype(object) + b) % self.p))
+        if self.n == 1:
+            return self._tally("bulk.add", (a + b) % self.p)
+
+        zech = self._zech_logs()
+        if zech is None:
+            # No room for the table: add the coefficients instead
+            self._count("fallback.coef_add")
+            return self._tally("bulk.add", self._indices_from_coefs((self.coef_table[a] + self.coef_table[b]) % self.p))
+        self._count("lookup.zech")
+        zech = zech[(b - a) % (self.dim - 1)]
+        sums = np.where(zech == 0, 0, self._index_products(a, zech))
+        return self._tally("bulk.add", np.where(a == 0, b, np.where(b == 0, a, sums)))
+
+
+    def neg(self, a):
+        """ Negate an array of field elements.
+
+            Args:
+                a (np.ndarray): Indices of the elements to negate.
+
+            Returns:
+                An array with the indices of the additive inverses.
+        """
+        a = _as_indices(a)
+        if self.n == 1:
+            return self._tally("bulk.neg", (-a) % self.p)
+        if self.p == 2:
+            return self._tally("bulk.neg", a.copy())
+        # -1 is the primitive element to the power (p^n - 1) / 2
+        return self._tally("bulk.neg", np.where(a == 0, 0, self._index_products(a, (self.dim - 1) // 2)))
+
+
+    def sub(self, a, b):
+        """ Subtract arrays of field elements, a - b. """
+        return self._tally("bulk.sub", self.add(a, self.neg(b)))
+
+
+    def mul(self, a, b):
+        """ Multiply arrays of field elements.
+
+            In prime fields with :math:`p \\geq 2^{31}`, products of two 
+            elements don't fit in 64 bits, so they are computed with Python
+            integers.
+
+            Args:
+                a, b (np.ndarray): Indices of the elements to multiply.
+
+            Returns:
+                An array with the indices of the products.
+        """
+        a, b = _as_indices(a), _as_indices(b)
+        if self.n == 1 and self.p >= 2 ** 31:
+            return self._tally("bulk.mul", _large_prime_result(_Arithmetic(self).mul(a, b)))
+        if self.n == 1:
+            return self._tally("bulk.mul", (a * b) % self.p)
+        return self._tally("bulk.mul", np.where((a == 0) | (b == 0), 0, self._index_products(a, b)))
+
+
+    def invert(self, a):
+        """ Compute the multiplicative inverses of an array of field elements.
+
+            Lazy prime fields have no logarithm tables, and use Fermat's 
+            little theorem instead, :math:`a^{-1} = a^{p-2}`.
+
+            Args:
+                a (np.ndarray): Indices of the elements to invert.
+
+            Returns:
+                An array with the indices of the inverses. Raises a 
+                ZeroDivisionError if any element is 0.
+        """
+        a = _as_indices(a)
+        if np.any(a == 0):
+            raise ZeroDivisionError("Error, 0 has no multiplicative inverse.")
+        if self._without_log_tables():
+            return self._tally("bulk.inv", _large_prime_result(_Arithmetic(self).power(a, self.p - 2)))
+        if self.n == 1:
+            self._count("lookup.log")
+            log, exp = self._prime_log_tables()
+            return self._tally("bulk.inv", exp[(-log[a]) % (self.p - 1)])
+        return self._tally("bulk.inv", ((self.dim - a - 2) % (self.dim - 1)) + 1)
+
+
+    def div(self, a, b):
+        """ Divide arrays of field elements, a / b. 
+            
+            Raises a ZeroDivisionError if any element of b is 0.
+        """
+        return self._tally("bulk.div", self.mul(a, self.invert(b)))
+
+
+    def power(self, a, exponent):
+        """ Raise an array of field elements to an integer power.
+
+            Unlike FieldElement.__pow__, this follows the usual convention
+            that :math:`x^0 = 1` for every x, including 0. Lazy prime fields
+            use square-and-multiply rather than logarithm tables.
+
+            Args:
+                a (np.ndarray): Indices of the elements.
+                exponent (int or np.ndarray): The exponents, which may be 
+                    negative for non-zero elements.
+
+            Returns:
+                An array with the indices of the powers.
+        """
+        a, exponent = _as_indices(a), np.asarray(exponent, dtype = np.int64)
+        if np.any((a == 0) & (exponent < 0)):
+            raise ZeroDivisionError("Error, 0 has no multiplicative inverse.")
+
+        if self._without_log_tables():
+            arithmetic = _Arithmetic(self)
+            if exponent.ndim == 0:
+                powers = arithmetic.power(a, int(exponent) % (self.p - 1))
+            else:
+                a, exponent = np.broadcast_arrays(a, exponent)
+                powers = arithmetic.power(a, exponent.astype(object) % (self.p - 1))
+            powers = _large_prime_result(powers)
+        elif self.n == 1:
+            self._count("lookup.log")
+            log, exp = self._prime_log_tables()
+            powers = exp[(log[a] * (exponent % (self.p - 1))) % (self.p - 1)]
+        else:
+            powers = ((a * (exponent % (self.dim - 1)) - 1) % (self.dim - 1)) + 1
+
+        return self._tally("bulk.pow", np.where(exponent == 0, self._one, np.where(a == 0, 0, powers)))
+
+
+    def multiplication_matrix(self, elements):
+        """ Expand elements into their matrices of multiplication over GF(p).
+
+            Multiplying by an element a is a linear map on the polynomial basis
+            coefficients. Row i of its matrix holds the coefficients of
+            :math:`\\sigma^i a`, so that for coefficients as row vectors, the
+            coefficients of :math:`ba` are those of b times the matrix of a.
+
+            Args:
+                elements (int, FieldElement or np.ndarray): An element, the
+                    index of an element, or an array of indices.
+
+            Returns:
+                An integer array of shape (n, n), with any extra axes of an
+                array of indices in front.
+        """
+        indices = np.asarray(_as_indices(elements))
+        powers = np.array([self._one] + list(range(1, self.n)))
+        products = self.mul(indices[..., np.newaxis], powers)
+        return self.coef_table[products]
+
+
+    def buffer_mul(self, data, constant, out = None):
+        """ Multiply every byte of a buffer by a constant, in GF(:math:`2^8`).
+
+            Each byte holds the polynomial basis coefficients of an element,
+            with the coefficient of :math:`\\sigma^i` in bit i. The buffers
+            are read and written in place through NumPy views, without
+            converting to FieldElements or to indices: the product of the
+            constant with each of the 256 bytes is looked up in one row of a 
+            256 x 256 multiplication table, BUFFER_BLOCK_SIZE bytes at a time
+            (NumPy makes a temporary array of wide indices for each lookup).
+
+            Args:
+                data (bytes-like): Any object supporting the buffer protocol,
+                    e.g. bytes, bytearray, memoryview or mmap.
+                constant (int or FieldElement): The constant, given by its 
+                    index in the field as for the other bulk operations.
+                out (bytes-like): A writable buffer of the same length to hold
+                    the result. It may be data itself.
+
+            Returns:
+                out, or a new bytearray if out is None.
+        """
+        source = _byte_view(data)
+        if out is None:
+            out = bytearray(len(source))
+        target = _byte_view(out, len(source))
+        row = self._byte_row(constant)
+        for start in range(0, len(source), BUFFER_BLOCK_SIZE):
+            stop = min(start + BUFFER_BLOCK_SIZE, len(source))
+            np.take(row, source[start:stop], out = target[start:stop])
+        self._count("bulk.buffer_mul")
+        self._count("bulk.buffer_mul.elements", len(source))
+        return out
+
+
+    def buffer_xor(self, out, data):
+        """ Add (XOR) the bytes of data into out, in place. 
+
+            Args:
+                out (bytes-like): A writable buffer.
+                data (bytes-like): A buffer of the same length.
+
+            Returns:
+                out.
+        """
+        source = _byte_view(data)
+        target = _byte_view(out, len(source))
+        np.bitwise_xor(target, source, out = target)
+        self._count("bulk.buffer_xor")
+        self._count("bulk.buffer_xor.elements", len(source))
+        return out
+
+
+    def buffer_mul_add(self, out, data, constant):
+        """ Add constant times data into out, in place, in GF(:math:`2^8`).
+
+            This is the inner step of encoding with a matrix: out += c * data.
+            The products are formed in blocks of BUFFER_BLOCK_SIZE bytes, as
+            in buffer_mul, so that the temporaries stay in cache.
+
+            Args:
+                out (bytes-like): A writable buffer.
+                data (bytes-like): A buffer of the same length.
+                constant (int or FieldElement): The index of the constant.
+
+            Returns:
+                out.
+        """
+        source = _byte_view(data)
+        target = _byte_view(out, len(source))
+        row = self._byte_row(constant)
+        products = np.empty(min(len(source), BUFFER_BLOCK_SIZE), dtype = np.uint8)
+        for start in range(0, len(source), BUFFER_BLOCK_SIZE):
+            stop = min(start + BUFFER_BLOCK_SIZE, len(source))
+            block = products[:stop - start]
+            np.take(row, source[start:stop], out = block)
+            np.bitwise_xor(target[start:stop], block, out = target[start:stop])
+        self._count("bulk.buffer_mul_add")
+        self._count("bulk.buffer_mul_add.elements", len(source))
+        return out
+
+
+    def _byte_row(self, constant):
+        """ The products of a constant with every byte, as a 256-entry table. """
+        if self.p != 2 or self.n != 8:
+            raise ValueError("Error, byte buffer arithmetic needs the field GF(2^8).")
+        if self._byte_products is None:
+            packed = np.dot(self.coef_table, self._place_values)
+            table = np.empty((self.dim, self.dim), dtype = np.uint8)
+            table[np.ix_(packed, packed)] = packed[self.mul(np.arange(self.dim)[:, np.newaxis], 
+                                                            np.arange(self.dim))]
+            self._byte_products = table
+        self._count("lookup.bytes")
+        constant = int(_as_indices(constant))
+        return self._byte_products[np.dot(self.coef_table[constant], self._place_values)]
+
+
+    def _zech_logs(self):
+        """ Table whose entry k is the index of :math:`1 + \\sigma^k` (0 if that is 0),
+            or None if it would go over the memory ceiling.
+        """
+        if self._zech_table is None:
+            if not self._fits(8 * (self.dim - 1)):
+                return None
+            powers = np.arange(self.dim - 1)
+            shifted = self.coef_table[np.where(powers == 0, self.dim - 1, powers)].copy()
+            shifted[:, 0] = (shifted[:, 0] + 1) % self.p
+            self._zech_table = self._indices_from_coefs(shifted)
+        return self._zech_table
+
+
+    def _without_log_tables(self):
+        """ Whether this is a prime field working without logarithm tables:
+            a lazy one, or one with no room left for them under its ceiling.
+        """
+        return self.n == 1 and (self.lazy or (self._prime_log is None and not self._fits(16 * self.p)))
+
+
+    def _prime_log_tables(self):
+        """ Discrete log and exponential tables of a prime field.
+
+            Returns:
+                A pair of arrays, where the first maps each non-zero element to 
+                its discrete log with respect to the smallest primitive root,
+                and the second maps logs in [0, p - 1) back to elements.
+        """
+        if self._prime_log is None:
+            for root in range(1, self.p):
+                exp = np.ones(self.p - 1, dtype = np.int64)
+                for i in range(1, self.p - 1):
+                    exp[i] = (exp[i - 1] * root) % self.p
+                if len(np.unique(exp)) == self.p - 1:
+                    break
+            log = np.zeros(self.p, dtype = np.int64)
+            log[exp] = np.arange(self.p - 1)
+            self._prime_log, self._prime_exp = log, exp
+        return self._prime_log, self._prime_exp
+
+
+    def _index_products(self, a, b):
+        """ Indices of the products of the elements at indices a and b.
+
+            Args:
+                a, b (np.ndarray): Arrays of indices of non-zero elements, 
+                                   broadcast together. 
+
+            Returns:
+                An array containing the index of each product.
+        """
+        if self.n == 1:
+            return (a * b) % self.p
+        return ((a + b - 1) % (self.dim - 1)) + 1
+
+
+    def _indices_from_coefs(self, coefs):
+        """ Find the indices of elements from their polynomial basis coefficients.
+
+            Args:
+                coefs (np.ndarray): An integer array whose last axis of length
+                                    n holds polynomial basis coefficients.
+
+            Returns:
+                An array of the corresponding indices into self.elements.
+        """
+        if self.n == 1:
+            # The coefficient of an element of a prime field is its index
+            return np.asarray(coefs, dtype = np.int64)[..., 0]
+        if self._index_of_packed is None:
+            # Read each coefficient list as the digits of an integer in base p
+            # to get a dense lookup table of the element indices. It is only
+            # published once filled, since other threads may be looking.
+            index_of_packed = np.empty(self.dim, dtype = np.int64)
+            index_of_packed[np.dot(self.coef_table, self._place_values)] = np.arange(self.dim)
+            self._index_of_packed = index_of_packed
+        self._count("lookup.packed")
+        return self._index_of_packed[np.dot(np.asarray(coefs, dtype = np.int64), self._place_values)]
+
+
+    def _traces(self, indices):
+        """ Compute the traces of many field elements at once.
+
+            Rather than exponentiating every element, we use the fact that 
+            the Frobenius map sends :math:`\\sigma^k` to :math:`\\sigma^{kp}`,
+            so every conjugate can be read straight off of coef_table. Since
+            the trace is in GF(:math:`p`), only the first coefficient of the
+            sum of the conjugates is needed.
+
+            Args:
+                indices (np.ndarray): The indices of the elements to trace.
+
+            Returns:
+                An integer array of the same shape with the traces.
+        """
+        indices = np.asarray(indices, dtype = np.int64)
+        if self.n == 1:
+            return self._tally("bulk.tr", indices % self.p)
+
+        traces = np.zeros(indices.shape, dtype = np.int64)
+        for i in range(self.n):
+            conjugates = ((indices * pow(self.p, i, self.dim - 1) - 1) % (self.dim - 1)) + 1
+            traces += self.coef_table[np.where(indices == 0, 0, conjugates), 0]
+        return self._tally("bulk.tr", traces % self.p)
 
 
     def evaluate(self, coefs, argument):
@@ -387,9 +1703,22 @@ class GaloisField():
               
               f(\\alpha) = c_0 + c_1 \\alpha + \cdots + c_n \\alpha^n
 
+            which are evaluated using Horner's rule, 
+            :math:`c_0 + \\alpha(c_1 + \\alpha(c_2 + \\cdots))`, so only
+            multiplications and additions are needed. 
+
             This function is primarily meant for use with the Curve class in
             my Balthasar package.
 
+            Curves tend to be evaluated over and over, so the second time a
+            curve is seen its values on the whole field are computed, with
+            evaluate_all, and kept in the smallest integer type that holds
+            them; after that, evaluating it is a single lookup. Up to
+            curve_cache_bytes of tables are kept, dropping the least recently
+            used, and only as long as they fit under the memory ceiling; see
+            curve_cache_info. Lazy fields, and fields with a curve_cache_bytes
+            of 0, use Horner's rule every time.
+
             Args:
                 coefs (list): A set of coefficients for the curve, i.e.
                               :math:`[c_0, c_1, \ldots, c_n]`. These should
@@ -401,10 +1730,158 @@ class GaloisField():
                 The value of the function of the argument, taken over the
                 finite field.
         """
-        result = coefs[0] * self.elements[-1] 
-        for coef_idx in range(1, len(coefs)):
-            result += coefs[coef_idx] * pow(argument, coef_idx)
-        return result
+        table = None
+        if not self.lazy and self.curve_cache_bytes > 0:
+            table = self._curve_table(self._curve_indices(coefs), 1)
+        if table is None:
+            one = self.elements[self._one]
+            result = coefs[-1] * one
+            for coef_idx in range(len(coefs) - 2, -1, -1):
+                result = result * argument + coefs[coef_idx] * one
+            return result
+        return self.elements[int(table[_as_indices(argument)])]
+
+
+    def curve_cache_info(self):
+        """ Statistics of the cache of curve values used by evaluate.
+
+            Returns:
+                A dict with the number of "hits" and "misses" so far, the
+                number of curves currently kept ("size"), the "bytes" their
+                tables take, and the "capacity" (curve_cache_bytes).
+        """
+        with self._curve_lock:
+            return {"hits": self._curve_cache_hits, "misses": self._curve_cache_misses,
+                    "size": len(self._curve_tables), 
+                    "bytes": sum(table.nbytes for table in self._curve_tables.values()),
+                    "capacity": self.curve_cache_bytes}
+
+
+    def clear_curve_cache(self):
+        """ Drop all the curve values kept by evaluate, and reset the statistics. """
+        with self._curve_lock:
+            self._curve_tables.clear()
+            self._curves_seen.clear()
+            self._curve_cache_hits = self._curve_cache_misses = 0
+
+
+    def _curve_table(self, coef_indices, count):
+        """ The values of a curve on every element, from the cache if possible.
+
+            Curves are keyed by the tuple of indices of their coefficients,
+            without trailing zeros, so that e.g. [1, gf[3]] and [1, gf[3], 0]
+            share their table. A table costs as much as evaluating the curve
+            on the whole field, so it is only built for curves seen before,
+            or when count, the number of points to evaluate, is that large.
+
+            Returns:
+                The table, or None if the curve is better evaluated directly.
+        """
+        key = tuple(coef_indices.tolist())
+        while len(key) > 1 and key[-1] == 0:
+            key = key[:-1]
+
+        with self._curve_lock:
+            if key in self._curve_tables:
+                self._curve_cache_hits += 1
+                self._count("cache.curve.hit")
+                self._curve_tables.move_to_end(key)
+                return self._curve_tables[key]
+
+            self._curve_cache_misses += 1
+            self._count("cache.curve.miss")
+            if count < self.dim and self._curves_seen.pop(key, None) is None:
+                self._curves_seen[key] = True
+                while len(self._curves_seen) > CURVE_SEEN_SIZE:
+                    self._curves_seen.popitem(last = False)
+                return None
+
+        table = self._horner(np.array(key, dtype = np.int64), np.arange(self.dim)).astype(_coef_dtype(self.dim))
+        if table.nbytes > self.curve_cache_bytes:
+            return table
+
+        with self._curve_lock:
+            used = sum(cached.nbytes for cached in self._curve_tables.values())
+            while self._curve_tables and used + table.nbytes > self.curve_cache_bytes:
+                used -= self._curve_tables.popitem(last = False)[1].nbytes
+        # Checked outside the lock, as _fits takes it to count the tables
+        if self._fits(table.nbytes):
+            with self._curve_lock:
+                self._curve_tables[key] = table
+        return table
+
+
+    def evaluate_all(self, coefs, points = None):
+        """ Evaluate one or many curves on every element of the field at once.
+
+            Uses the same vectorized Horner's rule as evaluate, over NumPy
+            arrays of element indices.
+
+            Args:
+                coefs (list or np.ndarray): The coefficients of a curve, as
+                    in evaluate, or a list of such lists to evaluate many 
+                    curves at once. Curves of different degrees are padded
+                    with zeros. A NumPy integer array is taken to hold the
+                    indices of the coefficients (rather than integers), with
+                    the coefficients of each curve along its last axis.
+                points (np.ndarray): Indices of the elements to evaluate the 
+                    curves on. By default, all elements of the field in order.
+
+            Returns:
+                An array of the indices of the values. For a single curve this
+                has the shape of points; for many curves, there is an extra
+                leading axis running over the curves.
+        """
+        coef_indices = self._curve_indices(coefs)
+        if points is None:
+            points = np.arange(self.dim)
+        points = _as_indices(points)
+
+        # A single curve uses the cache of evaluate when it has its table
+        # already, or when there are enough points to be worth building it
+        if coef_indices.ndim == 1 and not self.lazy and self.curve_cache_bytes > 0:
+            table = self._curve_table(coef_indices, points.size)
+            if table is not None:
+                return table[points].astype(np.int64)
+        return self._horner(coef_indices, points)
+
+
+    def _horner(self, coef_indices, points):
+        """ Evaluate curves with indices coef_indices on the indices points,
+            with the vectorized Horner's rule, as in evaluate_all.
+        """
+        batch_shape = coef_indices.shape[:-1]
+        coef_indices = coef_indices.reshape(batch_shape + (1,) * points.ndim + coef_indices.shape[-1:])
+
+        result = np.broadcast_to(coef_indices[..., -1], batch_shape + points.shape)
+        for coef_idx in range(coef_indices.shape[-1] - 2, -1, -1):
+            result = self.add(self.mul(result, points), coef_indices[..., coef_idx])
+        return np.array(result)
+
+
+    def _curve_indices(self, coefs):
+        """ Turn the coefficients of one or many curves into an array of indices.
+
+            Integer coefficients c are taken to mean c times the identity; for
+            NumPy integer arrays, the entries are already element indices.
+        """
+        if isinstance(coefs, np.ndarray):
+            return coefs.astype(np.int64)
+
+        if len(coefs) > 0 and isinstance(coefs[0], (list, tuple, np.ndarray)):
+            curves = [self._curve_indices(curve) for curve in coefs]
+            degree = max([len(curve) for curve in curves])
+            return np.array([np.pad(curve, (0, degree - len(curve))) for curve in curves])
+
+        indices = []
+        for coef in coefs:
+            if isinstance(coef, FieldElement):
+                indices.append(coef.prim_power)
+            elif self.n == 1:
+                indices.append(coef % self.p)
+            else:
+                indices.append(self._indices_from_coefs([coef % self.p] + [0] * (self.n - 1)))
+        return np.array(indices, dtype = np.int64)
 
 
     def print(self):
@@ -439,6 +1916,41 @@ class GaloisField():
             element.print()
 
 
+def product_blocks(fields, block_size = ITER_BLOCK_SIZE, coefs = False):
+    """ Iterate over a Cartesian product of fields in blocks of index tuples.
+
+        For example, the phase space of a system of dimension :math:`p^n` is
+        product_blocks([gf, gf]). The :math:`p^{2n}` points are enumerated
+        in lexicographic order (the last field varying fastest), and each
+        block is only made when it is needed.
+
+        Args:
+            fields (list): The GaloisFields to take the product of.
+            block_size (int): The number of tuples in each block (the last one
+                may be shorter).
+            coefs (bool): Also yield the polynomial basis coefficients of the
+                elements of each block.
+
+        Returns:
+            A generator of arrays of shape (block size, len(fields)) holding the
+            indices of the elements of each tuple; or with coefs, of pairs
+            (indices, coefficients), where each row of coefficients holds those
+            of all the elements of a tuple one after the other.
+    """
+    if block_size < 1:
+        raise ValueError("Error, block size must be positive.")
+    dims = [field.dim for field in fields]
+    total = int(np.prod(dims, dtype = object))
+    for start in range(0, total, block_size):
+        flat = np.arange(start, min(start + block_size, total), dtype = np.int64)
+        indices = np.stack(np.unravel_index(flat, dims), axis = 1)
+        if not coefs:
+            yield indices
+        else:
+            yield indices, np.hstack([field.coef_table[indices[:, i]]
+                                      for i, field in enumerate(fields)])
+
+
 def tr(x):
     """ Wrapper trace function so the user can do tr(x) or x.trace()."""
     # Make sure x is a field element
@@ -468,3 +1980,180 @@ def inv(x):
         return x.inv()
 
 
+def _byte_view(buffer, length = None):
+    """ A uint8 NumPy view of an object supporting the buffer protocol.
+
+        If a length is given, the buffer is an output: it must be writable and
+        of that length.
+    """
+    view = np.frombuffer(buffer, dtype = np.uint8)
+    if length is not None:
+        if not view.flags.writeable:
+            raise ValueError("Error, output buffer is read-only.")
+        if len(view) != length:
+            raise ValueError("Error, buffers must have the same length.")
+    return view
+
+
+def _large_prime_result(values):
+    """ Indices computed with Python integers, back as an int64 array. """
+    return np.asarray(values, dtype = object).astype(np.int64)
+
+
+@contextmanager
+def _untimed():
+    """ Stands in for FieldProfiler.timer when profiling is off. """
+    yield
+
+
+def _eager_bytes(p, n):
+    """ Estimate the memory a field of order p^n uses for its FieldElements,
+        their string representations, and coef_table, when it makes them all
+        up front.
+    """
+    sample = FieldElement(p, n, [p - 1] * n)
+    sample.prim_power = p ** n - 1
+    # The element, its slot in the list of elements and its row of coef_table
+    per_element = _element_bytes(sample) + 8 + 8 * n
+    if n > 1:
+        # Its string in the field list
+        per_element += sys.getsizeof(sample.str_rep) + 8
+    return per_element * p ** n
+
+
+class _LazyElements():
+    """ The elements of a lazy field, made from coef_table when accessed. """
+    def __init__(self, field):
+        self.field = field
+
+
+    def __len__(self):
+        return self.field.dim
+
+
+    def __getitem__(self, idx):
+        field = self.field
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(field.dim))]
+        if idx < 0:
+            idx += field.dim
+        if idx < 0 or idx >= field.dim:
+            raise IndexError("Error, element out of bounds.")
+        if field.n == 1:
+            return FieldElement(field.p, 1, [int(idx)])
+        return FieldElement(field.p, field.n, field.coef_table[idx].tolist(), field._field_list, basis = field.basis)
+
+
+    def __iter__(self):
+        return (self[i] for i in range(self.field.dim))
+
+
+class _LazyFieldList(ElementList):
+    """ The string representations of the elements of a lazy field. 
+
+        Stands in for the list shared by the elements of other fields,
+        computing each string from coef_table, and finding the index of a
+        string through the packed coefficients rather than by searching.
+    """
+    def __init__(self, field):
+        super().__init__()
+        self.field = field
+
+
+    def __len__(self):
+        return self.field.dim
+
+
+    def __getitem__(self, idx):
+        return ",".join([str(x) for x in self.field.coef_table[idx].tolist()])
+
+
+    def __iter__(self):
+        return (self[i] for i in range(self.field.dim))
+
+
+    def index(self, str_rep):
+        coefs = [int(x) for x in str_rep.split(",")]
+        return int(self.field._indices_from_coefs(coefs))
+
+
+    # Elements are in the same field only if they share the same list
+    def __eq__(self, other):
+        return self is other
+
+
+    def __ne__(self, other):
+        return self is not other
+
+
+def _coef_dtype(p):
+    """ The smallest unsigned integer type holding the integers mod p. """
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if p - 1 <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def _lazy_bytes(p, n):
+    """ The memory a lazy field of order p^n needs for its coef_table and the
+        table of indices of packed coefficients.
+    """
+    if n == 1:
+        return 0
+    return p ** n * (n * np.dtype(_coef_dtype(p)).itemsize + 8)
+
+
+class _CompactCoefTable():
+    """ The coef_table of a lazy power of prime field, stored in the smallest
+        integer type that fits (see _coef_dtype). Indexing it gives int64 rows,
+        like an ordinary coef_table, so arithmetic on them can't overflow.
+    """
+    ndim = 2
+    dtype = np.dtype(np.int64)
+
+    def __init__(self, table):
+        self.table = table
+        self.shape = table.shape
+        self.nbytes = table.nbytes
+
+
+    def __len__(self):
+        return self.shape[0]
+
+
+    def __getitem__(self, idx):
+        return self.table[idx].astype(np.int64)
+
+
+    def __array__(self, dtype = None, copy = None):
+        return self.table.astype(dtype or self.dtype)
+
+
+class _PrimeCoefTable():
+    """ The coef_table of a lazy prime field. Row i is [i], so rows are made
+        when indexed instead of stored.
+    """
+    ndim = 2
+    nbytes = 0
+    dtype = np.dtype(np.int64)
+
+    def __init__(self, p):
+        self.shape = (p, 1)
+
+
+    def __len__(self):
+        return self.shape[0]
+
+
+    def __getitem__(self, idx):
+        if isinstance(idx, tuple):
+            return self[idx[0]][(Ellipsis,) + idx[1:]]
+        if isinstance(idx, slice):
+            rows = np.arange(*idx.indices(self.shape[0]), dtype = np.int64)
+        else:
+            rows = np.asarray(idx, dtype = np.int64) % self.shape[0]
+        return rows[..., np.newaxis]
+
+
+    def __array__(self, dtype = None, copy = None):
+        return self[:].astype(dtype or self.dtype)
@@ -0,0 +1,82 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# memory.py: Accounting of the memory used by fields and arrays of elements.
+#
+# © 2016 Olivia Di Matteo (odimatte@uwaterloo.ca)
+#
+# This file is part of the project PyniteFields.
+#
+# Licensed under BSD-3-Clause
+#
+
+import sys
+
+import numpy as np
+
+from pynitefields.fieldelement import FieldElement
+
+# CPython keeps a single copy of each of these integers, so they cost
+# nothing extra however many elements hold them.
+_SMALL_INTS = range(-5, 257)
+
+def memory_usage(obj):
+    """ The memory used by a field, or by an array of field elements.
+
+        Arrays can be NumPy arrays of element indices, FieldMatrix and
+        Polynomial objects, single FieldElements, or (nested) lists and tuples
+        of FieldElements or indices. Only what the array holds itself is counted: the
+        data shared by all the elements of a field belongs to the field, and
+        an element appearing several times is counted once.
+
+        Args:
+            obj: A GaloisField, or an array of field elements.
+
+        Returns:
+            A dict of the number of bytes used by each component, and their
+            "total". For a field, this is GaloisField.memory_usage(). For an
+            array the components are "indices" (index arrays), "elements"
+            (FieldElement objects) and "containers" (the lists and objects
+            holding them).
+    """
+    if hasattr(obj, "memory_usage"):
+        return obj.memory_usage()
+
+    usage = {"indices": 0, "elements": 0, "containers": 0}
+    seen = set()
+
+    def visit(x):
+        if id(x) in seen:
+            return
+        seen.add(id(x))
+        if isinstance(x, np.ndarray):
+            usage["indices"] += x.nbytes
+        elif isinstance(x, (int, np.integer)):
+            usage["indices"] += sys.getsizeof(x)
+        elif isinstance(x, FieldElement):
+            usage["elements"] += _element_bytes(x)
+        elif isinstance(x, (list, tuple)):
+            usage["containers"] += sys.getsizeof(x)
+            for item in x:
+                visit(item)
+        elif hasattr(x, "entries") or hasattr(x, "coefs"):
+            # FieldMatrix and Polynomial: an object around an index array
+            usage["containers"] += sys.getsizeof(x) + sys.getsizeof(vars(x))
+            visit(x.entries if hasattr(x, "entries") else x.coefs)
+        else:
+            raise ValueError("Error, cannot measure the memory of " + type(x).__name__ + ".")
+
+    visit(obj)
+    usage["total"] = sum(usage.values())
+    return usage
+
+
+def _element_bytes(element):
+    """ The bytes held by one FieldElement, leaving out the shared field list. """
+    size = sys.getsizeof(element) + sys.getsizeof(vars(element))
+    size += sys.getsizeof(element.exp_coefs) + sys.getsizeof(element.str_rep)
+    for x in element.exp_coefs + [element.dim, element.prim_power]:
+        if x not in _SMALL_INTS:
+            size += sys.getsizeof(x)
+    return size
+
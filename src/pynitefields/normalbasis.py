@@ -0,0 +1,168 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# normalbasis.py: Views of a finite field expanded in a normal basis.
+#
+# © 2016 Olivia Di Matteo (odimatte@uwaterloo.ca)
+#
+# This file is part of the project PyniteFields.
+# Licensed under BSD-3-Clause
+#
+
+import numpy as np
+
+from pynitefields.fieldbasis import FieldBasis, _as_indices, _inverse_mod_p
+
+class NormalBasis(FieldBasis):
+    """ A view of a GaloisField expanded in a normal basis.
+
+        A normal basis is made up of the conjugates of a single element
+        :math:`\\alpha`,
+
+        .. math::
+
+            \\{ \\alpha, \\alpha^p, \\alpha^{p^2}, \\ldots, \\alpha^{p^{n-1}} \\}.
+
+        In such a basis the Frobenius map :math:`x \\rightarrow x^p` simply
+        rotates the expansion coefficients by one position, and the trace of an
+        element is the sum of its coefficients times :math:`\\text{tr}(\\alpha)`
+        (which is 1 in characteristic 2). This makes conjugates, traces
+        and norms of large batches of elements cheap to compute. Normal bases
+        are usually obtained through GaloisField.normal_basis.
+
+        Args:
+            field (GaloisField): The field to take a view of.
+            element_index (int): The index of the normal element
+                :math:`\\alpha`. If None, the normal element with the smallest
+                index is used.
+
+        Attributes:
+            normal_element (int): The index of the normal element.
+
+        All the attributes of FieldBasis are available as well.
+    """
+
+    def __init__(self, field, element_index = None):
+        if element_index is None:
+            element_index = find_normal_element(field)
+            if element_index is None:
+                raise ValueError("No normal element found; is the polynomial primitive?")
+
+        conjugates = _conjugate_indices(field, np.array(element_index))
+        if not _is_independent(field, conjugates):
+            raise ValueError("Element " + str(element_index) + " is not a normal element.")
+
+        self.normal_element = int(element_index)
+        FieldBasis.__init__(self, field, conjugates.tolist())
+
+        # Every basis element has the same trace, which can't be 0
+        self._element_trace = int(field._traces(self.normal_element))
+
+
+    def frobenius_coords(self, coords, power = 1):
+        """ Apply the Frobenius map to coefficients in this basis.
+
+            Args:
+                coords (np.ndarray): Coefficients in this basis, with a last
+                    axis of length n.
+                power (int): How many times to apply the map, i.e. compute
+                    the coefficients of :math:`x^{p^{power}}`.
+
+            Returns:
+                The rotated coefficients.
+        """
+        return np.roll(np.asarray(coords), power, axis = -1)
+
+
+    def frobenius(self, indices, power = 1):
+        """ Apply the Frobenius map :math:`x \\rightarrow x^{p^{power}}` in bulk.
+
+            Args:
+                indices (np.ndarray): Indices of the field elements (or a list
+                    of FieldElements).
+                power (int): How many times to apply the Frobenius map.
+
+            Returns:
+                An array with the indices of the images.
+        """
+        return self.from_coords(self.frobenius_coords(self.coord_table[_as_indices(indices)], power))
+
+
+    def conjugates(self, indices):
+        """ Compute the full set of conjugates of many elements.
+
+            Args:
+                indices (np.ndarray): Indices of the field elements (or a list
+                    of FieldElements).
+
+            Returns:
+                An array with a trailing axis of length n, whose entry i is the
+                index of :math:`x^{p^i}`.
+        """
+        coords = self.coord_table[_as_indices(indices)]
+        return np.stack([self.from_coords(self.frobenius_coords(coords, i))
+                         for i in range(self.n)], axis = -1)
+
+
+    def trace(self, indices):
+        """ Compute the traces of many elements from the sums of their coefficients.
+
+            Args:
+                indices (np.ndarray): Indices of the field elements (or a list
+                    of FieldElements).
+
+            Returns:
+                An integer array with the trace of each element.
+        """
+        coef_sums = np.sum(self.coord_table[_as_indices(indices)], axis = -1)
+        return (self._element_trace * coef_sums) % self.p
+
+
+    def norm(self, indices):
+        """ Compute the norms of many elements as the products of their conjugates.
+
+            The norm :math:`N(x) = x \\cdot x^p \\cdots x^{p^{n-1}}` is always
+            in the base field GF(:math:`p`).
+
+            Args:
+                indices (np.ndarray): Indices of the field elements (or a list
+                    of FieldElements).
+
+            Returns:
+                An integer array with the norm of each element.
+        """
+        conjugates = self.conjugates(indices)
+        is_zero = conjugates[..., 0] == 0
+        product = np.where(is_zero, 1, conjugates[..., 0])
+        for i in range(1, self.n):
+            product = self.field._index_products(product, np.where(is_zero, 1, conjugates[..., i]))
+        return np.where(is_zero, 0, self.field.coef_table[product, 0])
+
+
+def find_normal_element(field):
+    """ Find a normal element of a finite field.
+
+        Args:
+            field (GaloisField): The field to search.
+
+        Returns:
+            The smallest index of an element whose conjugates are linearly
+            independent over GF(:math:`p`), or None if there isn't one.
+    """
+    for idx in range(1, field.dim):
+        if _is_independent(field, _conjugate_indices(field, np.array(idx))):
+            return idx
+    return None
+
+
+def _conjugate_indices(field, indices):
+    """ Indices of :math:`x, x^p, \\ldots, x^{p^{n-1}}` for non-zero x. """
+    if field.n == 1:
+        return indices[..., np.newaxis]
+    powers = np.array([pow(field.p, i, field.dim - 1) for i in range(field.n)])
+    return ((indices[..., np.newaxis] * powers - 1) % (field.dim - 1)) + 1
+
+
+def _is_independent(field, indices):
+    """ Check whether n elements are linearly independent over GF(:math:`p`). """
+    return _inverse_mod_p(field.coef_table[indices], field.p) is not None
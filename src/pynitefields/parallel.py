@@ -0,0 +1,161 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# parallel.py: Bulk field arithmetic split into chunks over a thread pool.
+#
+# © 2016 Olivia Di Matteo (odimatte@uwaterloo.ca)
+#
+# This file is part of the project PyniteFields.
+#
+# Licensed under BSD-3-Clause
+#
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from pynitefields.fieldbasis import _as_indices
+
+# The number of elements in each chunk handed to a worker thread. Chunks
+# should be large enough that the time spent in NumPy (which releases the
+# GIL) dominates the Python overhead of each call, and small enough that
+# the temporaries of a few chunks fit in cache.
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+_default_executor = None
+_default_lock = threading.Lock()
+
+def default_executor():
+    """ The thread pool used when none is given, with one thread per core.
+
+        It is created the first time it is needed and shared from then on.
+    """
+    global _default_executor
+    with _default_lock:
+        if _default_executor is None:
+            _default_executor = ThreadPoolExecutor(max_workers = os.cpu_count() or 1)
+    return _default_executor
+
+
+def parallel_mul(field, a, b, chunk_size = DEFAULT_CHUNK_SIZE, executor = None):
+    """ Multiply arrays of field elements using a pool of threads.
+
+        The (broadcast) arrays are flattened and cut into consecutive chunks of
+        chunk_size elements, which are multiplied with GaloisField.mul in
+        separate threads and written to their place in the output. The result
+        is always the same as that of GaloisField.mul, whatever the number of
+        threads or the order in which chunks finish.
+
+        Args:
+            field (GaloisField): The field to work in.
+            a, b (np.ndarray): Indices of the elements to multiply.
+            chunk_size (int): The number of elements per chunk.
+            executor (concurrent.futures.Executor): The pool to run the chunks
+                on. By default, the shared pool of default_executor().
+
+        Returns:
+            An array with the indices of the products.
+    """
+    return _map_chunks(field.mul, [a, b], chunk_size, executor)
+
+
+def parallel_mul_add(field, accumulator, a, b, chunk_size = DEFAULT_CHUNK_SIZE, executor = None):
+    """ Compute accumulator + a * b elementwise using a pool of threads.
+
+        Chunks are formed as in parallel_mul.
+
+        Args:
+            field (GaloisField): The field to work in.
+            accumulator, a, b (np.ndarray): Indices of the elements.
+            chunk_size (int): The number of elements per chunk.
+            executor (concurrent.futures.Executor): The pool to run the chunks
+                on. By default, the shared pool of default_executor().
+
+        Returns:
+            An array with the indices of the results.
+    """
+    _prepare(field)
+    return _map_chunks(lambda c, x, y: field.add(c, field.mul(x, y)),
+                       [accumulator, a, b], chunk_size, executor)
+
+
+def parallel_matvec(field, matrix, vector, chunk_size = DEFAULT_CHUNK_SIZE, executor = None):
+    """ Multiply a matrix by a vector using a pool of threads.
+
+        The rows of the matrix are split into blocks of about chunk_size
+        entries. In each block, the entries are multiplied by the vector
+        elementwise and the polynomial basis coefficients of the products are
+        summed along the rows.
+
+        Args:
+            field (GaloisField): The field to work in.
+            matrix (np.ndarray or FieldMatrix): The matrix, as a 2-dimensional
+                array of indices.
+            vector (np.ndarray): The indices of the entries of the vector.
+            chunk_size (int): The approximate number of matrix entries per chunk.
+            executor (concurrent.futures.Executor): The pool to run the chunks
+                on. By default, the shared pool of default_executor().
+
+        Returns:
+            An array with the indices of the entries of the product.
+    """
+    matrix = np.asarray(getattr(matrix, "entries", matrix), dtype = np.int64)
+    vector = np.asarray(_as_indices(vector), dtype = np.int64)
+    if matrix.ndim != 2 or vector.shape != (matrix.shape[1],):
+        raise ValueError("Error, cannot multiply a matrix of shape " + str(matrix.shape) +
+                         " by a vector of shape " + str(vector.shape) + ".")
+
+    _prepare(field)
+    rows = max(1, _check_chunk_size(chunk_size) // max(1, matrix.shape[1]))
+    result = np.empty(matrix.shape[0], dtype = np.int64)
+
+    def work(start):
+        terms = field.coef_table[field.mul(matrix[start:start + rows], vector)]
+        result[start:start + rows] = field._indices_from_coefs(np.sum(terms, axis = 1) % field.p)
+
+    _run(work, range(0, matrix.shape[0], rows), executor)
+    return result
+
+
+def _map_chunks(function, arrays, chunk_size, executor):
+    """ Apply an elementwise function to broadcast arrays, chunk by chunk. """
+    chunk_size = _check_chunk_size(chunk_size)
+    arrays = np.broadcast_arrays(*[np.asarray(_as_indices(x), dtype = np.int64) for x in arrays])
+    shape = arrays[0].shape
+    flat = [np.ravel(x) for x in arrays]
+    result = np.empty(flat[0].size, dtype = np.int64)
+
+    def work(start):
+        stop = start + chunk_size
+        result[start:stop] = function(*[x[start:stop] for x in flat])
+
+    _run(work, range(0, result.size, chunk_size), executor)
+    return result.reshape(shape)
+
+
+def _run(work, starts, executor):
+    """ Call work on every start, on the executor if there's more than one. """
+    if len(starts) <= 1:
+        for start in starts:
+            work(start)
+        return
+    if executor is None:
+        executor = default_executor()
+    # Consuming the results re-raises any exception from a worker
+    for _ in executor.map(work, starts):
+        pass
+
+
+def _check_chunk_size(chunk_size):
+    if int(chunk_size) < 1:
+        raise ValueError("Error, chunk size must be positive.")
+    return int(chunk_size)
+
+
+def _prepare(field):
+    """ Build the lazily computed tables of a field before threads share it. """
+    if field.n > 1:
+        field._zech_logs()
+    field._indices_from_coefs(field.coef_table[:1])
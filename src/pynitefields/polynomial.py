@@ -0,0 +1,607 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# polynomial.py: Polynomials with coefficients in a finite field.
+#
+# © 2016 Olivia Di Matteo (odimatte@uwaterloo.ca)
+#
+# This file is part of the project PyniteFields.
+#
+# Licensed under BSD-3-Clause
+#
+
+import numpy as np
+
+from pynitefields.fieldelement import FieldElement
+
+# Below these lengths, multiplication, division and GCDs are done directly
+# rather than with the asymptotically fast algorithms.
+KARATSUBA_THRESHOLD = 64
+NEWTON_THRESHOLD = 64
+HGCD_THRESHOLD = 128
+
+class Polynomial():
+    """ A polynomial with coefficients in a finite field.
+
+        Coefficients are stored as a NumPy array of element indices (the idx
+        of gf[idx]), lowest degree first, and all the arithmetic is done on
+        whole arrays of coefficients at once using the bulk arithmetic of the
+        GaloisField. Long polynomials are multiplied with a fast Fourier
+        transform through Kronecker substitution (falling back on Karatsuba's
+        algorithm when the characteristic is too large for that to be exact),
+        long divisions use Newton's iteration, and GCDs use the half-GCD 
+        algorithm, so polynomials with degrees in the thousands are fine to 
+        work with.
+
+        Args:
+            field (GaloisField): The field the coefficients are in.
+            coefs (list or np.ndarray): The coefficients
+                :math:`[c_0, c_1, \\ldots, c_n]`, in the same format as for
+                GaloisField.evaluate: a mix of integers and FieldElements. A
+                NumPy integer array is taken to hold element indices.
+
+        Attributes:
+            field (GaloisField): The field the coefficients are in.
+            coefs (np.ndarray): The indices of the coefficients, lowest degree
+                first, without trailing zeros. The zero polynomial has no
+                coefficients at all.
+    """
+
+    def __init__(self, field, coefs):
+        self.field = field
+        self.coefs = _trim(field._curve_indices(list(coefs) if isinstance(coefs, tuple) else coefs))
+        if self.coefs.ndim != 1:
+            raise ValueError("Polynomial coefficients must be one-dimensional.")
+
+
+    def degree(self):
+        """ The degree of the polynomial; -1 for the zero polynomial. """
+        return len(self.coefs) - 1
+
+
+    def is_zero(self):
+        """ Whether this is the zero polynomial. """
+        return len(self.coefs) == 0
+
+
+    def leading(self):
+        """ The index of the leading coefficient (0 for the zero polynomial). """
+        return int(self.coefs[-1]) if len(self.coefs) > 0 else 0
+
+
+    def monic(self):
+        """ Divide through by the leading coefficient.
+
+            Returns:
+                The monic multiple of this polynomial. The zero polynomial is
+                returned unchanged.
+        """
+        if self.is_zero():
+            return self
+        return self._new(self.field.div(self.coefs, self.coefs[-1]))
+
+
+    def derivative(self):
+        """ The formal derivative of the polynomial. """
+        if self.degree() < 1:
+            return self._new([])
+        degrees = np.arange(1, len(self.coefs))
+        return self._new(self.field.mul(self.coefs[1:], self._integers(degrees)))
+
+
+    def __call__(self, points):
+        """ Evaluate the polynomial with Horner's rule.
+
+            Args:
+                points (int, FieldElement or np.ndarray): The index of an
+                    element, a FieldElement, or an array of indices.
+
+            Returns:
+                A FieldElement if a FieldElement was passed, otherwise the
+                index or array of indices of the values.
+        """
+        if isinstance(points, FieldElement):
+            return self.field[int(self(points.prim_power))]
+        coefs = self.coefs if len(self.coefs) > 0 else np.zeros(1, dtype = np.int64)
+        values = self.field.evaluate_all(coefs, np.asarray(points))
+        return int(values) if np.ndim(values) == 0 else values
+
+
+    def __add__(self, other):
+        """ Addition. """
+        a, b = _pad(self.coefs, other.coefs)
+        return self._new(self.field.add(a, b))
+
+
+    def __sub__(self, other):
+        """ Subtraction. """
+        a, b = _pad(self.coefs, other.coefs)
+        return self._new(self.field.sub(a, b))
+
+
+    def __neg__(self):
+        """ Negation. """
+        return self._new(self.field.neg(self.coefs))
+
+
+    def __mul__(self, other):
+        """ Multiplication by another Polynomial, a FieldElement or an integer.
+
+            Long polynomials are multiplied with an FFT or Karatsuba's algorithm.
+        """
+        if isinstance(other, Polynomial):
+            return self._new(_mul(self.field, self.coefs, other.coefs))
+        elif isinstance(other, FieldElement):
+            return self._new(self.field.mul(self.coefs, other.prim_power))
+        elif isinstance(other, int):
+            return self._new(self.field.mul(self.coefs, self._integers(other)))
+        else:
+            raise TypeError("Unsupported operator")
+
+
+    def __rmul__(self, other):
+        """ Multiplication from the left. """
+        return self * other
+
+
+    def __divmod__(self, other):
+        """ Division with remainder.
+
+            Returns:
+                A pair (quotient, remainder) of Polynomials, where the degree
+                of the remainder is less than that of other.
+        """
+        quotient, remainder = _divmod(self.field, self.coefs, other.coefs)
+        return self._new(quotient), self._new(remainder)
+
+
+    def __floordiv__(self, other):
+        """ Quotient of polynomial division. """
+        return divmod(self, other)[0]
+
+
+    def __mod__(self, other):
+        """ Remainder of polynomial division. """
+        return divmod(self, other)[1]
+
+
+    def __pow__(self, exponent):
+        """ Raise to a non-negative integer power by repeated squaring. """
+        result = self._new([self.field._one])
+        base = self
+        while exponent > 0:
+            if exponent & 1:
+                result = result * base
+            base = base * base
+            exponent >>= 1
+        return result
+
+
+    def __eq__(self, other):
+        """ Two polynomials are equal if they're over the same field and
+            have the same coefficients.
+        """
+        if not isinstance(other, Polynomial):
+            return False
+        if (self.field.p != other.field.p) or (self.field.n != other.field.n):
+            return False
+        return np.array_equal(self.coefs, other.coefs)
+
+
+    def __repr__(self):
+        """ Print the polynomial as its list of coefficients. """
+        return "Polynomial(" + str([self.field[int(c)] for c in self.coefs]) + ")"
+
+
+    def pow_mod(self, exponent, modulus):
+        """ Compute :math:`f^e \\mod m` by repeated squaring.
+
+            Args:
+                exponent (int): A non-negative integer exponent.
+                modulus (Polynomial): The polynomial to reduce by.
+
+            Returns:
+                The remainder of this polynomial to the power exponent,
+                divided by modulus.
+        """
+        field = self.field
+        reduce = _reducer(field, modulus.coefs)
+        result = reduce(np.array([field._one]))
+        base = reduce(self.coefs)
+        while exponent > 0:
+            if exponent & 1:
+                result = reduce(_mul(field, result, base))
+            base = reduce(_mul(field, base, base))
+            exponent >>= 1
+        return self._new(result)
+
+
+    def compose_mod(self, inner, modulus):
+        """ Compute the modular composition :math:`f(g) \\mod m`.
+
+            Uses the baby-step giant-step method of Brent and Kung: the powers
+            :math:`g^0, \\ldots, g^{k-1} \\mod m` are computed once for
+            :math:`k \\approx \\sqrt{\\deg f}`, blocks of :math:`k`
+            coefficients of :math:`f` are combined with them all at once, and
+            the blocks are put together with Horner's rule in :math:`g^k`.
+
+            Args:
+                inner (Polynomial): The polynomial g to substitute.
+                modulus (Polynomial): The polynomial m to reduce by.
+
+            Returns:
+                The remainder of f(g) divided by m.
+        """
+        field = self.field
+        if self.is_zero() or modulus.degree() < 1:
+            return self._new([])
+
+        width = modulus.degree()
+        step = int(np.ceil(np.sqrt(len(self.coefs))))
+
+        # Baby steps: g^i mod m for i = 0, ..., k
+        reduce = _reducer(field, modulus.coefs)
+        powers = [reduce(np.array([field._one]))]
+        inner = reduce(inner.coefs)
+        for i in range(1, step + 1):
+            powers.append(reduce(_mul(field, powers[-1], inner)))
+        giant = powers.pop()
+        powers = np.array([_pad_to(g, width) for g in powers])
+
+        # Combine each block of coefficients of f with the baby steps, 
+        # accumulating in additive form
+        num_blocks = -(-len(self.coefs) // step)
+        blocks = _pad_to(self.coefs, num_blocks * step).reshape(num_blocks, step)
+        block_sums = np.zeros((num_blocks, width, field.n), dtype = np.int64)
+        for i in range(step):
+            block_sums += field.coef_table[field.mul(blocks[:, i, np.newaxis], powers[np.newaxis, i, :])]
+        block_values = field._indices_from_coefs(block_sums % field.p)
+
+        # Giant steps
+        result = _trim(block_values[-1])
+        for block in range(num_blocks - 2, -1, -1):
+            result = reduce(_poly_add(field, _mul(field, result, giant), block_values[block]))
+        return self._new(result)
+
+
+    def gcd(self, other):
+        """ The monic greatest common divisor of two polynomials.
+
+            Uses the half-GCD algorithm, which takes a number of
+            multiplications proportional to :math:`\\log` of the degree rather
+            than one division per step of Euclid's algorithm.
+
+            Args:
+                other (Polynomial): Another polynomial over the same field.
+
+            Returns:
+                The monic GCD, or the zero polynomial if both are zero.
+        """
+        return self._new(_gcd(self.field, self.coefs, other.coefs)).monic()
+
+
+    def _new(self, coefs):
+        """ A polynomial over the same field from an array of indices. """
+        return Polynomial(self.field, np.asarray(coefs, dtype = np.int64))
+
+
+    def _integers(self, values):
+        """ Indices of the multiples of the identity given by integer values. """
+        values = np.asarray(values, dtype = np.int64) % self.field.p
+        if self.field.n == 1:
+            return values
+        coefs = np.zeros(values.shape + (self.field.n,), dtype = np.int64)
+        coefs[..., 0] = values
+        return self.field._indices_from_coefs(coefs)
+
+
+def _trim(coefs):
+    """ Remove trailing zero coefficients. """
+    nonzero = np.nonzero(coefs)[0]
+    return coefs[:nonzero[-1] + 1] if len(nonzero) > 0 else coefs[:0]
+
+
+def _pad_to(coefs, length):
+    """ Pad an array of coefficients with zeros up to some length. """
+    return np.concatenate([coefs, np.zeros(length - len(coefs), dtype = np.int64)])
+
+
+def _pad(a, b):
+    """ Pad two arrays of coefficients with zeros to the same length. """
+    length = max(len(a), len(b))
+    return _pad_to(a, length), _pad_to(b, length)
+
+
+def _mul(field, a, b):
+    """ Multiply two polynomials given as arrays of coefficient indices. """
+    if len(a) == 0 or len(b) == 0:
+        return np.zeros(0, dtype = np.int64)
+
+    short = min(len(a), len(b))
+    if short > KARATSUBA_THRESHOLD:
+        product = _kronecker(field, a, b)
+        if product is not None:
+            return product
+        field._count("fallback.karatsuba")
+
+    if field.n == 1 and (field.p - 1) ** 2 * short < 2 ** 62:
+        # Prime fields: coefficients are integers, so convolve and reduce
+        return np.convolve(a, b) % field.p
+
+    if short <= KARATSUBA_THRESHOLD:
+        product = _schoolbook(field, a, b)
+    else:
+        product = _karatsuba(field, field.coef_table[a], field.coef_table[b])
+    return field._indices_from_coefs(product)
+
+
+def _kronecker(field, a, b):
+    """ Multiply polynomials by Kronecker substitution and a fast Fourier transform.
+
+        Each coefficient is written out as its n polynomial basis coefficients,
+        spaced out to 2n - 1 places so that the products of two coefficients
+        don't overlap. The two long integer sequences are convolved with a
+        floating point FFT, which is exact as long as the products are small 
+        enough, and every block of 2n - 1 results is reduced back to an element
+        with a matrix holding the powers of the primitive element.
+
+        Returns:
+            The indices of the coefficients of the product, or None if the 
+            product is too large to be computed exactly this way.
+    """
+    p, n = field.p, field.n
+    width = 2 * n - 1
+    largest = (p - 1) ** 2 * n * min(len(a), len(b))
+    if largest >= 2 ** 40:
+        return None
+
+    def spread(x):
+        spaced = np.zeros((len(x), width))
+        spaced[:, :n] = field.coef_table[x]
+        return spaced.ravel()
+
+    length = (len(a) + len(b) - 1) * width
+    size = 1 << (length - 1).bit_length()
+    product = np.fft.irfft(np.fft.rfft(spread(a), size) * np.fft.rfft(spread(b), size), size)
+    rounded = np.rint(product[:length])
+    if np.max(np.abs(product[:length] - rounded), initial = 0) > 0.25:
+        return None
+
+    blocks = rounded.astype(np.int64).reshape(len(a) + len(b) - 1, width) % p
+    if n == 1:
+        return blocks[:, 0]
+    powers = field.coef_table[[field._one] + list(range(1, width))]
+    return field._indices_from_coefs(np.dot(blocks, powers) % p)
+
+
+def _karatsuba(field, a, b):
+    """ Karatsuba multiplication of polynomials in additive form.
+
+        Args:
+            a, b (np.ndarray): Arrays of shape (length, n) holding the
+                polynomial basis coefficients of each polynomial coefficient,
+                reduced modulo p.
+
+        Returns:
+            The (len(a) + len(b) - 1, n) array for the product.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if len(b) <= KARATSUBA_THRESHOLD:
+        return _schoolbook(field, field._indices_from_coefs(a), field._indices_from_coefs(b))
+
+    half = (len(a) + 1) // 2
+    result = np.zeros((len(a) + len(b) - 1, field.n), dtype = np.int64)
+
+    # Very unbalanced operands: split only the longer one
+    if len(b) <= half:
+        result[:half + len(b) - 1] += _karatsuba(field, a[:half], b)
+        result[half:] += _karatsuba(field, a[half:], b)
+        return result % field.p
+
+    a0, a1, b0, b1 = a[:half], a[half:], b[:half], b[half:]
+    low = _karatsuba(field, a0, b0)
+    high = _karatsuba(field, a1, b1)
+
+    a_sum = a0.copy()
+    a_sum[:len(a1)] += a1
+    b_sum = b0.copy()
+    b_sum[:len(b1)] += b1
+    middle = _karatsuba(field, a_sum % field.p, b_sum % field.p)
+    middle[:len(low)] -= low
+    middle[:len(high)] -= high
+
+    result[:len(low)] += low
+    result[half:half + len(middle)] += middle
+    result[2 * half:2 * half + len(high)] += high
+    return result % field.p
+
+
+def _schoolbook(field, a, b):
+    """ Schoolbook multiplication of polynomials.
+
+        Args:
+            a, b (np.ndarray): The indices of the coefficients of each polynomial.
+
+        Returns:
+            The product in additive form, as for _karatsuba.
+    """
+    terms = field.coef_table[field.mul(a[np.newaxis, :], b[:, np.newaxis])]
+
+    # Shift row i of the table of products over by i places, by laying the
+    # rows out in a wider array and reading it back with a shorter stride,
+    # so that summing down the columns adds up all terms of equal degree.
+    rows, width = len(b), len(a) + len(b)
+    sheared = np.zeros((rows, width, field.n), dtype = np.int64)
+    sheared[:, :len(a)] = terms
+    sheared = sheared.reshape(rows * width, field.n)[:rows * (width - 1)]
+    return np.sum(sheared.reshape(rows, width - 1, field.n), axis = 0) % field.p
+
+
+def _divmod(field, a, b, inverse = None):
+    """ Division with remainder of polynomials given as arrays of coefficient indices.
+
+        Short quotients are found by long division. For long quotients (when
+        the divisor is long too) the quotient is found by multiplying by an
+        inverse power series of the reversed divisor instead. When dividing
+        many times by the same b, the inverse series can be passed in to
+        save recomputing it.
+    """
+    if len(b) == 0:
+        raise ZeroDivisionError("Error, cannot divide by the zero polynomial.")
+    if len(a) < len(b):
+        return np.zeros(0, dtype = np.int64), a
+
+    quotient_length = len(a) - len(b) + 1
+    if quotient_length <= NEWTON_THRESHOLD or len(b) <= NEWTON_THRESHOLD:
+        return _long_divmod(field, a, b)
+
+    # The reversed quotient is rev(a) / rev(b) modulo x^quotient_length
+    if inverse is None or len(inverse) < quotient_length:
+        inverse = _series_inverse(field, b[::-1], quotient_length)
+    quotient = _pad_to(_mul(field, a[::-1][:quotient_length], inverse[:quotient_length])[:quotient_length], 
+                       quotient_length)[::-1]
+
+    low_product = _pad_to(_mul(field, quotient, b)[:len(b) - 1], len(b) - 1)
+    remainder = field.sub(a[:len(b) - 1], low_product)
+    return quotient, _trim(remainder)
+
+
+def _reducer(field, modulus):
+    """ A function reducing arrays of coefficient indices modulo a fixed
+        modulus, which computes the inverse series of the modulus only once.
+        Inputs should have less than twice the length of the modulus.
+    """
+    inverse = None
+    if len(modulus) - 1 > NEWTON_THRESHOLD:
+        inverse = _series_inverse(field, modulus[::-1], len(modulus) - 1)
+
+    def reduce(a):
+        return _divmod(field, _trim(a), modulus, inverse)[1]
+    return reduce
+
+
+def _series_inverse(field, f, length):
+    """ The inverse of the power series f modulo :math:`x^{length}`, by Newton's
+        iteration :math:`g \\rightarrow g - g (f g - 1)`, which doubles the 
+        number of correct terms at each step. The constant term of f must be 
+        non-zero.
+    """
+    inverse = np.array([field.invert(f[0])])
+    correct = 1
+    while correct < length:
+        target = min(2 * correct, length)
+        # f * g is 1 up to x^correct, so only its terms past that matter
+        error = _pad_to(_mul(field, f[:target], inverse)[:target], target)[correct:]
+        update = _pad_to(_mul(field, inverse, error)[:target - correct], target - correct)
+        inverse = np.concatenate([inverse, field.neg(update)])
+        correct = target
+    return inverse
+
+
+def _long_divmod(field, a, b):
+    """ Long division of polynomials given as arrays of coefficient indices.
+
+        Every step subtracts a multiple of b from the remainder in one go; the
+        remainder is kept in additive form so subtraction is cheap.
+    """
+
+    lead_inverse = field.invert(b[-1])
+    remainder = field.coef_table[a].copy()
+    quotient = np.zeros(len(a) - len(b) + 1, dtype = np.int64)
+
+    for k in range(len(a) - len(b), -1, -1):
+        lead = field._indices_from_coefs(remainder[k + len(b) - 1])
+        if lead == 0:
+            continue
+        quotient[k] = field.mul(lead, lead_inverse)
+        remainder[k:k + len(b)] = (remainder[k:k + len(b)] -
+                                   field.coef_table[field.mul(quotient[k], b)]) % field.p
+
+    return quotient, _trim(field._indices_from_coefs(remainder[:len(b) - 1]))
+
+
+def _gcd(field, a, b):
+    """ GCD (not normalized) of polynomials given as arrays of indices. """
+    a, b = _trim(a), _trim(b)
+    if len(a) < len(b):
+        a, b = b, a
+    while len(b) > 0:
+        if len(b) > HGCD_THRESHOLD and len(a) > len(b):
+            # Jump ahead by about half the degree at once
+            matrix = _hgcd(field, a, b)
+            a, b = _apply(field, matrix, a, b)
+            if len(b) == 0:
+                break
+        a, b = b, _divmod(field, a, b)[1]
+    return a
+
+
+def _hgcd(field, a, b):
+    """ The half-GCD of a and b, with deg(a) > deg(b).
+
+        Returns:
+            A 2 x 2 matrix of polynomials (as nested lists of index arrays)
+            which maps (a, b) to two consecutive remainders (c, d) of Euclid's
+            algorithm with deg(c) >= m > deg(d), where m = ceil(deg(a) / 2).
+    """
+    m = len(a) // 2
+    if len(b) - 1 < m:
+        return _identity(field)
+
+    if len(a) <= HGCD_THRESHOLD:
+        # Small enough to just take Euclid's steps one at a time
+        matrix = _identity(field)
+        while len(b) - 1 >= m:
+            quotient, remainder = _divmod(field, a, b)
+            matrix = _quotient_step(field, quotient, matrix)
+            a, b = b, remainder
+        return matrix
+
+    # The quotients of the high halves are those of a and b
+    first = _hgcd(field, a[m:], b[m:])
+    c, d = _apply(field, first, a, b)
+    if len(d) - 1 < m:
+        return first
+
+    quotient, e = _divmod(field, c, d)
+
+    k = 2 * m - (len(d) - 1)
+    if len(e) - 1 < k:
+        return _quotient_step(field, quotient, first)
+
+    second = _hgcd(field, d[k:], e[k:])
+    return _mat_mul(field, second, _quotient_step(field, quotient, first))
+
+
+def _quotient_step(field, quotient, matrix):
+    """ Multiply a 2 x 2 polynomial matrix on the left by [[0, 1], [1, -quotient]],
+        the matrix taking (a, b) to (b, a - quotient * b).
+    """
+    return [matrix[1],
+            [_poly_add(field, matrix[0][j], field.neg(_mul(field, quotient, matrix[1][j]))) 
+             for j in range(2)]]
+
+
+def _identity(field):
+    """ The 2 x 2 identity matrix of polynomials. """
+    one, zero = np.array([field._one]), np.zeros(0, dtype = np.int64)
+    return [[one, zero], [zero, one]]
+
+
+def _poly_add(field, a, b):
+    """ Add two polynomials given as arrays of indices. """
+    a, b = _pad(a, b)
+    return _trim(field.add(a, b))
+
+
+def _apply(field, matrix, a, b):
+    """ Multiply a 2 x 2 polynomial matrix by the vector (a, b). """
+    return (_poly_add(field, _mul(field, matrix[0][0], a), _mul(field, matrix[0][1], b)),
+            _poly_add(field, _mul(field, matrix[1][0], a), _mul(field, matrix[1][1], b)))
+
+
+def _mat_mul(field, x, y):
+    """ Multiply two 2 x 2 polynomial matrices. """
+    return [[_poly_add(field, _mul(field, x[i][0], y[0][j]), _mul(field, x[i][1], y[1][j]))
+             for j in range(2)] for i in range(2)]
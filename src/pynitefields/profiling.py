@@ -0,0 +1,99 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# profiling.py: Opt-in counters of the operations done in a field.
+#
+# © 2016 Olivia Di Matteo (odimatte@uwaterloo.ca)
+#
+# This file is part of the project PyniteFields.
+#
+# Licensed under BSD-3-Clause
+#
+
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+# The number of fields with profiling enabled. FieldElements check this
+# before anything else, so that when it is 0 the only cost of the
+# instrumentation is reading it.
+active = 0
+
+# Profilers of prime fields, keyed by p. Elements of prime fields don't
+# refer back to their field, but GF(p) is the same whichever GaloisField
+# it came from.
+_prime_profilers = {}
+
+class FieldProfiler():
+    """ Counts of the operations done in a field, and time spent in it.
+
+        Profilers are made by GaloisField.enable_profiling or
+        GaloisField.profiling, and the field then reports to it. Counts are
+        kept under names of the form "kind.operation":
+
+        - scalar.add, scalar.sub, scalar.mul, scalar.div, scalar.pow,
+          scalar.inv, scalar.tr, scalar.gchar: operations on FieldElements,
+          including those they make internally (e.g. tr uses pow and add).
+        - element.alloc: FieldElements created.
+        - bulk.add, bulk.mul, ...: calls of the bulk arithmetic functions, and
+          bulk.add.elements, ...: the number of results they computed.
+        - lookup.*: operations served from a table (lookup.field_list,
+          lookup.zech, lookup.log, lookup.packed, lookup.bytes), and
+          fallback.*: those that had to take a slower path instead
+          (fallback.inverse_search for inverses in prime fields,
+          fallback.object_matmul for matrix products with Python integers,
+          fallback.karatsuba for products of long polynomials too large to
+          pack into integers).
+
+        Time is kept in seconds under "construction" (of the field) and
+        "basis_conversion" (to_sdb, to_poly, and new basis views).
+
+        Attributes:
+            counts (Counter): The number of each operation.
+            seconds (defaultdict): The time spent in each activity.
+    """
+
+    def __init__(self):
+        self.counts = Counter()
+        self.seconds = defaultdict(float)
+
+
+    def count(self, name, amount = 1):
+        """ Add to the count of an operation. """
+        self.counts[name] += amount
+
+
+    @contextmanager
+    def timer(self, name):
+        """ A context manager adding the time spent inside it to seconds[name]. """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] += time.perf_counter() - start
+
+
+    def snapshot(self):
+        """ A copy of the counts and times so far.
+
+            Returns:
+                A dict with keys "counts" and "seconds", each a plain dict.
+        """
+        return {"counts": dict(self.counts), "seconds": dict(self.seconds)}
+
+
+    def reset(self):
+        """ Set all counts and times back to 0. """
+        self.counts.clear()
+        self.seconds.clear()
+
+
+def record(element, name):
+    """ Count an operation on a FieldElement, if its field is being profiled. """
+    if element.n == 1:
+        profiler = _prime_profilers.get(element.p)
+    else:
+        # The field list of an extension field is a fieldelement.ElementList
+        profiler = getattr(element.field_list, "profiler", None)
+    if profiler is not None:
+        profiler.counts[name] += 1
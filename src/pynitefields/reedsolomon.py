@@ -0,0 +1,409 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# reedsolomon.py: Systematic Reed-Solomon and Cauchy erasure codes.
+#
+# © 2016 Olivia Di Matteo (odimatte@uwaterloo.ca)
+#
+# This file is part of the project PyniteFields.
+#
+# Licensed under BSD-3-Clause
+#
+
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+
+from pynitefields.fieldmatrix import FieldMatrix, _matmul
+from pynitefields.polynomial import Polynomial, _pad_to
+
+# The default number of bytes in each shard of a stripe when streaming.
+DEFAULT_SHARD_SIZE = 1 << 16
+
+# The number of decoding matrices (one per pattern of missing shards) kept
+# by each code.
+DECODER_CACHE_SIZE = 64
+
+# Parity matrices of every field, keyed by (k, m, cauchy).
+_coding_matrices = weakref.WeakKeyDictionary()
+
+class ReedSolomon():
+    """ A systematic erasure code with k data shards and m parity shards.
+
+        Data is split into k shards of equal length, and m parity shards are
+        computed from them, position by position: the symbols at the same
+        position of all the shards form a codeword. Any k of the k + m shards
+        are enough to recover the data.
+
+        By default, the codewords are those of a Reed-Solomon code, i.e.
+        polynomials :math:`c(x)` of degree less than k + m that are divisible
+        by :math:`g(x) = (x - \\alpha)(x - \\alpha^2) \\cdots (x - \\alpha^m)`,
+        where :math:`\\alpha` is the primitive element. Besides erasures, up to
+        m / 2 corrupted shards can then be found and corrected from the
+        syndromes, with the Berlekamp-Massey algorithm. Alternatively, the
+        parity can be given by a Cauchy matrix; this only handles erasures.
+
+        Shards are either byte buffers (bytes, bytearray, memoryview, mmap),
+        over GF(:math:`2^8`) only, or NumPy arrays of element indices, over
+        any field.
+
+        Args:
+            field (GaloisField): The field of the symbols.
+            k (int): The number of data shards.
+            m (int): The number of parity shards.
+            cauchy (bool): Use a Cauchy parity matrix instead of a Reed-Solomon
+                code.
+
+        Attributes:
+            field (GaloisField): The field of the symbols.
+            k (int): The number of data shards.
+            m (int): The number of parity shards.
+            cauchy (bool): Whether the parity matrix is a Cauchy matrix.
+            matrix (np.ndarray): The m x k parity matrix, as element indices;
+                parity shard i is the sum over j of matrix[i, j] times data
+                shard j.
+    """
+
+    def __init__(self, field, k, m, cauchy = False):
+        if k < 1 or m < 0:
+            raise ValueError("Error, need at least one data shard.")
+        limit = field.dim if cauchy else field.dim - 1
+        if k + m > limit:
+            raise ValueError("Error, GF(" + str(field.dim) + ") allows at most " +
+                             str(limit) + " shards in total.")
+        self.field = field
+        self.k, self.m = k, m
+        self.cauchy = cauchy
+        self.matrix = coding_matrix(field, k, m, cauchy)
+        self._decoders = OrderedDict()
+
+
+    def encode(self, data):
+        """ Compute the parity shards.
+
+            Args:
+                data (list): The k data shards, all of the same length.
+
+            Returns:
+                A list of the m parity shards, as bytearrays if the data are
+                byte buffers, or arrays of element indices otherwise.
+        """
+        if len(data) != self.k:
+            raise ValueError("Error, expected " + str(self.k) + " data shards.")
+        return _combine(self.field, self.matrix, data)
+
+
+    def decode(self, shards):
+        """ Recover the data shards when some shards are missing.
+
+            Args:
+                shards (list): The k + m shards, in order (data shards, then
+                    parity shards), with None in place of missing shards.
+
+            Returns:
+                The list of the k data shards. Those that were present are
+                returned as they were given.
+
+            Raises:
+                ValueError: If fewer than k shards are present.
+        """
+        self._check_shards(shards)
+        missing = [j for j in range(self.k) if shards[j] is None]
+        if len(missing) == 0:
+            return list(shards[:self.k])
+
+        present = tuple([i for i in range(self.k + self.m) if shards[i] is not None][:self.k])
+        if len(present) < self.k:
+            raise ValueError("Error, at least " + str(self.k) + " shards are needed to decode.")
+
+        recovered = _combine(self.field, self._decoder(present)[missing],
+                             [shards[i] for i in present])
+        data = list(shards[:self.k])
+        for j, shard in zip(missing, recovered):
+            data[j] = shard
+        return data
+
+
+    def correct(self, shards):
+        """ Find and correct corrupted shards, and fill in missing ones.
+
+            The symbols at each position form a codeword whose syndromes
+            :math:`S_j = c(\\alpha^j)`, j = 1, ..., m, are all 0 unless
+            something went wrong. Syndromes are computed for all positions at
+            once with a matrix product, and only the positions where they
+            aren't 0 are decoded, with the Berlekamp-Massey algorithm (seeded
+            with the locator of the missing shards), a search for the roots
+            of the error locator, and Forney's formula for the values. This
+            succeeds at every position with e errors and s missing shards as
+            long as :math:`2e + s \\leq m`.
+
+            Args:
+                shards (list): The k + m shards, in order, with None in place
+                    of missing shards.
+
+            Returns:
+                The list of all k + m corrected shards.
+
+            Raises:
+                ValueError: If the code is a Cauchy code, or some position
+                    has too many errors to correct.
+        """
+        if self.cauchy:
+            raise ValueError("Error, Cauchy codes can only correct erasures.")
+        self._check_shards(shards)
+        field = self.field
+        as_bytes = not any([isinstance(shard, np.ndarray) for shard in shards])
+        length = max([len(shard) for shard in shards if shard is not None], default = 0)
+
+        # Rows of the codewords, ordered by the power of x they multiply
+        positions = [self.m + i if i < self.k else i - self.k for i in range(self.k + self.m)]
+        codewords = np.zeros((self.k + self.m, length), dtype = np.int64)
+        for i, shard in enumerate(shards):
+            if shard is not None:
+                codewords[positions[i]] = _to_indices(field, shard) if as_bytes else shard
+        erasures = [positions[i] for i in range(len(shards)) if shards[i] is None]
+        if len(erasures) > self.m:
+            raise ValueError("Error, at least " + str(self.k) + " shards are needed to decode.")
+
+        syndromes = _matmul(field, self._check_matrix(), codewords)
+        for column in np.nonzero(np.any(syndromes != 0, axis = 0))[0]:
+            errors = _errata(field, _primitive(self.field), syndromes[:, column], erasures,
+                             self.k + self.m)
+            if errors is None:
+                raise ValueError("Error, too many errors to correct at position " +
+                                 str(column) + ".")
+            where, values = errors
+            codewords[where, column] = field.sub(codewords[where, column], values)
+
+        corrected = [codewords[positions[i]] for i in range(self.k + self.m)]
+        return [_to_bytes(field, shard) for shard in corrected] if as_bytes else corrected
+
+
+    def encode_stream(self, stream, shard_size = DEFAULT_SHARD_SIZE):
+        """ Encode a byte stream, one stripe at a time.
+
+            Args:
+                stream (file or bytes-like): A binary file-like object (with a
+                    read method), or a buffer.
+                shard_size (int): The number of bytes in each shard.
+
+            Returns:
+                A generator of stripes, each a list of k + m bytearray shards,
+                holding k * shard_size bytes of the stream. The last stripe is
+                padded with zeros.
+        """
+        if not hasattr(stream, "read"):
+            view = memoryview(stream).cast("B")
+            stream = _BufferReader(view)
+        stripe_size = self.k * shard_size
+        while True:
+            chunk = stream.read(stripe_size)
+            if not chunk:
+                return
+            chunk = bytearray(chunk)
+            chunk.extend(bytes(stripe_size - len(chunk)))
+            view = memoryview(chunk)
+            data = [view[j * shard_size:(j + 1) * shard_size] for j in range(self.k)]
+            yield data + self.encode(data)
+
+
+    def decode_stream(self, stripes, length = None):
+        """ Decode stripes back into the bytes of the stream.
+
+            Args:
+                stripes (iterable): Lists of k + m shards, as produced by
+                    encode_stream, with None in place of missing shards.
+                length (int): The length of the original stream, to strip the
+                    padding from the last stripe.
+
+            Returns:
+                A generator of the bytes of the data shards of each stripe.
+                The decoding matrix for each pattern of missing shards is
+                computed once and reused.
+        """
+        remaining = length
+        for stripe in stripes:
+            chunk = b"".join([bytes(shard) for shard in self.decode(stripe)])
+            if remaining is not None:
+                chunk = chunk[:remaining]
+                remaining -= len(chunk)
+            yield chunk
+
+
+    def _check_shards(self, shards):
+        if len(shards) != self.k + self.m:
+            raise ValueError("Error, expected " + str(self.k + self.m) + " shards.")
+
+
+    def _decoder(self, present):
+        """ The inverse of the rows of the generator matrix [I; matrix] of the
+            given shards, cached per pattern of shards.
+        """
+        if present in self._decoders:
+            self._decoders.move_to_end(present)
+            return self._decoders[present]
+
+        field = self.field
+        identity = FieldMatrix.identity(field, self.k).entries
+        generator = np.vstack([identity, self.matrix])
+        inverse = FieldMatrix(field, generator[list(present)]).inverse().entries
+        self._decoders[present] = inverse
+        if len(self._decoders) > DECODER_CACHE_SIZE:
+            self._decoders.popitem(last = False)
+        return inverse
+
+
+    def _check_matrix(self):
+        """ The m x (k + m) matrix of :math:`\\alpha^{j i}`, j = 1, ..., m. """
+        exponents = np.outer(np.arange(1, self.m + 1), np.arange(self.k + self.m))
+        return self.field.power(_primitive(self.field), exponents)
+
+
+def coding_matrix(field, k, m, cauchy = False):
+    """ The m x k parity matrix of a systematic code, cached per field and (k, m).
+
+        For the Reed-Solomon code, column j holds the coefficients of
+        :math:`-(x^{m + j} \\bmod g(x))`, so that the parity of the data
+        polynomial :math:`d(x)` is :math:`-(x^m d(x) \\bmod g(x))`. The Cauchy
+        matrix has entries :math:`1 / (x_i - y_j)` for the distinct elements
+        :math:`x_i` = gf[k + i] and :math:`y_j` = gf[j]; every square
+        submatrix of it is invertible.
+
+        Args:
+            field (GaloisField): The field of the symbols.
+            k (int): The number of data shards.
+            m (int): The number of parity shards.
+            cauchy (bool): Whether to make a Cauchy matrix.
+
+        Returns:
+            An (m, k) array of element indices.
+    """
+    cache = _coding_matrices.setdefault(field, {})
+    key = (k, m, cauchy)
+    if key not in cache:
+        if cauchy:
+            rows, columns = np.arange(k, k + m), np.arange(k)
+            matrix = field.invert(field.sub(rows[:, np.newaxis], columns))
+        else:
+            matrix = _rs_matrix(field, k, m)
+        matrix.setflags(write = False)
+        cache[key] = matrix
+    return cache[key]
+
+
+def _rs_matrix(field, k, m):
+    """ The parity matrix of the Reed-Solomon code, as in coding_matrix. """
+    alpha = _primitive(field)
+    generator = Polynomial(field, np.array([field._one], dtype = np.int64))
+    for j in range(1, m + 1):
+        root = field.power(alpha, j)
+        generator = generator * Polynomial(field, np.array([field.neg(root), field._one]))
+
+    matrix = np.zeros((m, k), dtype = np.int64)
+    if m == 0:
+        return matrix
+    x = Polynomial(field, np.array([0, field._one], dtype = np.int64))
+    remainder = x.pow_mod(m, generator)
+    for j in range(k):
+        matrix[:, j] = field.neg(_pad_to(remainder.coefs, m))
+        remainder = (remainder * x) % generator
+    return matrix
+
+
+def _primitive(field):
+    """ The index of the primitive element. """
+    if field.n > 1:
+        return 1
+    return int(field._prime_log_tables()[1][1 % (field.p - 1)])
+
+
+def _errata(field, alpha, syndromes, erasures, length):
+    """ Locate and evaluate the errors in one codeword from its syndromes.
+
+        Args:
+            syndromes (np.ndarray): :math:`S_1, \\ldots, S_m`.
+            erasures (list): The positions known to be wrong.
+            length (int): The length of the codewords.
+
+        Returns:
+            A pair of arrays (positions, values) of the errors, to be
+            subtracted from the codeword, or None if they can't be found.
+    """
+    m = len(syndromes)
+    one = Polynomial(field, np.array([field._one], dtype = np.int64))
+    x = Polynomial(field, np.array([0, field._one], dtype = np.int64))
+
+    # Berlekamp-Massey, starting from the erasure locator
+    locator = one
+    for position in erasures:
+        locator = locator * Polynomial(field, np.array([field._one,
+                                                        field.neg(field.power(alpha, position))]))
+    previous, size = locator, len(erasures)
+    for r in range(len(erasures) + 1, m + 1):
+        coefs = locator.coefs[:r]
+        discrepancy = field.coef_table[field.mul(coefs, syndromes[r - 1::-1][:len(coefs)])]
+        discrepancy = field._indices_from_coefs(np.sum(discrepancy, axis = 0) % field.p)
+        if discrepancy == 0:
+            previous = x * previous
+            continue
+        update = locator - Polynomial(field, np.array([0, discrepancy])) * previous
+        if 2 * size <= r + len(erasures) - 1:
+            previous = Polynomial(field, np.array([field.invert(discrepancy)])) * locator
+            size = r + len(erasures) - size
+        else:
+            previous = x * previous
+        locator = update
+
+    # The roots of the locator are the inverses of alpha^position
+    degree = locator.degree()
+    points = field.power(alpha, -np.arange(length))
+    where = np.nonzero(locator(points) == 0)[0]
+    if len(where) != degree or degree > m:
+        return None
+
+    # Forney's formula
+    evaluator = Polynomial(field, (Polynomial(field, syndromes) * locator).coefs[:m])
+    values = field.neg(field.div(evaluator(points[where]), locator.derivative()(points[where])))
+    return where, values
+
+
+def _combine(field, matrix, shards):
+    """ Linear combinations of shards: output i is the sum of matrix[i, j]
+        times shard j.
+    """
+    if any([isinstance(shard, np.ndarray) for shard in shards]):
+        return list(_matmul(field, matrix, np.array(shards, dtype = np.int64)))
+
+    length = len(memoryview(shards[0]).cast("B"))
+    outputs = []
+    for row in matrix:
+        out = bytearray(length)
+        for coefficient, shard in zip(row, shards):
+            if coefficient == field._one:
+                field.buffer_xor(out, shard)
+            elif coefficient != 0:
+                field.buffer_mul_add(out, shard, coefficient)
+        outputs.append(out)
+    return outputs
+
+
+def _to_indices(field, shard):
+    """ The element indices of the bytes of a shard over GF(2^8). """
+    return field.from_integers(np.frombuffer(shard, dtype = np.uint8))
+
+
+def _to_bytes(field, indices):
+    """ A bytearray of the elements with the given indices, over GF(2^8). """
+    return bytearray(field.to_integers(indices).astype(np.uint8).tobytes())
+
+
+class _BufferReader():
+    """ A minimal file-like reader over a memoryview. """
+    def __init__(self, view):
+        self.view, self.offset = view, 0
+
+    def read(self, size):
+        chunk = self.view[self.offset:self.offset + size]
+        self.offset += len(chunk)
+        return chunk
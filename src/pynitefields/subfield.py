@@ -0,0 +1,123 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# subfield.py: Embeddings of GF(p^m) into GF(p^n), for m dividing n.
+#
+# © 2016 Olivia Di Matteo (odimatte@uwaterloo.ca)
+#
+# This file is part of the project PyniteFields.
+#
+# Licensed under BSD-3-Clause
+#
+
+import weakref
+
+import numpy as np
+
+from pynitefields.fieldbasis import _as_indices
+
+# Embeddings already computed, per pair of fields
+_embeddings = weakref.WeakKeyDictionary()
+
+class Embedding():
+    """ An embedding of a field GF(:math:`p^m`) into GF(:math:`p^n`), m | n.
+
+        The image of GF(:math:`p^m`) is the subfield of GF(:math:`p^n`)
+        generated by :math:`\\tau = \\sigma^k`, :math:`k = (p^n - 1)/(p^m - 1)`.
+        The primitive element of the small field is sent to the root
+        :math:`\\tau^j` of its irreducible polynomial with the smallest j,
+        found by evaluating the polynomial on the whole subfield at once.
+        After that, embedding is a lookup in a table with one entry per
+        element of the small field, and restriction (the inverse map, on the
+        subfield) only needs index arithmetic.
+
+        Args:
+            small (GaloisField): The field GF(:math:`p^m`).
+            large (GaloisField): The field GF(:math:`p^n`).
+
+        Attributes:
+            small, large (GaloisField): The two fields.
+            degree (int): The degree n / m of the extension.
+            table (np.ndarray): The index in the large field of each element
+                of the small one.
+    """
+    def __init__(self, small, large):
+        if small.p != large.p or large.n % small.n != 0:
+            raise ValueError("Error, GF(" + str(small.p) + "^" + str(small.n) + ") is not a subfield of GF(" +
+                             str(large.p) + "^" + str(large.n) + ").")
+        self.small, self.large = small, large
+        self.degree = large.n // small.n
+        self._step = (large.dim - 1) // (small.dim - 1)
+
+        if small.n == 1:
+            # The elements of GF(p) are the multiples of 1
+            self._root_power = None
+            self.table = large.from_integers(np.arange(small.p))
+            return
+
+        # Powers j of tau, and the values of the small field's polynomial there
+        exponents = np.arange(small.dim - 1)
+        points = large.from_powers(self._step * exponents)
+        coefs = large.from_integers(np.array(small.coefs) % small.p)
+        roots = exponents[large.evaluate_all(coefs, points) == 0]
+        self._root_power = int(roots[0])
+
+        # sigma_small^i goes to tau^(j i)
+        self.table = np.zeros(small.dim, dtype = np.int64)
+        self.table[1:] = large.from_powers(self._step * self._root_power * np.arange(1, small.dim))
+
+
+    def __call__(self, elements):
+        """ Embed elements of the small field in the large one.
+
+            Args:
+                elements (np.ndarray or FieldElement): Indices of elements of
+                    the small field, or a FieldElement.
+
+            Returns:
+                The indices of the images, or the image as a FieldElement.
+        """
+        indices = self.table[_as_indices(elements)]
+        return self.large[int(indices)] if hasattr(elements, "prim_power") else indices
+
+
+    def restrict(self, elements):
+        """ Map elements of the subfield of the large field back to the small one.
+
+            Args:
+                elements (np.ndarray or FieldElement): Indices of elements of
+                    the large field, or a FieldElement.
+
+            Returns:
+                The indices of the elements of the small field they come from,
+                or a FieldElement. Raises a ValueError if an element is not in
+                the subfield.
+        """
+        indices = np.asarray(_as_indices(elements), dtype = np.int64)
+        if not np.all(self.large.in_subfield(indices, self.small.n)):
+            raise ValueError("Error, element is not in the subfield GF(" + str(self.small.p) + "^" +
+                             str(self.small.n) + ").")
+        if self.small.n == 1:
+            result = self.large.to_integers(indices)
+        else:
+            # sigma^(k t) is tau^t, the image of sigma_small^(t / j)
+            order = self.small.dim - 1
+            powers = (indices // self._step) * pow(self._root_power, -1, order) % order
+            result = np.where(indices == 0, 0, np.where(powers == 0, self.small._one, powers))
+        return self.small[int(result)] if hasattr(elements, "prim_power") else result
+
+
+def embedding(small, large):
+    """ The Embedding of one field into another, computed once per pair.
+
+        Args:
+            small (GaloisField): The field GF(:math:`p^m`).
+            large (GaloisField): The field GF(:math:`p^n`), with m | n.
+
+        Returns:
+            The Embedding, from a cache if it has been asked for before.
+    """
+    cache = _embeddings.setdefault(large, weakref.WeakKeyDictionary())
+    if small not in cache:
+        cache[small] = Embedding(small, large)
+    return cache[small]
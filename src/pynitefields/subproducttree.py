@@ -0,0 +1,215 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# subproducttree.py: Fast multipoint evaluation and interpolation.
+#
+# © 2016 Olivia Di Matteo (odimatte@uwaterloo.ca)
+#
+# This file is part of the project PyniteFields.
+#
+# Licensed under BSD-3-Clause
+#
+
+import numpy as np
+
+from pynitefields.fieldbasis import _as_indices
+from pynitefields.polynomial import Polynomial, _mul, _divmod, _trim, _pad, _pad_to
+
+# Groups of up to this many points are handled directly by vectorized Horner's
+# rule and synthetic division rather than further down the tree.
+LEAF_SIZE = 64
+
+class SubproductTree():
+    """ A subproduct tree over a set of points of a finite field.
+
+        The leaves of the tree are the polynomials
+        :math:`\\prod_{a \\in S} (x - a)` for small groups S of the points, and
+        every other node is the product of its two children, so that the root
+        is :math:`M(x) = \\prod_i (x - a_i)`. Reducing a polynomial down the
+        tree evaluates it at all the points in time proportional to
+        :math:`M(d) \\log d`, where :math:`M(d)` is the cost of multiplying two
+        polynomials of degree d; interpolation goes back up the tree in the
+        same time. The tree only depends on the points, so it can be built
+        once and reused for many polynomials or sets of values.
+
+        Args:
+            field (GaloisField): The field the points are in.
+            points (np.ndarray): The indices of the points (or a list of
+                FieldElements). They must be distinct for interpolation.
+
+        Attributes:
+            field (GaloisField): The field the points are in.
+            points (np.ndarray): The indices of the points.
+            levels (list): The nodes of the tree as arrays of coefficient
+                indices, from the leaves (levels[0]) up to the root.
+    """
+
+    def __init__(self, field, points):
+        self.field = field
+        self.points = np.atleast_1d(_as_indices(points)).astype(np.int64)
+        if self.points.ndim != 1 or len(self.points) == 0:
+            raise ValueError("Points must be a non-empty one-dimensional array.")
+
+        num_leaves = -(-len(self.points) // LEAF_SIZE)
+        self._leaf_points = np.array_split(self.points, num_leaves)
+
+        # All groups have the same size, up to one; pad the short ones
+        self._leaf_size = len(self._leaf_points[0])
+        self._leaf_valid = np.array([[j < len(group) for j in range(self._leaf_size)]
+                                     for group in self._leaf_points])
+        self._leaf_array = np.array([_pad_to(group, self._leaf_size) for group in self._leaf_points])
+
+        self._leaves = _leaf_products(field, self._leaf_array, self._leaf_valid)
+        self.levels = [[_trim(leaf) for leaf in self._leaves]]
+        while len(self.levels[-1]) > 1:
+            below = self.levels[-1]
+            level = [_mul(field, below[i], below[i + 1]) for i in range(0, len(below) - 1, 2)]
+            if len(below) % 2 == 1:
+                level.append(below[-1])
+            self.levels.append(level)
+
+
+    def root(self):
+        """ The product :math:`\\prod_i (x - a_i)` over all the points. """
+        return Polynomial(self.field, self.levels[-1][0])
+
+
+    def evaluate(self, poly):
+        """ Evaluate a polynomial at every point of the tree.
+
+            Args:
+                poly (Polynomial or np.ndarray): The polynomial, or an array
+                    of the indices of its coefficients.
+
+            Returns:
+                An array holding the index of the value at each point, in the
+                same order as the points.
+        """
+        coefs = poly.coefs if isinstance(poly, Polynomial) else _trim(np.asarray(poly, dtype = np.int64))
+
+        # Reduce modulo the nodes on the way down, stopping above the leaves
+        remainders = [_divmod(self.field, coefs, self.levels[-1][0])[1]]
+        for level in range(len(self.levels) - 2, 0, -1):
+            nodes = self.levels[level]
+            remainders = [_divmod(self.field, remainders[i // 2], nodes[i])[1]
+                          for i in range(len(nodes))]
+        if len(self.levels) > 1:
+            remainders = [remainders[i // 2] for i in range(len(self.levels[0]))]
+
+        # The remainders are short, so finish off with Horner's rule on the
+        # points of all the leaves together
+        width = max(1, max(len(r) for r in remainders))
+        remainders = np.array([_pad_to(r, width) for r in remainders])
+        values = np.zeros(self._leaf_array.shape, dtype = np.int64)
+        for k in range(width - 1, -1, -1):
+            values = self.field.add(self.field.mul(values, self._leaf_array), 
+                                    remainders[:, k, np.newaxis])
+        return values[self._leaf_valid]
+
+
+    def interpolate(self, values):
+        """ Find the polynomial of least degree taking the given values.
+
+            Uses the Lagrange form
+            :math:`f(x) = \\sum_i w_i M(x) / (x - a_i)`, with weights
+            :math:`w_i = y_i / M'(a_i)`. The denominators are evaluated with
+            the tree and inverted all at once, and the sum is built up the
+            tree from the leaves.
+
+            Args:
+                values (np.ndarray): The indices of the values :math:`y_i` at
+                    each point (or a list of FieldElements).
+
+            Returns:
+                The Polynomial of degree less than the number of points
+                through all the (point, value) pairs.
+        """
+        field = self.field
+        values = np.atleast_1d(_as_indices(values)).astype(np.int64)
+        if values.shape != self.points.shape:
+            raise ValueError("There must be exactly one value for every point.")
+
+        denominators = self.evaluate(self.root().derivative())
+        try:
+            weights = field.div(values, denominators)
+        except ZeroDivisionError:
+            raise ValueError("Interpolation points must be distinct.")
+
+        # Split the weights up the same way as the points
+        splits = np.cumsum([len(group) for group in self._leaf_points])[:-1]
+        leaf_weights = np.array([_pad_to(w, self._leaf_size) for w in np.split(weights, splits)])
+        sums = _leaf_sums(field, self._leaves, self._leaf_array, leaf_weights)
+        sums = [_trim(s) for s in sums]
+
+        # Going up, the sum for a node is left * M_right + right * M_left
+        for level in range(len(self.levels) - 1):
+            nodes = self.levels[level]
+            combined = []
+            for i in range(0, len(nodes) - 1, 2):
+                a, b = _pad(_mul(field, sums[i], nodes[i + 1]), _mul(field, sums[i + 1], nodes[i]))
+                combined.append(_trim(field.add(a, b)))
+            if len(nodes) % 2 == 1:
+                combined.append(sums[-1])
+            sums = combined
+
+        return Polynomial(field, sums[0])
+
+
+def interpolate(field, points, values):
+    """ Find the polynomial of least degree through a set of points.
+
+        Args:
+            field (GaloisField): The field to work in.
+            points (np.ndarray): The indices of distinct points :math:`a_i`
+                (or a list of FieldElements).
+            values (np.ndarray): The indices of the values :math:`y_i`
+                (or a list of FieldElements).
+
+        Returns:
+            The Polynomial f of degree less than the number of points with
+            :math:`f(a_i) = y_i` for all i.
+    """
+    return SubproductTree(field, points).interpolate(values)
+
+
+def _leaf_products(field, blocks, valid):
+    """ Multiply out :math:`\\prod_j (x - a_j)` for every row of blocks at once.
+
+        Args:
+            blocks (np.ndarray): A (number of leaves, leaf size) array of points.
+            valid (np.ndarray): A boolean array of the same shape, which is
+                False for padding.
+
+        Returns:
+            A (number of leaves, leaf size + 1) array of coefficient indices.
+    """
+    num_leaves, size = blocks.shape
+    products = np.zeros((num_leaves, size + 1), dtype = np.int64)
+    products[:, 0] = field._one
+    for j in range(size):
+        shifted = np.hstack([np.zeros((num_leaves, 1), dtype = np.int64), products[:, :-1]])
+        updated = field.add(shifted, field.mul(products, field.neg(blocks[:, j])[:, np.newaxis]))
+        products = np.where(valid[:, j, np.newaxis], updated, products)
+    return products
+
+
+def _leaf_sums(field, products, blocks, weights):
+    """ Compute :math:`\\sum_j w_j P(x) / (x - a_j)` for every leaf at once.
+
+        Every quotient is found by synthetic division, for all the points of
+        all the leaves together, and the weighted quotients are summed in
+        additive form. Padding points must have a weight of 0.
+
+        Returns:
+            A (number of leaves, leaf size) array of coefficient indices.
+    """
+    num_leaves, size = blocks.shape
+    quotients = np.zeros((num_leaves, size, size), dtype = np.int64)
+    carry = np.repeat(products[:, size, np.newaxis], size, axis = 1)
+    for k in range(size - 1, -1, -1):
+        quotients[:, :, k] = carry
+        carry = field.add(np.repeat(products[:, k, np.newaxis], size, axis = 1),
+                          field.mul(carry, blocks))
+
+    terms = field.coef_table[field.mul(weights[:, :, np.newaxis], quotients)]
+    return field._indices_from_coefs(np.sum(terms, axis = 1) % field.p)
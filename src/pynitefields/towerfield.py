@@ -0,0 +1,350 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# towerfield.py: Composite fields GF((p^a)^b), built as extensions of a
+#                GaloisField GF(p^a).
+#
+# © 2016 Olivia Di Matteo (odimatte@uwaterloo.ca)
+#
+# This file is part of the project PyniteFields.
+#
+# Licensed under BSD-3-Clause
+#
+
+import weakref
+
+import numpy as np
+
+from pynitefields.fieldbasis import _as_indices, _inverse_mod_p
+from pynitefields.polynomial import Polynomial
+from pynitefields.factorization import factor
+from pynitefields.subfield import embedding
+
+# Base fields of up to this many elements get full tables of sums,
+# differences and products, of TABLE_SIZE^2 entries each.
+TABLE_SIZE = 256
+
+class TowerField():
+    """ A field GF(:math:`(p^a)^b`), as an extension of degree b of GF(:math:`p^a`).
+
+        Elements are polynomials of degree less than b in a root y of an
+        irreducible polynomial g over the base field, stored as NumPy arrays
+        whose last axis holds the b coefficients (indices of elements of the
+        base field, lowest degree first), in the smallest unsigned integer
+        type that holds them. When the base field has at most TABLE_SIZE
+        elements, its sums, differences and products are looked up in full
+        tables, which take :math:`3q^2` bytes (:math:`q = p^a`) rather than
+        the :math:`q^b` entries of the tables of GF(:math:`p^{ab}`); larger
+        base fields use their own bulk arithmetic. An element is inverted
+        through its norm, the product of its conjugates :math:`a^{q^i}`,
+        which lies in the base field:
+        :math:`a^{-1} = N(a)^{-1} \\prod_{i=1}^{b-1} a^{q^i}`.
+
+        Quadratic extensions (b = 2), the usual case, have closed forms: with
+        :math:`g = y^2 + g_1 y + g_0`, products take three multiplications in
+        the base field (Karatsuba), and the conjugate of :math:`a_0 + a_1 y`
+        is :math:`(a_0 - g_1 a_1) - a_1 y`, so that
+        :math:`N(a) = a_0^2 - g_1 a_0 a_1 + g_0 a_1^2`.
+
+        The point of a tower is its memory: a flat GaloisField whose tables
+        fit in memory looks each product up directly, and is faster, which
+        the TowerBenchmarks of pynitefields.bench show. A tower is for
+        fields too large for those tables, such as
+        GF(:math:`(2^{16})^2`), whose arithmetic then only needs the tables
+        of the base field.
+
+        To move between this representation and the polynomial basis of an
+        ordinary GaloisField of the same order, see isomorphism, to_flat and
+        from_flat.
+
+        Args:
+            base (GaloisField): The field GF(:math:`p^a`).
+            coefs (list): The indices in the base field of the coefficients
+                :math:`[g_0, g_1, \\ldots, g_b]` of a monic irreducible
+                polynomial g of degree b over it.
+
+        Attributes:
+            base (GaloisField): The base field.
+            p (int): The characteristic.
+            n (int): The degree ab of the field over GF(:math:`p`).
+            degree (int): The degree b over the base field.
+            dim (int): The order :math:`p^{ab}` of the field.
+            coefs (np.ndarray): The indices of the coefficients of g.
+    """
+    def __init__(self, base, coefs):
+        coefs = np.asarray(coefs, dtype = np.int64)
+        if len(coefs) < 2 or coefs[-1] != base._one:
+            raise ValueError("Error, the polynomial of a tower field must be monic of degree at least 1.")
+        factors = factor(Polynomial(base, coefs))
+        if len(factors) != 1 or factors[0][1] != 1:
+            raise ValueError("Error, the polynomial of a tower field must be irreducible.")
+
+        self.base = base
+        self.p = base.p
+        self.degree = len(coefs) - 1
+        self.n = base.n * self.degree
+        self.dim = base.dim ** self.degree
+        self.coefs = coefs
+        self.dtype = np.min_scalar_type(base.dim - 1) if base.dim <= 1 << 32 else np.dtype(np.int64)
+
+        self._add_table = self._sub_table = self._mul_table = self._inverses = None
+        if base.dim <= TABLE_SIZE:
+            # Flattened, so that entry (x, y) is at x q + y, which fits in
+            # 16 bits and is much faster to look up than a pair of indices
+            q = np.arange(base.dim)
+            self._add_table = base.add(q[:, np.newaxis], q).astype(self.dtype).ravel()
+            self._sub_table = base.sub(q[:, np.newaxis], q).astype(self.dtype).ravel()
+            self._mul_table = base.mul(q[:, np.newaxis], q).astype(self.dtype).ravel()
+            self._inverses = np.concatenate(([0], base.invert(q[1:]))).astype(self.dtype)
+
+        # Reducing y^b uses -g_0, ..., -g_(b-1)
+        self._reduction = base.neg(coefs[:-1]).astype(self.dtype)
+
+        # Row i holds the coefficients of y^(iq); the Frobenius map a -> a^q
+        # is linear over the base field, with this matrix
+        y = self.zero()
+        y[min(1, self.degree - 1)] = base._one if self.degree > 1 else self._reduction[0]
+        y_q = self.power(y, base.dim)
+        rows = [self.one()]
+        for _ in range(1, self.degree):
+            rows.append(self.mul(rows[-1], y_q))
+        self._frobenius = np.array(rows)
+
+        self._isomorphisms = weakref.WeakKeyDictionary()
+
+
+    def zero(self, shape = ()):
+        """ An array of zeros of the given shape. """
+        return np.zeros(tuple(shape) + (self.degree,), dtype = self.dtype)
+
+
+    def one(self, shape = ()):
+        """ An array of ones of the given shape. """
+        result = self.zero(shape)
+        result[..., 0] = self.base._one
+        return result
+
+
+    def add(self, a, b):
+        """ Add arrays of elements. """
+        return self._add(self._elements(a), self._elements(b))
+
+
+    def sub(self, a, b):
+        """ Subtract arrays of elements, a - b. """
+        return self._sub(self._elements(a), self._elements(b))
+
+
+    def neg(self, a):
+        """ Negate an array of elements. """
+        return self._sub(self.dtype.type(0), self._elements(a))
+
+
+    def mul(self, a, b):
+        """ Multiply arrays of elements.
+
+            The coefficients are multiplied as polynomials, with :math:`b^2`
+            products in the base field (three, for b = 2), and the result is
+            reduced modulo g.
+
+            Args:
+                a, b (np.ndarray): Arrays of shape (..., b) of base field
+                    indices; they are broadcast against each other.
+
+            Returns:
+                The array of products.
+        """
+        a, b = np.broadcast_arrays(self._elements(a), self._elements(b))
+        if self.degree == 2:
+            a0, a1, b0, b1 = a[..., 0], a[..., 1], b[..., 0], b[..., 1]
+            low, high = self._mul(a0, b0), self._mul(a1, b1)
+            middle = self._sub(self._sub(self._mul(self._add(a0, a1), self._add(b0, b1)), low), high)
+            # y^2 = r_0 + r_1 y, with r_i = -g_i
+            r0, r1 = self._reduction
+            return np.stack((self._add(low, self._mul(high, r0)), self._add(middle, self._mul(high, r1))), axis = -1)
+
+        k = self.degree
+        product = np.zeros(a.shape[:-1] + (2 * k - 1,), dtype = self.dtype)
+        for i in range(k):
+            product[..., i:i + k] = self._add(product[..., i:i + k], self._mul(a[..., i:i + 1], b))
+        for top in range(2 * k - 2, k - 1, -1):
+            product[..., top - k:top] = self._add(product[..., top - k:top],
+                                                  self._mul(product[..., top:top + 1], self._reduction))
+        return product[..., :k]
+
+
+    def power(self, a, exponent):
+        """ Raise an array of elements to a non-negative integer power. """
+        result, a = self.one(np.shape(a)[:-1]), self._elements(a)
+        while exponent > 0:
+            if exponent & 1:
+                result = self.mul(result, a)
+            exponent >>= 1
+            if exponent:
+                a = self.mul(a, a)
+        return result
+
+
+    def frobenius(self, a, times = 1):
+        """ Apply the map :math:`a \\mapsto a^q` of the base field's order q. """
+        a = self._elements(a)
+        for _ in range(times):
+            terms = self._mul(a[..., :, np.newaxis], self._frobenius)
+            result = terms[..., 0, :]
+            for i in range(1, self.degree):
+                result = self._add(result, terms[..., i, :])
+            a = result
+        return a
+
+
+    def norm(self, a):
+        """ The norms of an array of elements, as indices in the base field.
+
+            Returns:
+                An array with the shape of a without its last axis.
+        """
+        a = self._elements(a)
+        if self.degree == 2:
+            a0, a1 = a[..., 0], a[..., 1]
+            r0, r1 = self._reduction
+            # a_0 (a_0 - g_1 a_1) + g_0 a_1^2, with r_i = -g_i
+            return self._sub(self._mul(a0, self._add(a0, self._mul(r1, a1))), self._mul(self._mul(a1, a1), r0))
+        return self.mul(a, self._conjugate_product(a))[..., 0]
+
+
+    def invert(self, a):
+        """ Invert an array of elements, through their norms.
+
+            Returns:
+                The array of inverses. Raises a ZeroDivisionError if any
+                element is 0.
+        """
+        a = self._elements(a)
+        if np.any(np.all(a == 0, axis = -1)):
+            raise ZeroDivisionError("Error, 0 has no multiplicative inverse.")
+        rest = self._conjugate_product(a)
+        norm = self.norm(a) if self.degree == 2 else self.mul(a, rest)[..., 0]
+        return self._mul(rest, self._invert(norm)[..., np.newaxis])
+
+
+    def div(self, a, b):
+        """ Divide arrays of elements, a / b. """
+        return self.mul(a, self.invert(b))
+
+
+    def _conjugate_product(self, a):
+        """ The product of the conjugates a^(q^i), 1 <= i < b. """
+        if self.degree == 1:
+            return self.one(a.shape[:-1])
+        if self.degree == 2:
+            a0, a1 = a[..., 0], a[..., 1]
+            return np.stack((self._add(a0, self._mul(self._reduction[1], a1)), self._sub(0, a1)), axis = -1)
+        conjugate = self.frobenius(a)
+        product = conjugate
+        for _ in range(2, self.degree):
+            conjugate = self.frobenius(conjugate)
+            product = self.mul(product, conjugate)
+        return product
+
+
+    def _elements(self, a):
+        """ An array of elements in the type used to store them. """
+        return np.asarray(a).astype(self.dtype, copy = False)
+
+
+    def _add(self, x, y):
+        """ Add arrays of base field indices. """
+        if self._add_table is not None:
+            return self._lookup(self._add_table, x, y)
+        return self.base.add(x, y).astype(self.dtype)
+
+
+    def _sub(self, x, y):
+        """ Subtract arrays of base field indices. """
+        if self._sub_table is not None:
+            return self._lookup(self._sub_table, x, y)
+        return self.base.sub(x, y).astype(self.dtype)
+
+
+    def _mul(self, x, y):
+        """ Multiply arrays of base field indices. """
+        if self._mul_table is not None:
+            return self._lookup(self._mul_table, x, y)
+        return self.base.mul(x, y).astype(self.dtype)
+
+
+    def _lookup(self, table, x, y):
+        """ Look up the entries (x, y) of a flattened table of the base field. """
+        return table.take(np.asarray(x, dtype = np.uint16) * np.uint16(self.base.dim) + y)
+
+
+    def _invert(self, x):
+        """ Invert an array of non-zero base field indices. """
+        if self._inverses is not None:
+            return self._inverses[x]
+        return self.base.invert(x).astype(self.dtype)
+
+
+    def isomorphism(self, flat):
+        """ The matrices of an isomorphism with an ordinary GaloisField.
+
+            Both fields are vector spaces over GF(:math:`p`): this one with
+            basis :math:`\\beta_j y^i` (the :math:`\\beta_j` being the
+            polynomial basis of the base field), ordered by i and then j, and
+            the flat field with its polynomial basis. The isomorphism sends y
+            to the root of g (with coefficients embedded through embedding)
+            in the flat field with the smallest index. It is computed once
+            for each flat field.
+
+            Args:
+                flat (GaloisField): A field of the same order.
+
+            Returns:
+                A pair of (n, n) integer matrices (to_flat, from_flat), acting
+                on row vectors of coordinates from the right, modulo p.
+        """
+        if flat not in self._isomorphisms:
+            if flat.p != self.p or flat.n != self.n:
+                raise ValueError("Error, the flat field must have order " + str(self.p) + "^" + str(self.n) + ".")
+            embed = embedding(self.base, flat)
+            root = int(np.flatnonzero(flat.evaluate_all(embed(self.coefs)) == 0)[0])
+
+            basis = embed(self.base.from_coefs(np.eye(self.base.n, dtype = np.int64)))
+            powers = flat.power(root, np.arange(self.degree))
+            images = flat.mul(powers[:, np.newaxis], basis[np.newaxis, :]).ravel()
+            to_flat = flat.coef_table[images]
+            from_flat = _inverse_mod_p(to_flat, self.p)
+            self._isomorphisms[flat] = (to_flat, from_flat)
+        return self._isomorphisms[flat]
+
+
+    def to_flat(self, elements, flat):
+        """ Convert an array of elements to indices of the flat field.
+
+            Args:
+                elements (np.ndarray): An array of shape (..., b).
+                flat (GaloisField): A field of the same order.
+
+            Returns:
+                An array of shape (...) of indices in the flat field.
+        """
+        to_flat, _ = self.isomorphism(flat)
+        coords = self.base.coef_table[np.asarray(elements, dtype = np.int64)]
+        coords = coords.reshape(coords.shape[:-2] + (self.n,))
+        return flat._indices_from_coefs(np.dot(coords, to_flat) % self.p)
+
+
+    def from_flat(self, indices, flat):
+        """ Convert indices of the flat field to an array of elements.
+
+            Args:
+                indices (np.ndarray): Indices of elements of flat.
+                flat (GaloisField): A field of the same order.
+
+            Returns:
+                An array of shape indices.shape + (b,).
+        """
+        _, from_flat = self.isomorphism(flat)
+        coords = np.dot(flat.coef_table[_as_indices(indices)], from_flat) % self.p
+        coords = coords.reshape(coords.shape[:-1] + (self.degree, self.base.n))
+        return self.base._indices_from_coefs(coords).astype(self.dtype)
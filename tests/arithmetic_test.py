@@ -72,6 +72,20 @@ class ArithmeticTests(unittest.TestCase):
         self.assertEqual(self.gf27[0].tr(), 0)
         self.assertEqual(self.gf27[11].tr(), 2)
 
+    def testToSdb(self):
+        # Coefficients as computed by the original, element by element, to_sdb
+        gf8 = GaloisField(2, 3, [1, 1, 0, 1])
+        gf8.to_sdb([3, 5, 6])
+        self.assertEqual([el.sdb_coefs for el in gf8], 
+                         [[0, 0, 0], [0, 1, 1], [1, 1, 0], [1, 0, 0], [1, 0, 1], [0, 1, 0], [0, 0, 1], [1, 1, 1]])
+
+        # Almost self-dual: the first element squares to trace 2
+        gf9 = GaloisField(3, 2, [2, 1, 1])
+        gf9.to_sdb([2, 4])
+        self.assertEqual(gf9.sdb_norms, [2, 1])
+        self.assertEqual([el.sdb_coefs for el in gf9], 
+                         [[0, 0], [2, 2], [0, 1], [2, 1], [1, 0], [1, 1], [0, 2], [1, 2], [2, 0]])
+
 
 
 
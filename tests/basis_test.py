@@ -0,0 +1,143 @@
+import unittest
+from pynitefields import * 
+
+class BasisTests(unittest.TestCase):
+    def setUp(self):
+        self.gf8 = GaloisField(2, 3, [1, 1, 0, 1])
+        self.gf16 = GaloisField(2, 4, [1, 1, 0, 0, 1])
+
+
+    def testViewMatchesToSdb(self):
+        view = self.gf16.in_basis([3, 7, 12, 13])
+        view_coefs = [el.sdb_coefs for el in view]
+
+        self.gf16.to_sdb([3, 7, 12, 13])
+        self.assertEqual(view_coefs, [el.sdb_coefs for el in self.gf16])
+        self.assertEqual(self.gf16.sdb_coef_table.tolist(), view_coefs)
+
+
+    def testViewLeavesFieldAlone(self):
+        view = self.gf8.in_basis([3, 5, 6])
+        self.assertFalse(self.gf8.is_sdb)
+        self.assertFalse(self.gf8[3].is_sdb)
+        self.assertEqual(view[3].sdb_coefs, [1, 0, 0])
+        self.assertEqual(view[5].sdb_coefs, [0, 1, 0])
+        self.assertEqual(view.coords(6), [0, 0, 1])
+
+
+    def testViewIsCached(self):
+        self.assertIs(self.gf8.in_basis([3, 5, 6]), self.gf8.in_basis([3, 5, 6]))
+
+
+    def testArithmeticStaysInView(self):
+        view = self.gf16.in_basis([3, 7, 12, 13])
+        product = view[4] * view[14]
+        self.assertIs(product.basis, view)
+        self.assertEqual(product, self.gf16[3])
+        self.assertEqual(product.sdb_coefs, view.coords(3))
+
+
+    def testOrdering(self):
+        view = self.gf16.in_basis([3, 7, 12, 13])
+        ordered = sorted(view)
+        coefs = [el.sdb_coefs for el in ordered]
+        self.assertEqual(coefs, sorted(coefs))
+
+
+    def testInvalidBasis(self):
+        # x^4 = x + x^2 in this field
+        with self.assertRaises(ValueError):
+            self.gf8.in_basis([1, 2, 4])
+
+
+    def testArbitraryBasis(self):
+        gf27 = GaloisField(3, 3, [1, 2, 0, 1])
+        basis = gf27.in_basis([1, 2, 3])
+        self.assertFalse(basis.is_self_dual)
+        self.assertEqual(basis.coords(1), [1, 0, 0])
+        self.assertEqual(basis.coords(3), [0, 0, 1])
+
+        # Reconstruct every element from its coordinates
+        self.assertEqual(basis.from_coords(basis.coord_table).tolist(), list(range(27)))
+        self.assertEqual(basis.from_coords([0, 1, 0]), 2)
+
+
+    def testDualBasis(self):
+        gf27 = GaloisField(3, 3, [1, 2, 0, 1])
+        basis = gf27.in_basis([1, 2, 3])
+        dual = basis.dual()
+        for i in range(3):
+            for j in range(3):
+                traced = tr(gf27[basis.element_indices[i]] * gf27[dual.element_indices[j]])
+                self.assertEqual(traced, 1 if i == j else 0)
+        self.assertEqual(dual.dual().element_indices, basis.element_indices)
+
+        # A self-dual basis is its own dual
+        sdb = self.gf16.in_basis([3, 7, 12, 13])
+        self.assertTrue(sdb.is_self_dual)
+        self.assertEqual(sdb.dual_indices, [3, 7, 12, 13])
+
+
+    def testToPoly(self):
+        self.gf8.to_sdb([3, 5, 6])
+        self.assertEqual(self.gf8[3].sdb_coefs, [1, 0, 0])
+        self.gf8.to_poly()
+        self.assertFalse(self.gf8[3].is_sdb)
+        self.assertEqual(self.gf8[3].sdb_coefs, [])
+
+
+    def testDeprecatedSdbArguments(self):
+        gf8 = self.gf8
+        sdb_field_list = ["0,0,0", "0,1,1", "1,1,0", "1,0,0", "1,1,1", "0,1,0", "0,0,1", "1,0,1"]
+        with self.assertWarns(DeprecationWarning):
+            el = FieldElement(2, 3, gf8[3].exp_coefs, gf8[3].field_list, True, sdb_field_list)
+        self.assertTrue(el.is_sdb)
+        self.assertEqual(el.sdb_coefs, [1, 0, 0])
+        self.assertEqual(el.sdb_field_list, sdb_field_list)
+        with self.assertWarns(DeprecationWarning):
+            el = FieldElement(2, 3, gf8[3].exp_coefs, gf8[3].field_list, sdb_coefs = [0, 1, 0])
+        self.assertEqual(el.sdb_coefs, [0, 1, 0])
+
+        el = gf8[5] * gf8[1]
+        with self.assertWarns(DeprecationWarning):
+            el.is_sdb = True
+        with self.assertWarns(DeprecationWarning):
+            el.sdb_coefs = [0, 0, 1]
+        self.assertTrue(el.is_sdb)
+        self.assertEqual(el.sdb_coefs, [0, 0, 1])
+        self.assertFalse(gf8[5].is_sdb)
+
+
+    def testNormalBasis(self):
+        gf27 = GaloisField(3, 3, [1, 2, 0, 1])
+        normal = gf27.normal_basis()
+        alpha = normal.normal_element
+        self.assertEqual(normal.element_indices, [alpha, (alpha * 3 - 1) % 26 + 1, (alpha * 9 - 1) % 26 + 1])
+        self.assertIs(gf27.normal_basis(), normal)
+
+        with self.assertRaises(ValueError):
+            gf27.normal_basis(13) # -1 is in the prime field, so not normal
+
+
+    def testNormalBasisFrobenius(self):
+        for field in [self.gf16, GaloisField(3, 3, [1, 2, 0, 1])]:
+            normal = field.normal_basis()
+            indices = list(range(field.dim))
+            frobenius = normal.frobenius(indices).tolist()
+            self.assertEqual(frobenius, [field.elements.index(pow(el, field.p)) for el in field])
+            self.assertEqual(normal.trace(indices).tolist(), [tr(el) for el in field])
+
+            conjugates = normal.conjugates(indices)
+            self.assertEqual(conjugates[:, 1].tolist(), frobenius)
+
+
+    def testNormalBasisNorm(self):
+        gf27 = GaloisField(3, 3, [1, 2, 0, 1])
+        norms = gf27.normal_basis().norm(list(range(27)))
+        for el in gf27:
+            norm = el * pow(el, 3) * pow(el, 9)
+            self.assertEqual(norms[el.prim_power], norm.exp_coefs[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+import os
+import tempfile
+from pynitefields import bench
+
+class BenchTests(unittest.TestCase):
+    def testPrimitivePolynomials(self):
+        for p, n in [(2, 4), (3, 3), (5, 2), (7, 2)]:
+            coefs = bench.primitive_polynomial(p, n)
+            self.assertEqual(len(coefs), n + 1)
+            field = bench.GaloisField(p, n, coefs)
+            self.assertEqual(len(field.elements), p ** n)
+
+
+    def testRunAndCompare(self):
+        results = bench.run(quick = True, pattern = "time_bulk_mul[2^", repeat = 1, min_time = 0)
+        self.assertEqual(sorted(results), ["FieldBenchmarks.time_bulk_mul[2^" + str(n) + "]"
+                                           for n in [2, 3, 4, 5, 8]])
+
+        filename = os.path.join(tempfile.mkdtemp(), "results.json")
+        bench.save(results, filename)
+        self.assertEqual(bench.load(filename), results)
+
+        slower = dict([(name, 2 * seconds) for name, seconds in results.items()])
+        self.assertEqual(bench.compare(results, results), [])
+        regressions = bench.compare(slower, results, threshold = 1.5)
+        self.assertEqual(sorted([row[0] for row in regressions]), sorted(results))
+        self.assertAlmostEqual(regressions[0][3], 2)
+
+
+    def testToSdbBuildsTheBasis(self):
+        suite = bench.SelfDualBasisBenchmarks()
+        suite.setup("2^3")
+        suite.time_to_sdb("2^3")
+        first = list(suite.field._basis_views.values())
+        suite.time_to_sdb("2^3")
+        self.assertEqual(len(first), 1)
+        self.assertIsNot(list(suite.field._basis_views.values())[0], first[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+import numpy as np
+from pynitefields import *
+
+class BinaryMatrixTests(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.RandomState(35)
+        self.gf256 = GaloisField(2, 8, [1, 0, 1, 1, 1, 0, 0, 0, 1])
+
+
+    def random(self, rows, columns):
+        return self.rng.randint(0, 2, (rows, columns))
+
+
+    def random_invertible(self, size):
+        while True:
+            bits = self.random(size, size)
+            if BinaryMatrix(bits).rank() == size:
+                return bits
+
+
+    def testPackingRoundTrip(self):
+        for shape in [(1, 1), (3, 64), (5, 65), (4, 200)]:
+            bits = self.random(*shape)
+            m = BinaryMatrix(bits)
+            self.assertTrue(np.array_equal(m.to_array(), bits))
+            self.assertEqual(m.words.shape, (shape[0], -(-shape[1] // 64)))
+            self.assertEqual(m[shape[0] - 1, shape[1] - 1], bits[-1, -1])
+
+
+    def testProduct(self):
+        for rows, inner, columns in [(3, 5, 2), (70, 130, 90), (64, 64, 64)]:
+            a, b = self.random(rows, inner), self.random(inner, columns)
+            product = BinaryMatrix(a) @ BinaryMatrix(b)
+            self.assertTrue(np.array_equal(product.to_array(), (a @ b) % 2))
+        with self.assertRaises(ValueError):
+            BinaryMatrix(self.random(2, 3)) @ BinaryMatrix(self.random(2, 3))
+
+
+    def testSumAndTranspose(self):
+        a, b = self.random(10, 70), self.random(10, 70)
+        self.assertTrue(np.array_equal((BinaryMatrix(a) + BinaryMatrix(b)).to_array(), a ^ b))
+        self.assertEqual(BinaryMatrix(a).transpose(), BinaryMatrix(a.T))
+
+
+    def testRowReduce(self):
+        a = np.array([[0, 1, 1, 0], [0, 1, 1, 1], [0, 0, 0, 1]])
+        reduced, pivots = BinaryMatrix(a).row_reduce()
+        self.assertEqual(pivots, [1, 3])
+        self.assertTrue(np.array_equal(reduced.to_array(),
+                                       [[0, 1, 1, 0], [0, 0, 0, 1], [0, 0, 0, 0]]))
+
+
+    def testRankAndNullspace(self):
+        for rows, columns in [(40, 90), (150, 100)]:
+            a = self.random(rows, 12) @ self.random(12, columns) % 2
+            m = BinaryMatrix(a)
+            null = m.nullspace()
+            self.assertEqual(m.rank() + null.shape[0], columns)
+            self.assertFalse(np.any((a @ null.to_array().T) % 2))
+
+
+    def testInverse(self):
+        a = self.random_invertible(130)
+        inverse = BinaryMatrix(a).inverse()
+        self.assertEqual(BinaryMatrix(a) @ inverse, BinaryMatrix.identity(130))
+        with self.assertRaises(ZeroDivisionError):
+            BinaryMatrix(np.ones((5, 5), dtype = int)).inverse()
+
+
+    def testSolve(self):
+        a = self.random(80, 100)
+        x = self.random(100, 1)[:, 0]
+        b = (a @ x) % 2
+        self.assertTrue(np.array_equal((a @ BinaryMatrix(a).solve(b)) % 2, b))
+
+        many = self.random(80, 3)
+        with self.assertRaises(ValueError):
+            BinaryMatrix(np.zeros((80, 100), dtype = int)).solve(many | 1)
+
+
+    def testMultiplicationMatrix(self):
+        gf = self.gf256
+        a, b = self.rng.randint(0, gf.dim, 50), self.rng.randint(0, gf.dim, 50)
+        matrices = gf.multiplication_matrix(a)
+        self.assertEqual(matrices.shape, (50, 8, 8))
+        coefs = np.einsum('ij,ijk->ik', gf.coef_table[b], matrices) % 2
+        self.assertTrue(np.array_equal(coefs, gf.coef_table[gf.mul(a, b)]))
+        self.assertTrue(np.array_equal(gf.multiplication_matrix(gf[0]), np.zeros((8, 8))))
+        self.assertTrue(np.array_equal(gf.multiplication_matrix(gf._one), np.eye(8)))
+
+
+    def testFieldExpansion(self):
+        gf = self.gf256
+        x = FieldMatrix(gf, self.rng.randint(0, gf.dim, (6, 5)))
+        y = FieldMatrix(gf, self.rng.randint(0, gf.dim, (5, 4)))
+        ex, ey = BinaryMatrix.from_field_matrix(x), BinaryMatrix.from_field_matrix(y)
+        self.assertEqual(ex.shape, (48, 40))
+        self.assertEqual(ex @ ey, BinaryMatrix.from_field_matrix(x @ y))
+        self.assertEqual((ex @ ey).to_field_matrix(gf), x @ y)
+        self.assertEqual(ex.rank(), 8 * x.rank())
+        with self.assertRaises(ValueError):
+            BinaryMatrix.from_field_matrix(FieldMatrix(GaloisField(3), [[1]]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,333 @@
+import unittest
+import numpy as np
+from pynitefields import * 
+from pynitefields import galoisfield
+
+class BulkArithmeticTests(unittest.TestCase):
+    def setUp(self):
+        self.gf7 = GaloisField(7)
+        self.gf16 = GaloisField(2, 4, [1, 1, 0, 0, 1])
+        self.gf27 = GaloisField(3, 3, [1, 2, 0, 1])
+        self.fields = [self.gf7, self.gf16, self.gf27]
+
+
+    def testMatchesFieldElements(self):
+        for field in self.fields:
+            a, b = np.meshgrid(np.arange(field.dim), np.arange(field.dim), indexing = 'ij')
+            sums, differences = field.add(a, b), field.sub(a, b)
+            products = field.mul(a, b)
+            for x in field:
+                for y in field:
+                    self.assertEqual(field[sums[x.prim_power, y.prim_power]], x + y)
+                    self.assertEqual(field[differences[x.prim_power, y.prim_power]], x - y)
+                    self.assertEqual(field[products[x.prim_power, y.prim_power]], x * y)
+
+
+    def testInverseAndDivision(self):
+        for field in self.fields:
+            nonzero = np.arange(1, field.dim)
+            inverses = field.invert(nonzero)
+            one = field.power(1, 0)
+            self.assertTrue(np.all(field.mul(nonzero, inverses) == one))
+            self.assertEqual([field[i] for i in inverses], [field[i].inv() for i in nonzero])
+            self.assertTrue(np.all(field.div(field.mul(nonzero, 3), nonzero) == 3))
+
+            with self.assertRaises(ZeroDivisionError):
+                field.invert([0, 1])
+
+
+    def testPower(self):
+        self.assertEqual(self.gf7.power([2, 3, 0], 3).tolist(), [1, 6, 0])
+        self.assertEqual(self.gf16.power([2, 9, 0], [3, 2, 3]).tolist(), [6, 3, 0])
+        self.assertEqual(self.gf27.power([8, 14], 2).tolist(), [16, 2])
+
+        # Unlike FieldElement, x^0 is 1
+        self.assertEqual(self.gf27.power([0, 5], 0).tolist(), [26, 26])
+        self.assertEqual(self.gf27.power(5, -1), self.gf27.invert(5))
+
+
+    def testNegation(self):
+        for field in self.fields:
+            elements = np.arange(field.dim)
+            self.assertTrue(np.all(field.add(elements, field.neg(elements)) == 0))
+
+
+    def testByteBuffers(self):
+        gf256 = GaloisField(2, 8, [1, 0, 1, 1, 1, 0, 0, 0, 1])
+        packed = np.dot(gf256.coef_table, 2 ** np.arange(8))
+        index = np.argsort(packed)
+        rng = np.random.RandomState(37)
+        data = rng.randint(0, 256, 200000).astype(np.uint8)
+        target = rng.randint(0, 256, 200000).astype(np.uint8)
+
+        for c in [0, gf256._one, 77]:
+            product = gf256.buffer_mul(data.tobytes(), c)
+            expected = packed[gf256.mul(index[data], c)]
+            self.assertIsInstance(product, bytearray)
+            self.assertTrue(np.array_equal(np.frombuffer(product, dtype = np.uint8), expected))
+
+        out = bytearray(target.tobytes())
+        gf256.buffer_mul_add(memoryview(out), data.tobytes(), gf256[200])
+        expected = packed[gf256.add(index[target], gf256.mul(index[data], 200))]
+        self.assertTrue(np.array_equal(np.frombuffer(out, dtype = np.uint8), expected))
+
+        # In place, and XOR accumulation
+        out = bytearray(data.tobytes())
+        gf256.buffer_mul(out, 5, out = out)
+        gf256.buffer_xor(out, gf256.buffer_mul(data.tobytes(), 5))
+        self.assertEqual(out, bytearray(len(data)))
+
+        with self.assertRaises(ValueError):
+            gf256.buffer_mul(data.tobytes(), 3, out = data.tobytes())
+        with self.assertRaises(ValueError):
+            gf256.buffer_xor(bytearray(3), bytes(4))
+        with self.assertRaises(ValueError):
+            self.gf16.buffer_mul(bytes(4), 1)
+
+
+    def testIterBlocks(self):
+        for field in self.fields:
+            blocks = list(field.iter_blocks(block_size = 5))
+            self.assertEqual([len(block) for block in blocks][:-1], [5] * (len(blocks) - 1))
+            self.assertTrue(np.array_equal(np.concatenate(blocks), np.arange(field.dim)))
+            for indices, coefs in field.iter_blocks(block_size = 4, coefs = True):
+                for i, coef_row in zip(indices, coefs):
+                    self.assertEqual(coef_row.tolist(), list(field[int(i)].exp_coefs))
+
+
+    def testProductBlocks(self):
+        fields = [self.gf7, self.gf16]
+        blocks = list(product_blocks(fields, block_size = 10))
+        tuples = np.concatenate(blocks)
+        self.assertEqual(tuples.shape, (7 * 16, 2))
+        self.assertEqual([tuple(row) for row in tuples],
+                         [(a, b) for a in range(7) for b in range(16)])
+
+        indices, coefs = next(product_blocks(fields, block_size = 20, coefs = True))
+        self.assertEqual(coefs.shape, (20, 1 + 4))
+        self.assertTrue(np.array_equal(coefs[:, 1:], self.gf16.coef_table[indices[:, 1]]))
+        with self.assertRaises(ValueError):
+            next(product_blocks(fields, block_size = 0))
+
+
+    def testConversions(self):
+        for field in self.fields:
+            indices = np.arange(field.dim).reshape(-1, 1)
+            coefs = field.to_coefs(indices)
+            self.assertEqual(coefs.shape, (field.dim, 1, field.n))
+            self.assertTrue(np.array_equal(field.from_coefs(coefs), indices))
+
+            integers = field.to_integers(indices)
+            self.assertEqual(sorted(integers.ravel().tolist()), list(range(field.dim)))
+            self.assertTrue(np.array_equal(field.from_integers(integers), indices))
+            for i in range(field.dim):
+                self.assertEqual(int(integers[i, 0]), sum(c * field.p ** k for k, c in enumerate(field[i].exp_coefs)))
+
+            non_zero = np.arange(1, field.dim)
+            powers = field.to_powers(non_zero)
+            self.assertTrue(np.array_equal(field.from_powers(powers), non_zero))
+            self.assertTrue(np.array_equal(field.from_powers(powers + field.dim - 1), non_zero))
+            self.assertEqual(sorted(powers.tolist()), list(range(field.dim - 1)))
+            self.assertTrue(np.array_equal(field.from_powers([1, 2]), field.mul(field.from_powers([0, 1]), field.from_powers(1))))
+
+            elements = field.to_elements([[1, 2], [0, field.dim - 1]])
+            self.assertIs(elements[1][1], field[field.dim - 1])
+            self.assertTrue(np.array_equal(field.from_elements(elements), [[1, 2], [0, field.dim - 1]]))
+
+        with self.assertRaises(ValueError):
+            self.gf16.from_coefs([[0, 1, 2, 0]])
+        with self.assertRaises(ValueError):
+            self.gf16.from_coefs([[0, 1, 1]])
+        with self.assertRaises(ValueError):
+            self.gf16.from_integers([16])
+        with self.assertRaises(ValueError):
+            self.gf27.to_powers([3, 0])
+
+
+    def testConstantTimeElements(self):
+        # Elements find their index through a dict, not by searching
+        gf = self.gf27
+        field_list = gf[1].field_list
+        self.assertEqual(field_list.index(gf[13].str_rep), 13)
+        self.assertEqual(FieldElement(3, 3, gf[13].exp_coefs, field_list).prim_power, 13)
+        self.assertEqual(gf[5], GaloisField(3, 3, [1, 2, 0, 1])[5])
+        with self.assertRaises(ValueError):
+            field_list.index("7,7,7")
+
+
+class PropertyTableTests(unittest.TestCase):
+    def setUp(self):
+        self.fields = [GaloisField(7), GaloisField(2, 4, [1, 1, 0, 0, 1]), 
+                       GaloisField(3, 3, [1, 2, 0, 1])]
+
+
+    def testMatchesFieldElements(self):
+        for field in self.fields:
+            orders, norms, traces = field.orders(), field.norms(), field.traces()
+            one = field[field._one]
+            for x in list(field)[1:]:
+                powers = [x ** k for k in range(1, field.dim)]
+                self.assertEqual(orders[x.prim_power], powers.index(one) + 1)
+                self.assertEqual(traces[x.prim_power], x.tr())
+                norm = x ** ((field.dim - 1) // (field.p - 1))
+                self.assertEqual(norms[x.prim_power], norm.exp_coefs[0])
+            self.assertEqual((orders[0], norms[0], traces[0]), (0, 0, 0))
+            self.assertTrue(np.array_equal(field.orders([3, 1]), orders[[3, 1]]))
+
+
+    def testConjugacyClasses(self):
+        for field in self.fields:
+            cosets, ids = field.cyclotomic_cosets(), field.minimal_polynomial_ids()
+            polys = field.minimal_polynomials()
+            # Conjugates share their class and minimal polynomial
+            conjugates = field.power(np.arange(field.dim), field.p)
+            self.assertTrue(np.array_equal(cosets[conjugates], cosets))
+            self.assertTrue(np.array_equal(ids[conjugates], ids))
+            self.assertEqual(len(np.unique(ids)), len(polys))
+            self.assertEqual(len(np.unique(cosets)), len(polys))
+            # Every element is a root of its minimal polynomial
+            values = field.evaluate_all(polys[ids], np.arange(field.dim))
+            self.assertTrue(np.all(np.diagonal(values) == 0))
+            self.assertEqual(cosets[0], -1)
+
+        gf16 = self.fields[1]
+        self.assertEqual(len(gf16.minimal_polynomial(gf16[3]).coefs), 5)
+        self.assertEqual(len(gf16.minimal_polynomial(5).coefs), 3)   # sigma^5 is in GF(4)
+
+
+    def testLazyFields(self):
+        gf16 = self.fields[1]
+        lazy = GaloisField(2, 4, [1, 1, 0, 0, 1], memory_limit = 1000)
+        self.assertTrue(lazy.lazy)
+        for name in ["orders", "norms", "traces", "cyclotomic_cosets", "minimal_polynomial_ids"]:
+            self.assertTrue(np.array_equal(getattr(lazy, name)(), getattr(gf16, name)()))
+        self.assertEqual(lazy._element_tables, {})
+
+        big = GaloisField(2147483647, memory_limit = 1)
+        self.assertEqual(big.orders([1, 2, 2147483646]).tolist(), [1, 31, 2])
+        self.assertEqual(big.minimal_polynomial(5).coefs.tolist(), [2147483642, 1])
+
+
+class SquareRootTests(unittest.TestCase):
+    def setUp(self):
+        self.fields = [GaloisField(2), GaloisField(13), GaloisField(2, 3, [1, 1, 0, 1]),
+                       GaloisField(2, 4, [1, 1, 0, 0, 1]), GaloisField(3, 3, [1, 2, 0, 1]),
+                       GaloisField(17, memory_limit = 1)]
+
+
+    def testSquareRoots(self):
+        for field in self.fields:
+            elements = np.arange(field.dim)
+            squares = field.mul(elements, elements)
+            roots = field.sqrt(squares)
+            self.assertTrue(np.array_equal(field.mul(roots, roots), squares))
+            is_square = field.is_square(elements)
+            self.assertEqual(sorted(np.flatnonzero(is_square)), sorted(set(squares.tolist())))
+            if not np.all(is_square):
+                with self.assertRaises(ValueError):
+                    field.sqrt(elements)
+
+
+    def testLargePrimes(self):
+        # 998244353 - 1 = 119 * 2^23, which takes Tonelli-Shanks many rounds
+        for p in [998244353, 2147483647, (1 << 61) - 1]:
+            field = GaloisField(p, memory_limit = 1)
+            values = np.array([2, 3, 123456789, p - 1, 0], dtype = object)
+            roots = field.sqrt(((values * values) % p).astype(np.int64))
+            self.assertEqual(roots.tolist(), [2, 3, 123456789, 1, 0])
+
+
+    def testQuadratics(self):
+        for field in self.fields[:5]:
+            elements = np.arange(field.dim)
+            a, b, c = np.meshgrid(elements[1:], elements, elements, indexing = 'ij')
+            roots = field.solve_quadratic(a, b, c)
+            self.assertEqual(roots.shape, a.shape + (2,))
+
+            def value(x):
+                return field.add(field.add(field.mul(a, field.mul(x, x)), field.mul(b, x)), c)
+            solvable = np.zeros(a.shape, dtype = bool)
+            for x in elements:
+                solvable |= value(x) == 0
+            self.assertTrue(np.array_equal(roots[..., 0] >= 0, solvable))
+            self.assertTrue(np.all(roots[..., 1][~solvable] == -1))
+            for k in range(2):
+                self.assertTrue(np.all(value(np.where(solvable, roots[..., k], 0))[solvable] == 0))
+
+        with self.assertRaises(ValueError):
+            self.fields[2].solve_quadratic([0, 1], 1, 1)
+
+
+class EvaluateTests(unittest.TestCase):
+    def setUp(self):
+        self.gf7 = GaloisField(7)
+        self.gf8 = GaloisField(2, 3, [1, 1, 0, 1])
+
+
+    def testEvaluate(self):
+        curve = [self.gf8[2], self.gf8[3], 0, self.gf8[5]]
+        self.assertEqual(self.gf8.evaluate(curve, self.gf8[6]), self.gf8[2])
+        self.assertEqual(self.gf7.evaluate([3, 0, 1], self.gf7[2]), self.gf7[0])
+
+
+    def testCurveCache(self):
+        gf = self.gf8
+        curve = [gf[2], gf[3], 0, gf[5]]
+        values = [gf.evaluate(curve, x) for x in gf]
+        self.assertEqual(gf.curve_cache_info(), {"hits": 6, "misses": 2, "size": 1, "bytes": 8, "capacity": 1 << 24})
+        self.assertEqual(gf._curve_tables[(2, 3, 0, 5)].dtype, np.uint8)
+
+        # Trailing zeros don't make a new curve, and results match Horner's rule
+        gf.curve_cache_bytes = 0
+        self.assertEqual(values, [gf.evaluate(curve + [0], x) for x in gf])
+        gf.curve_cache_bytes = 16
+        self.assertEqual(values, [gf.evaluate(curve + [0], x) for x in gf])
+        self.assertEqual(gf.curve_cache_info()["hits"], 14)
+
+        # Curves seen once have no table, and the least recently used
+        # tables are dropped
+        gf.evaluate([1, gf[4]], gf[1])
+        self.assertEqual(len(gf._curve_tables), 1)
+        gf.evaluate([1, gf[4]], gf[2])
+        gf.evaluate(curve, gf[1])
+        gf.evaluate([gf[6]], gf[1])
+        gf.evaluate([gf[6]], gf[1])
+        self.assertEqual(list(gf._curve_tables.keys()), [(2, 3, 0, 5), (6,)])
+        self.assertEqual(gf.curve_cache_info()["misses"], 6)
+
+        # Evaluating on the whole field builds the table at once
+        gf.clear_curve_cache()
+        self.assertEqual(gf.evaluate_all([1, gf[4]]).tolist(), gf._horner(gf._curve_indices([1, gf[4]]), np.arange(8)).tolist())
+        self.assertEqual(gf.curve_cache_info(), {"hits": 0, "misses": 1, "size": 1, "bytes": 8, "capacity": 16})
+
+        # Nothing is kept over the memory ceiling
+        small = GaloisField(2, 3, [1, 1, 0, 1], memory_limit = galoisfield._eager_bytes(2, 3))
+        self.assertEqual([small.evaluate(curve, x) for x in small], values)
+        self.assertEqual(small.curve_cache_info()["size"], 0)
+
+
+    def testEvaluateAll(self):
+        curve = [self.gf8[2], self.gf8[3], 0, self.gf8[5]]
+        values = self.gf8.evaluate_all(curve)
+        self.assertEqual(values.shape, (8,))
+        for x in self.gf8:
+            self.assertEqual(self.gf8[values[x.prim_power]], self.gf8.evaluate(curve, x))
+
+        values = self.gf7.evaluate_all([3, 0, 1])
+        self.assertEqual(values.tolist(), [(3 + x * x) % 7 for x in range(7)])
+
+
+    def testEvaluateMany(self):
+        curves = [[self.gf8[2], self.gf8[3], 0, self.gf8[5]], [1, self.gf8[4]]]
+        values = self.gf8.evaluate_all(curves)
+        self.assertEqual(values.shape, (2, 8))
+        self.assertEqual(values[0].tolist(), self.gf8.evaluate_all(curves[0]).tolist())
+        self.assertEqual(values[1].tolist(), self.gf8.evaluate_all(curves[1]).tolist())
+
+        # Index arrays, evaluated at a few points only
+        values = self.gf8.evaluate_all(np.array([[2, 3, 0, 5]]), points = [6, 0])
+        self.assertEqual(values.tolist(), [[2, 2]])
+
+
+if __name__ == '__main__':
+    unittest.main()
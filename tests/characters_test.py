@@ -0,0 +1,58 @@
+import unittest
+import numpy as np
+from pynitefields import *
+
+class CharacterTests(unittest.TestCase):
+    def setUp(self):
+        self.fields = [GaloisField(7), GaloisField(2, 4, [1, 1, 0, 0, 1]),
+                       GaloisField(3, 3, [1, 2, 0, 1])]
+
+
+    def testCharacters(self):
+        for field in self.fields:
+            order = field.dim - 1
+            psi = additive_characters(field)
+            expected = [el.gchar() if field.p == 2 else el.gchar().eval() for el in field]
+            self.assertTrue(np.allclose(psi, np.array(expected, dtype = complex)))
+
+            chi = multiplicative_characters(field, np.arange(order))
+            self.assertEqual(chi.shape, (order, field.dim))
+            # Characters are homomorphisms, and vanish at 0
+            a, b = np.meshgrid(np.arange(1, field.dim), np.arange(1, field.dim))
+            self.assertTrue(np.allclose(chi[3][field.mul(a, b)], chi[3][a] * chi[3][b]))
+            self.assertTrue(np.all(chi[:, 0] == 0))
+            # Orthogonality
+            self.assertTrue(np.allclose(np.dot(chi, chi.conj().T), order * np.eye(order)))
+
+
+    def testGaussSums(self):
+        for field in self.fields:
+            order = field.dim - 1
+            sums = gauss_sums(field)
+            chi = multiplicative_characters(field, np.arange(order))
+            self.assertTrue(np.allclose(sums, np.dot(chi, additive_characters(field))))
+            self.assertTrue(np.isclose(sums[0], -1))
+            self.assertTrue(np.allclose(np.abs(sums[1:]), np.sqrt(field.dim)))
+
+
+    def testJacobiSums(self):
+        for field in self.fields:
+            order = field.dim - 1
+            chi = multiplicative_characters(field, np.arange(order))
+            complements = field.sub(field._one, np.arange(field.dim))
+            expected = np.dot(chi, chi[:, complements].T)
+            sums = jacobi_sums(field)
+            self.assertTrue(np.allclose(sums, expected))
+            self.assertTrue(np.allclose(jacobi_sums(field, 2), expected[2]))
+            self.assertTrue(np.isclose(sums[0, 0], field.dim - 2))
+
+            # J(a, b) = G(a) G(b) / G(a + b) when none of them is trivial
+            gauss = gauss_sums(field)
+            for a in range(1, order):
+                for b in range(1, order):
+                    if (a + b) % order != 0:
+                        self.assertTrue(np.isclose(sums[a, b], gauss[a] * gauss[b] / gauss[(a + b) % order]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+import numpy as np
+from pynitefields import *
+from pynitefields import discretelog
+
+class DiscreteLogTests(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.RandomState(44)
+        self.fields = [GaloisField(7), GaloisField(101),
+                       GaloisField(2, 8, [1, 0, 1, 1, 1, 0, 0, 0, 1]),
+                       GaloisField(5, 4, [2, 2, 1, 0, 1]),
+                       GaloisField(3, 5, [1, 2, 0, 0, 0, 1])]
+
+
+    def testFactorInteger(self):
+        self.assertEqual(factor_integer(1), {})
+        self.assertEqual(factor_integer(2 ** 4 * 3 * 13), {2: 4, 3: 1, 13: 1})
+        self.assertEqual(factor_integer(2 ** 64 - 1),
+                         {3: 1, 5: 1, 17: 1, 257: 1, 641: 1, 65537: 1, 6700417: 1})
+        # Two large primes, only found by rho
+        self.assertEqual(factor_integer(1000003 * 999983 * 1009), {1009: 1, 999983: 1, 1000003: 1})
+
+
+    def testMatchesTables(self):
+        for field in self.fields:
+            solver = DiscreteLog(field)
+            self.assertEqual(solver.order, field.dim - 1)
+            non_zero = np.arange(1, field.dim)
+            logs = solver.log(field.to_integers(non_zero))
+            self.assertTrue(np.array_equal(logs, field.to_powers(non_zero)))
+            self.assertTrue(np.array_equal(solver.exp(logs), field.to_integers(non_zero)))
+
+
+    def testFewBabySteps(self):
+        # 3^5 - 1 = 2 * 11^2: the giant steps do the rest of the search
+        field = self.fields[4]
+        solver = DiscreteLog(field, max_baby_steps = 2)
+        non_zero = np.arange(1, field.dim)
+        self.assertTrue(np.array_equal(solver.log(field.to_integers(non_zero)), field.to_powers(non_zero)))
+        with self.assertRaises(ValueError):
+            DiscreteLog(field, max_baby_steps = 0)
+
+
+    def testBatchesAndCache(self):
+        field = self.fields[2]
+        values = self.rng.randint(1, 256, (4, 5))
+        logs = discrete_log(field, values)
+        self.assertEqual(logs.shape, (4, 5))
+        self.assertIs(log_solver(field), log_solver(field))
+        self.assertTrue(np.array_equal(logs, field.to_powers(field.from_integers(values))))
+        with self.assertRaises(ValueError):
+            discrete_log(field, [3, 0])
+
+
+    def testLargePrimeFields(self):
+        for p in [2147483647, (1 << 61) - 1]:
+            field = GaloisField(p, memory_limit = 1)
+            values = np.array([2, 3, 123456789, p - 1], dtype = object)
+            logs = field.to_powers(values)
+            generator = log_solver(field).generator
+            self.assertEqual([pow(generator, int(k), p) for k in logs], values.tolist())
+            self.assertTrue(np.array_equal(field.from_powers(logs), values.astype(np.int64)))
+
+        # The same primitive root as the tables of eager prime fields
+        lazy = GaloisField(101, memory_limit = 1)
+        self.assertTrue(np.array_equal(lazy.to_powers(np.arange(1, 101)),
+                                       self.fields[1].to_powers(np.arange(1, 101))))
+
+
+
+    def testLargePrimeArithmetic(self):
+        # Without log tables: GF(2^61 - 1) has far too many elements for them
+        p = (1 << 61) - 1
+        field = GaloisField(p, memory_limit = 10 ** 6)
+        a = np.array([2, 3, 1 << 40, p - 1])
+        self.assertEqual(field.invert(a).tolist(), [pow(int(x), -1, p) for x in a])
+        self.assertEqual(field.power(a, -3).tolist(), [pow(int(x), -3, p) for x in a])
+        self.assertEqual(field.power(a, [0, 1, 2, 5]).tolist(), [1, 3, 1 << 19, p - 1])
+        self.assertEqual(field.power([0, 0], [0, p - 1]).tolist(), [1, 0])
+        self.assertEqual(field.div([6, 1], [3, 1 << 40]).tolist(), [2, pow(1 << 40, -1, p)])
+        roots = field.solve_quadratic(1, 0, p - 4)
+        self.assertEqual(sorted(roots.tolist()), [2, p - 2])
+        self.assertIsNone(field._prime_log)
+        with self.assertRaises(ZeroDivisionError):
+            field.invert([0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import numpy as np
+from pynitefields import * 
+from pynitefields import factorization
+
+class FactorizationTests(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.RandomState(33)
+        self.gf7 = GaloisField(7)
+        self.gf16 = GaloisField(2, 4, [1, 1, 0, 0, 1])
+        self.gf27 = GaloisField(3, 3, [1, 2, 0, 1])
+        self.gf4096 = GaloisField(2, 12, [1, 1, 0, 0, 1, 0, 1, 0, 0, 0, 0, 0, 1])
+        self.gf2187 = GaloisField(3, 7, [1, 0, 0, 0, 0, 1, 2, 1])
+        self.fields = [self.gf7, self.gf16, self.gf27, self.gf4096, self.gf2187]
+
+
+    def random(self, field, degree):
+        coefs = self.rng.randint(0, field.dim, degree + 1)
+        coefs[-1] = field._one
+        return Polynomial(field, coefs)
+
+
+    def testFactor(self):
+        for field in self.fields:
+            a, b, c = [self.random(field, d) for d in [2, 3, 4]]
+            poly = a * a * b * c ** field.p * field[3]
+            factors = factor(poly)
+
+            product = Polynomial(field, [1])
+            for irreducible, multiplicity in factors:
+                self.assertEqual(factor(irreducible), [(irreducible, 1)])
+                product = product * irreducible ** multiplicity
+            self.assertEqual(product, poly.monic())
+
+
+    def testFieldPolynomial(self):
+        # The field polynomial splits into the conjugates of the primitive element
+        gf = self.gf16
+        poly = Polynomial(gf, [1, 1, 0, 0, 1])
+        self.assertEqual([f.degree() for f, m in factor(poly)], [1, 1, 1, 1])
+        self.assertEqual(roots(poly).tolist(), [1, 2, 4, 8])
+
+        # x^2 + x + 1 splits since GF(2^12) contains GF(4), and x^2 + 1 = (x + 1)^2
+        gf = self.gf4096
+        self.assertEqual(len(factor(Polynomial(gf, [1, 1, 1]))), 2)
+        self.assertEqual(factor(Polynomial(gf, [1, 0, 1])), [(Polynomial(gf, [1, 1]), 2)])
+
+
+    def testRoots(self):
+        for field in self.fields:
+            for scan in [0, factorization.ROOT_SCAN_THRESHOLD]:
+                factorization.ROOT_SCAN_THRESHOLD = scan
+                points = np.unique(self.rng.randint(0, field.dim, 5))
+                poly = SubproductTree(field, points).root() * self.random(field, 6)
+                expected = np.nonzero(poly(np.arange(field.dim)) == 0)[0]
+                self.assertEqual(roots(poly).tolist(), expected.tolist())
+                self.assertTrue(set(points.tolist()) <= set(roots(poly).tolist()))
+            factorization.ROOT_SCAN_THRESHOLD = 256
+
+
+    def testRootsMany(self):
+        for field in [self.gf27, self.gf4096]:
+            polys = [self.random(field, d) for d in [1, 2, 5, 9, 9, 20]]
+            found = roots_many(polys)
+            for poly, poly_roots in zip(polys, found):
+                expected = np.nonzero(poly(np.arange(field.dim)) == 0)[0]
+                self.assertEqual(poly_roots.tolist(), expected.tolist())
+
+        with self.assertRaises(ValueError):
+            roots(Polynomial(self.gf7, []))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import unittest
+import itertools
+import numpy as np
+from pynitefields import * 
+from pynitefields import fieldmatrix
+
+def naive_product(field, a, b):
+    """ Multiply matrices one entry at a time with FieldElements. """
+    result = np.zeros((a.shape[0], b.shape[1]), dtype = np.int64)
+    for i in range(a.shape[0]):
+        for j in range(b.shape[1]):
+            total = field[0]
+            for k in range(a.shape[1]):
+                total = total + field[int(a[i, k])] * field[int(b[k, j])]
+            result[i, j] = total.prim_power
+    return result
+
+
+def naive_det(field, m):
+    """ The determinant as a sum over permutations. """
+    total = field[0]
+    for perm in itertools.permutations(range(len(m))):
+        inversions = sum([1 for i in range(len(m)) for j in range(i) if perm[j] > perm[i]])
+        term = field[field._one]
+        for i in range(len(m)):
+            term = term * field[int(m[i, perm[i]])]
+        total = total + (term if inversions % 2 == 0 else field[int(field.neg(term.prim_power))])
+    return total
+
+
+class FieldMatrixTests(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.RandomState(34)
+        self.gf7 = GaloisField(7)
+        self.gf16 = GaloisField(2, 4, [1, 1, 0, 0, 1])
+        self.gf27 = GaloisField(3, 3, [1, 2, 0, 1])
+        self.fields = [self.gf7, self.gf16, self.gf27]
+
+
+    def random(self, field, rows, columns):
+        return FieldMatrix(field, self.rng.randint(0, field.dim, (rows, columns)))
+
+
+    def invertible(self, field, size):
+        while True:
+            m = self.random(field, size, size)
+            if m.rank() == size:
+                return m
+
+
+    def testConstruction(self):
+        gf = self.gf16
+        m = FieldMatrix(gf, [[gf[3], 1], [0, gf[7]]])
+        self.assertEqual(m.entries.tolist(), [[3, 15], [0, 7]])
+        self.assertEqual(m[0, 1], gf[15])
+        self.assertEqual(m[1:, :].shape, (1, 2))
+        self.assertEqual(m.transpose().entries.tolist(), [[3, 0], [15, 7]])
+        self.assertEqual((m * gf[1]).entries.tolist(), [[4, 1], [0, 8]])
+
+
+    def testMatmul(self):
+        for field in self.fields + [GaloisField(65537)]:
+            for rows, inner, columns in [(1, 1, 1), (3, 5, 4), (8, 40, 6)]:
+                a, b = self.random(field, rows, inner), self.random(field, inner, columns)
+                self.assertEqual((a @ b).entries.tolist(), naive_product(field, a.entries, b.entries).tolist())
+
+        with self.assertRaises(ValueError):
+            self.random(self.gf7, 2, 3) @ self.random(self.gf7, 2, 3)
+
+
+    def testDeterminant(self):
+        for field in self.fields:
+            for size in [1, 2, 4]:
+                m = self.random(field, size, size)
+                self.assertEqual(m.det(), naive_det(field, m.entries))
+            singular = self.random(field, 4, 4)
+            singular.entries[2] = singular.entries[0]
+            self.assertEqual(singular.det(), field[0])
+
+
+    def testInverseAndSolve(self):
+        default = fieldmatrix.PANEL_WIDTH
+        for field in self.fields:
+            for width in [2, default]:
+                fieldmatrix.PANEL_WIDTH = width
+                m = self.invertible(field, 9)
+                self.assertEqual(m @ m.inverse(), FieldMatrix.identity(field, 9))
+
+                b = self.rng.randint(0, field.dim, 9)
+                x = m.solve(b)
+                self.assertEqual((m @ FieldMatrix(field, x[:, np.newaxis])).entries[:, 0].tolist(), b.tolist())
+
+                rhs = self.random(field, 9, 3)
+                self.assertEqual(m @ m.solve(rhs), rhs)
+        fieldmatrix.PANEL_WIDTH = default
+
+
+    def testSingular(self):
+        for field in self.fields:
+            m = self.random(field, 6, 8)
+            m.entries[3] = m.entries[1]
+            m.entries[:, 2] = 0
+            self.assertEqual(m.rank(), 5)
+
+            reduced, pivots = m.row_reduce()
+            self.assertEqual(reduced[:5, pivots], FieldMatrix.identity(field, 5))
+
+            kernel = m.nullspace()
+            self.assertEqual(kernel.shape, (3, 8))
+            self.assertTrue(np.all((m @ kernel.transpose()).entries == 0))
+            self.assertEqual(kernel.rank(), 3)
+
+            square = m[:, :6]
+            with self.assertRaises(ZeroDivisionError):
+                square.inverse()
+
+            b = np.zeros(6, dtype = np.int64)
+            b[3] = field._one
+            with self.assertRaises(ValueError):
+                m.solve(b)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import unittest
+import numpy as np
+from pynitefields import *
+from pynitefields import galoisfield
+
+class MemoryTests(unittest.TestCase):
+    def setUp(self):
+        self.coefs = [1, 1, 0, 0, 1]
+        self.gf16 = GaloisField(2, 4, self.coefs)
+        self.lazy16 = GaloisField(2, 4, self.coefs, memory_limit = 1000)
+
+
+    def testFieldUsage(self):
+        usage = self.gf16.memory_usage()
+        self.assertEqual(set(usage), {"elements", "field_list", "coef_table", "tables", "bases", "total"})
+        self.assertEqual(usage["total"], sum(v for k, v in usage.items() if k != "total"))
+        self.assertEqual(usage["coef_table"], 16 * 4 * 8)
+        self.assertGreater(usage["elements"], usage["field_list"])
+
+        # Tables and bases are counted once they exist
+        self.gf16.add(np.arange(16), 3)
+        self.gf16.in_basis([3, 7, 12, 13])
+        grown = self.gf16.memory_usage()
+        self.assertGreater(grown["tables"], usage["tables"])
+        self.assertGreater(grown["bases"], 0)
+
+        # The estimate used for the ceiling is of the right size
+        eager = usage["elements"] + usage["field_list"] + usage["coef_table"]
+        self.assertTrue(eager / 2 <= galoisfield._eager_bytes(2, 4) <= 2 * eager)
+
+
+    def testLazyField(self):
+        gf, lazy = self.gf16, self.lazy16
+        self.assertFalse(gf.lazy)
+        self.assertTrue(lazy.lazy)
+        self.assertTrue(np.array_equal(gf.coef_table, lazy.coef_table))
+        self.assertLess(lazy.memory_usage()["total"], gf.memory_usage()["total"] / 4)
+        self.assertEqual(lazy.memory_usage()["elements"], 0)
+
+        for i in range(16):
+            self.assertEqual(lazy[i].prim_power, i)
+            self.assertEqual(lazy[i].exp_coefs, gf[i].exp_coefs)
+            self.assertEqual((lazy[i] * lazy[5]).prim_power, (gf[i] * gf[5]).prim_power)
+            self.assertEqual((lazy[i] + lazy[5]).prim_power, (gf[i] + gf[5]).prim_power)
+            self.assertEqual((lazy[i] ** 3).prim_power, (gf[i] ** 3).prim_power)
+        self.assertEqual(lazy[7].inv().prim_power, gf[7].inv().prim_power)
+        self.assertEqual(lazy[-1], lazy[15])
+        self.assertNotEqual(lazy[3], gf[3])
+        self.assertEqual(len(list(lazy)), 16)
+
+        lazy.to_sdb([3, 7, 12, 13])
+        gf.to_sdb([3, 7, 12, 13])
+        self.assertEqual(lazy[6].sdb_coefs, gf[6].sdb_coefs)
+        lazy.to_poly()
+        self.assertEqual(lazy[6].sdb_coefs, [])
+
+
+    def testLazyPrimeField(self):
+        gf = GaloisField(2147483647, memory_limit = 10 ** 6)
+        self.assertTrue(gf.lazy)
+        self.assertLess(gf.memory_usage()["total"], 1000)
+        self.assertEqual((gf[2] * gf[1 << 30]).prim_power, 1)
+        self.assertTrue(np.array_equal(gf.mul(np.array([2, 3]), 1 << 30), [1, (3 << 30) % 2147483647]))
+
+        gf7 = GaloisField(7, memory_limit = 1)
+        self.assertEqual(gf7[3] * gf7[5], gf7[1])
+        self.assertTrue(np.array_equal(gf7.coef_table[[2, 6]], [[2], [6]]))
+
+
+    def testLargeLazyPrimeArithmetic(self):
+        # Products of elements of GF(2^61 - 1) don't fit in 64 bits
+        for p in [(1 << 61) - 1, (1 << 63) - 25]:
+            gf = GaloisField(p, memory_limit = 10 ** 6)
+            a = np.array([2, 3, 1 << 40, p - 1, 0])
+            b = np.array([1, 1 << 60, 1 << 41, p - 1, 5])
+            self.assertEqual(gf.mul(a, b).tolist(), [int(x) * int(y) % p for x, y in zip(a, b)])
+            self.assertEqual(gf.add(a, b).tolist(), [(int(x) + int(y)) % p for x, y in zip(a, b)])
+            self.assertEqual(gf.sub(a, b).tolist(), [(int(x) - int(y)) % p for x, y in zip(a, b)])
+        gf = GaloisField((1 << 61) - 1, memory_limit = 10 ** 6)
+        self.assertEqual(gf.mul([2, 1 << 40], [1, 1 << 40]).tolist(), [2, 1 << 19])
+
+
+    def testCeiling(self):
+        # The coefficients of lazy fields are stored compactly
+        gf = GaloisField(2, 10, [1, 0, 0, 1] + [0] * 6 + [1], memory_limit = 20000)
+        self.assertTrue(gf.lazy)
+        self.assertEqual(gf.memory_usage()["coef_table"], 1024 * 10)
+        with self.assertRaises(MemoryError):
+            GaloisField(2, 10, [1, 0, 0, 1] + [0] * 6 + [1], memory_limit = 10000)
+
+        # Tables that don't fit are not built, and the results are the same
+        a, b = np.arange(1024), np.arange(1024)[::-1]
+        flat = GaloisField(2, 10, [1, 0, 0, 1] + [0] * 6 + [1])
+        self.assertTrue(np.array_equal(gf.coef_table[a], flat.coef_table))
+        self.assertTrue(np.array_equal(gf.add(a, b), flat.add(a, b)))
+        self.assertTrue(np.array_equal(gf.to_integers(a), flat.to_integers(a)))
+        self.assertTrue(np.array_equal(gf.orders(), flat.orders()))
+        self.assertLessEqual(gf.memory_usage()["total"], 20000)
+
+        # Room for the elements, but not for the logarithm tables
+        prime = GaloisField(101, memory_limit = galoisfield._eager_bytes(101, 1) + 1000)
+        self.assertFalse(prime.lazy)
+        x = np.arange(1, 101)
+        self.assertTrue(np.array_equal(prime.mul(x, prime.invert(x)), np.ones(100, dtype = np.int64)))
+        self.assertTrue(np.array_equal(prime.power(x, 100), np.ones(100, dtype = np.int64)))
+        self.assertIsNone(prime._prime_log)
+
+
+    def testDefaultLimit(self):
+        old = galoisfield.DEFAULT_MEMORY_LIMIT
+        try:
+            galoisfield.DEFAULT_MEMORY_LIMIT = 1000
+            self.assertTrue(GaloisField(2, 4, self.coefs).lazy)
+            self.assertFalse(GaloisField(2, 4, self.coefs, memory_limit = 10 ** 9).lazy)
+        finally:
+            galoisfield.DEFAULT_MEMORY_LIMIT = old
+
+
+    def testNotPrimitive(self):
+        with self.assertRaises(ValueError):
+            GaloisField(2, 4, [1, 1, 1, 1, 1], memory_limit = 1000)
+
+
+    def testArrayUsage(self):
+        gf = self.gf16
+        indices = np.arange(100)
+        self.assertEqual(memory_usage(indices)["indices"], 800)
+
+        elements = [gf[1], gf[2], gf[1]]
+        usage = memory_usage(elements)
+        self.assertEqual(usage["elements"], memory_usage([gf[1], gf[2]])["elements"])
+        self.assertGreater(usage["containers"], 0)
+        self.assertEqual(usage["total"], usage["indices"] + usage["elements"] + usage["containers"])
+
+        matrix = FieldMatrix(gf, np.ones((10, 10), dtype = np.int64))
+        self.assertEqual(memory_usage(matrix)["indices"], 800)
+        self.assertEqual(memory_usage(gf), gf.memory_usage())
+        with self.assertRaises(ValueError):
+            memory_usage("abc")
+
+
+if __name__ == '__main__':
+    unittest.main()
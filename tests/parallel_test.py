@@ -0,0 +1,63 @@
+import unittest
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from pynitefields import *
+
+class ParallelTests(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.RandomState(36)
+        self.gf7 = GaloisField(7)
+        self.gf16 = GaloisField(2, 4, [1, 1, 0, 0, 1])
+        self.gf27 = GaloisField(3, 3, [1, 2, 0, 1])
+        self.fields = [self.gf7, self.gf16, self.gf27]
+        self.pool = ThreadPoolExecutor(max_workers = 4)
+
+
+    def tearDown(self):
+        self.pool.shutdown()
+
+
+    def testMul(self):
+        for field in self.fields:
+            a, b = self.rng.randint(0, field.dim, (2, 1001))
+            expected = field.mul(a, b)
+            for chunk_size in [1, 7, 1000, 5000]:
+                result = parallel_mul(field, a, b, chunk_size, self.pool)
+                self.assertTrue(np.array_equal(result, expected))
+
+
+    def testBroadcasting(self):
+        field = self.gf27
+        a = self.rng.randint(0, field.dim, (30, 1))
+        b = self.rng.randint(0, field.dim, 40)
+        result = parallel_mul(field, a, b, chunk_size = 64)
+        self.assertEqual(result.shape, (30, 40))
+        self.assertTrue(np.array_equal(result, field.mul(a, b)))
+
+
+    def testMulAdd(self):
+        for field in self.fields:
+            c, a, b = self.rng.randint(0, field.dim, (3, 50, 20))
+            result = parallel_mul_add(field, c, a, b, 33, self.pool)
+            self.assertTrue(np.array_equal(result, field.add(c, field.mul(a, b))))
+
+
+    def testMatvec(self):
+        for field in self.fields:
+            m = self.rng.randint(0, field.dim, (37, 23))
+            v = self.rng.randint(0, field.dim, 23)
+            expected = (FieldMatrix(field, m) @ FieldMatrix(field, v[:, np.newaxis])).entries[:, 0]
+            for chunk_size in [1, 50, 10000]:
+                result = parallel_matvec(field, m, v, chunk_size, self.pool)
+                self.assertTrue(np.array_equal(result, expected))
+        with self.assertRaises(ValueError):
+            parallel_matvec(self.gf7, m, v[:-1])
+
+
+    def testChunkSize(self):
+        with self.assertRaises(ValueError):
+            parallel_mul(self.gf7, [1, 2], [3, 4], chunk_size = 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+import numpy as np
+from pynitefields import * 
+from pynitefields import polynomial
+
+def naive_product(field, a, b):
+    """ Multiply polynomials one term at a time with FieldElements. """
+    result = [field[0]] * (len(a) + len(b) - 1)
+    for i in range(len(a)):
+        for j in range(len(b)):
+            result[i + j] = result[i + j] + field[int(a[i])] * field[int(b[j])]
+    return Polynomial(field, np.array([x.prim_power for x in result]))
+
+
+class PolynomialTests(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.RandomState(31)
+        self.gf7 = GaloisField(7)
+        self.gf16 = GaloisField(2, 4, [1, 1, 0, 0, 1])
+        self.gf27 = GaloisField(3, 3, [1, 2, 0, 1])
+        self.fields = [self.gf7, self.gf16, self.gf27]
+
+
+    def random(self, field, length):
+        return Polynomial(field, self.rng.randint(0, field.dim, length))
+
+
+    def testConstruction(self):
+        gf = self.gf16
+        f = Polynomial(gf, [gf[3], 1, 0, gf[0]])
+        self.assertEqual(f.coefs.tolist(), [3, 15])
+        self.assertEqual(f.degree(), 1)
+        self.assertEqual(Polynomial(gf, [0, 0]).degree(), -1)
+        self.assertEqual(f(gf[2]), gf[3] + gf[2])
+        self.assertEqual(f.monic().leading(), gf._one)
+
+
+    def testMultiplication(self):
+        for field in self.fields:
+            for length in [1, 5, 80, 150]:
+                a, b = self.random(field, length), self.random(field, length + 3)
+                self.assertEqual(a * b, naive_product(field, a.coefs, b.coefs))
+            a = self.random(field, 10)
+            self.assertEqual((a * field[2]).coefs.tolist(), field.mul(a.coefs, 2).tolist())
+            self.assertEqual(a ** 3, a * a * a)
+
+
+    def testLargeCharacteristic(self):
+        # Products too large for an exact FFT fall back to Karatsuba
+        field = GaloisField(65537)
+        a, b = self.random(field, 300), self.random(field, 200)
+        expected = np.convolve(a.coefs.astype(object), b.coefs.astype(object)) % 65537
+        self.assertEqual((a * b).coefs.tolist(), expected.tolist())
+
+        gf = self.gf27
+        a, b = self.random(gf, 300), self.random(gf, 200)
+        product = polynomial._karatsuba(gf, gf.coef_table[a.coefs], gf.coef_table[b.coefs])
+        self.assertEqual(Polynomial(gf, gf._indices_from_coefs(product)), a * b)
+
+
+    def testDivision(self):
+        for field in self.fields:
+            for la, lb in [(10, 4), (400, 150), (300, 290), (5, 9)]:
+                a, b = self.random(field, la), self.random(field, lb)
+                q, r = divmod(a, b)
+                self.assertLess(r.degree(), b.degree())
+                self.assertEqual(q * b + r, a)
+            with self.assertRaises(ZeroDivisionError):
+                divmod(a, Polynomial(field, []))
+
+
+    def testGCD(self):
+        for field in self.fields:
+            common = self.random(field, 40)
+            a = self.random(field, 400) * common
+            b = self.random(field, 380) * common
+
+            # Compare against plain Euclid
+            x, y = a, b
+            while not y.is_zero():
+                x, y = y, x % y
+            self.assertEqual(a.gcd(b), x.monic())
+            self.assertEqual((a.gcd(b) % common.monic()).degree(), -1)
+
+
+    def testModularOperations(self):
+        for field in self.fields:
+            f, g, m = self.random(field, 50), self.random(field, 30), self.random(field, 20)
+            self.assertEqual(f.pow_mod(77, m), (f ** 77) % m)
+
+            expected = Polynomial(field, [])
+            for c in f.coefs[::-1]:
+                expected = (expected * g + Polynomial(field, np.array([c]))) % m
+            self.assertEqual(f.compose_mod(g, m), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
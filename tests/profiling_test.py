@@ -0,0 +1,126 @@
+import unittest
+import numpy as np
+from pynitefields import *
+from pynitefields import profiling
+
+class ProfilingTests(unittest.TestCase):
+    def setUp(self):
+        self.gf7 = GaloisField(7)
+        self.gf16 = GaloisField(2, 4, [1, 1, 0, 0, 1])
+        self.gf256 = GaloisField(2, 8, [1, 0, 1, 1, 1, 0, 0, 0, 1])
+
+
+    def tearDown(self):
+        for gf in [self.gf7, self.gf16, self.gf256]:
+            gf.disable_profiling()
+        self.assertEqual(profiling.active, 0)
+
+
+    def testDisabledByDefault(self):
+        gf = self.gf16
+        self.assertIsNone(gf.profiler)
+        gf[3] * gf[5]
+        gf.mul(np.arange(16), np.arange(16))
+        self.assertIsNone(gf.profiler)
+        self.assertGreater(gf._construction_seconds, 0)
+
+
+    def testScalarCounts(self):
+        gf = self.gf16
+        profiler = gf.enable_profiling()
+        self.assertIs(gf.enable_profiling(), profiler)
+        gf[3] * gf[5]
+        gf[3] + gf[5]
+        gf[3] - gf[5]
+        gf[3] / gf[5]
+        gf[3] ** 4
+        gf[6].inv()
+        gf[7].gchar()
+        counts = profiler.snapshot()["counts"]
+        for name in ["mul", "add", "sub", "div", "pow", "inv", "tr", "gchar"]:
+            self.assertGreater(counts["scalar." + name], 0, name)
+        self.assertGreater(counts["element.alloc"], 0)
+        self.assertGreater(counts["lookup.field_list"], 0)
+        self.assertGreater(profiler.seconds["construction"], 0)
+
+
+    def testPrimeField(self):
+        gf = self.gf7
+        with gf.profiling() as profiler:
+            gf[3].inv()
+            gf[3] * gf[4]
+            gf.invert(np.arange(1, 7))
+        counts = profiler.snapshot()["counts"]
+        self.assertEqual(counts["scalar.mul"], 1)
+        self.assertEqual(counts["fallback.inverse_search"], 1)
+        self.assertEqual(counts["bulk.inv"], 1)
+        self.assertEqual(counts["bulk.inv.elements"], 6)
+        self.assertEqual(counts["lookup.log"], 1)
+
+        # Other fields are not affected
+        self.gf16[3] * self.gf16[4]
+        self.assertEqual(profiler.counts["scalar.mul"], 1)
+
+
+    def testBulkCounts(self):
+        gf = self.gf16
+        a = np.arange(16)
+        with gf.profiling() as profiler:
+            gf.add(a, a[::-1])
+            gf.mul(a.reshape(4, 4), 3)
+            gf.power(a, 3)
+            gf.in_basis([3, 7, 12, 13])
+        counts = profiler.counts
+        self.assertEqual(counts["bulk.add"], 1)
+        self.assertEqual(counts["bulk.add.elements"], 16)
+        self.assertEqual(counts["bulk.mul"], 1)
+        self.assertEqual(counts["bulk.mul.elements"], 16)
+        self.assertEqual(counts["bulk.pow.elements"], 16)
+        self.assertEqual(counts["lookup.zech"], 1)
+        self.assertGreater(counts["bulk.tr.elements"], 0)
+
+        # Nothing more once the block is over
+        gf.add(a, a)
+        self.assertEqual(counts["bulk.add"], 1)
+        self.assertIsNone(gf.profiler)
+
+
+    def testBuffers(self):
+        gf = self.gf256
+        data = bytearray(range(256)) * 3
+        with gf.profiling() as profiler:
+            gf.buffer_mul(data, 5)
+            gf.buffer_mul_add(bytearray(len(data)), data, 7)
+        self.assertEqual(profiler.counts["bulk.buffer_mul.elements"], 768)
+        self.assertEqual(profiler.counts["bulk.buffer_mul_add"], 1)
+        self.assertEqual(profiler.counts["lookup.bytes"], 2)
+
+
+    def testBasisConversion(self):
+        gf = self.gf16
+        with gf.profiling() as profiler:
+            gf.to_sdb([3, 7, 12, 13])
+            gf.to_poly()
+        self.assertGreater(profiler.seconds["basis_conversion"], 0)
+
+
+    def testSnapshotAndReset(self):
+        gf = self.gf16
+        profiler = gf.enable_profiling()
+        gf[2] * gf[3]
+        snapshot = profiler.snapshot()
+        gf[2] * gf[3]
+        self.assertEqual(snapshot["counts"]["scalar.mul"], 1)
+        self.assertEqual(profiler.counts["scalar.mul"], 2)
+
+        profiler.reset()
+        self.assertEqual(profiler.snapshot(), {"counts": {}, "seconds": {}})
+
+        # Nesting keeps the outer profiler running
+        with gf.profiling() as inner:
+            self.assertIs(inner, profiler)
+        self.assertIs(gf.profiler, profiler)
+
+
+if __name__ == '__main__':
+    unittest.main()
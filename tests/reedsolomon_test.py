@@ -0,0 +1,128 @@
+import unittest
+import io
+import itertools
+import numpy as np
+from pynitefields import *
+
+class ReedSolomonTests(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.RandomState(38)
+        self.gf256 = GaloisField(2, 8, [1, 0, 1, 1, 1, 0, 0, 0, 1])
+        self.gf31 = GaloisField(31)
+        self.gf27 = GaloisField(3, 3, [1, 2, 0, 1])
+
+
+    def random_bytes(self, count, length):
+        return [self.rng.randint(0, 256, length).astype(np.uint8).tobytes() for i in range(count)]
+
+
+    def testAnyKShardsDecode(self):
+        for cauchy in [False, True]:
+            code = ReedSolomon(self.gf256, 6, 4, cauchy)
+            data = self.random_bytes(6, 300)
+            shards = data + code.encode(data)
+            for trial in range(20):
+                lost = self.rng.choice(10, self.rng.randint(0, 5), replace = False)
+                decoded = code.decode([None if i in lost else shards[i] for i in range(10)])
+                self.assertEqual([bytes(shard) for shard in decoded], data)
+
+            with self.assertRaises(ValueError):
+                code.decode([None] * 5 + shards[5:])
+
+
+    def testCodewords(self):
+        # Each position is a codeword divisible by the generator polynomial
+        field = self.gf27
+        code = ReedSolomon(field, 5, 3)
+        data = list(self.rng.randint(0, field.dim, (5, 10)))
+        parity = code.encode(data)
+        for position in range(10):
+            codeword = Polynomial(field, np.array([p[position] for p in parity + data]))
+            for j in range(1, 4):
+                self.assertEqual(codeword(field.power(1, j)), 0)
+
+
+    def testMatrixCache(self):
+        first = coding_matrix(self.gf256, 10, 4)
+        self.assertIs(coding_matrix(self.gf256, 10, 4), first)
+        self.assertIs(ReedSolomon(self.gf256, 10, 4).matrix, first)
+        self.assertIsNot(coding_matrix(self.gf256, 10, 4, cauchy = True), first)
+
+
+    def testCorrectErrorsAndErasures(self):
+        code = ReedSolomon(self.gf256, 8, 6)
+        data = [bytearray(shard) for shard in self.random_bytes(8, 400)]
+        shards = data + code.encode(data)
+        for errors, erasures in [(3, 0), (2, 2), (1, 4), (0, 6)]:
+            damaged = [bytearray(shard) for shard in shards]
+            chosen = self.rng.choice(14, errors + erasures, replace = False)
+            for i in chosen[:errors]:
+                view = np.frombuffer(damaged[i], dtype = np.uint8)
+                view[self.rng.choice(400, 50, replace = False)] ^= np.uint8(self.rng.randint(1, 256))
+            for i in chosen[errors:]:
+                damaged[i] = None
+            self.assertEqual(code.correct(damaged), shards)
+
+        damaged = [bytearray(shard) for shard in shards]
+        for i in range(4):
+            damaged[i][0] ^= 1
+        with self.assertRaises(ValueError):
+            code.correct(damaged)
+        with self.assertRaises(ValueError):
+            ReedSolomon(self.gf256, 8, 6, cauchy = True).correct(shards)
+
+
+    def testAllErrataPatternsAtTheBound(self):
+        # Every mix of e errors and s erasures with 2e + s = m, on one-byte
+        # shards
+        for k, m in [(4, 4), (3, 5), (2, 6)]:
+            code = ReedSolomon(self.gf256, k, m)
+            data = [bytearray(shard) for shard in self.random_bytes(k, 1)]
+            shards = data + code.encode(data)
+            for errors in range(m // 2 + 1):
+                for erased in itertools.combinations(range(k + m), m - 2 * errors):
+                    rest = [i for i in range(k + m) if i not in erased]
+                    for wrong in itertools.combinations(rest, errors):
+                        damaged = [bytearray(shard) for shard in shards]
+                        for i in wrong:
+                            damaged[i][0] ^= self.rng.randint(1, 256)
+                        for i in erased:
+                            damaged[i] = None
+                        self.assertEqual(code.correct(damaged), shards, (k, m, erased, wrong))
+
+
+    def testIndexArrays(self):
+        for field in [self.gf31, self.gf27]:
+            code = ReedSolomon(field, 5, 6)
+            data = list(self.rng.randint(0, field.dim, (5, 40)))
+            shards = data + code.encode(data)
+            damaged = [shard.copy() for shard in shards]
+            damaged[1][3] = field.add(damaged[1][3], field._one)
+            damaged[7] = self.rng.randint(0, field.dim, 40)
+            damaged[2] = damaged[9] = None
+            for got, expected in zip(code.correct(damaged), shards):
+                self.assertTrue(np.array_equal(got, expected))
+
+
+    def testStreams(self):
+        code = ReedSolomon(self.gf256, 4, 2)
+        payload = self.rng.randint(0, 256, 10001).astype(np.uint8).tobytes()
+        stripes = list(code.encode_stream(io.BytesIO(payload), shard_size = 512))
+        self.assertEqual(len(stripes), 5)
+        self.assertTrue(all([len(shard) == 512 for stripe in stripes for shard in stripe]))
+
+        damaged = [[None if i in (0, 5) else shard for i, shard in enumerate(stripe)]
+                   for stripe in stripes]
+        self.assertEqual(b"".join(code.decode_stream(damaged, len(payload))), payload)
+        self.assertEqual(b"".join(code.decode_stream(code.encode_stream(payload, 100),
+                                                     len(payload))), payload)
+
+
+    def testLimits(self):
+        with self.assertRaises(ValueError):
+            ReedSolomon(self.gf256, 250, 6)
+        ReedSolomon(self.gf256, 250, 6, cauchy = True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import numpy as np
+from pynitefields import *
+
+class SubfieldTests(unittest.TestCase):
+    def setUp(self):
+        self.gf2 = GaloisField(2)
+        self.gf4 = GaloisField(2, 2, [1, 1, 1])
+        self.gf16 = GaloisField(2, 4, [1, 1, 0, 0, 1])
+        self.gf256 = GaloisField(2, 8, [1, 0, 1, 1, 1, 0, 0, 0, 1])
+        self.gf9 = GaloisField(3, 2, [2, 2, 1])
+        self.gf729 = GaloisField(3, 6, [2, 1, 0, 0, 0, 0, 1])
+
+
+    def testHomomorphism(self):
+        for small, large in [(self.gf4, self.gf16), (self.gf16, self.gf256), (self.gf4, self.gf256),
+                             (self.gf2, self.gf16), (self.gf9, self.gf729), (self.gf16, self.gf16)]:
+            embed = embedding(small, large)
+            a, b = np.meshgrid(np.arange(small.dim), np.arange(small.dim))
+            self.assertTrue(np.array_equal(large.mul(embed(a), embed(b)), embed(small.mul(a, b))))
+            self.assertTrue(np.array_equal(large.add(embed(a), embed(b)), embed(small.add(a, b))))
+            self.assertEqual(embed(small._one), large._one)
+            self.assertEqual(len(set(embed.table.tolist())), small.dim)
+            self.assertTrue(np.array_equal(embed.restrict(embed.table), np.arange(small.dim)))
+
+
+    def testInSubfield(self):
+        for small, large in [(self.gf4, self.gf16), (self.gf16, self.gf256), (self.gf9, self.gf729)]:
+            members = large.in_subfield(np.arange(large.dim), small.n)
+            self.assertEqual(members.sum(), small.dim)
+            self.assertTrue(np.all(members[embedding(small, large).table]))
+            # Elements of the subfield are fixed by x -> x^(p^m)
+            powers = large.power(np.arange(large.dim), small.dim)
+            self.assertTrue(np.array_equal(members, powers == np.arange(large.dim)))
+        self.assertTrue(self.gf16.in_subfield(self.gf16[0], 2))
+        with self.assertRaises(ValueError):
+            self.gf16.in_subfield([1, 2], 3)
+
+
+    def testElementsAndErrors(self):
+        embed = embedding(self.gf4, self.gf16)
+        self.assertIs(embed, embedding(self.gf4, self.gf16))
+        image = embed(self.gf4[2])
+        self.assertEqual(image, self.gf16[int(embed.table[2])])
+        self.assertEqual(embed.restrict(image), self.gf4[2])
+        self.assertEqual(embed.degree, 2)
+
+        non_member = int(np.argmin(self.gf16.in_subfield(np.arange(16), 2)))
+        with self.assertRaises(ValueError):
+            embed.restrict([non_member])
+        with self.assertRaises(ValueError):
+            Embedding(self.gf4, self.gf729)
+        with self.assertRaises(ValueError):
+            Embedding(self.gf16, self.gf9)
+
+
+if __name__ == '__main__':
+    unittest.main()
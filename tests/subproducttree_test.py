@@ -0,0 +1,57 @@
+import unittest
+import numpy as np
+from pynitefields import * 
+
+class SubproductTreeTests(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.RandomState(32)
+        self.gf7 = GaloisField(7)
+        self.gf16 = GaloisField(2, 4, [1, 1, 0, 0, 1])
+        self.gf27 = GaloisField(3, 3, [1, 2, 0, 1])
+        self.fields = [self.gf7, self.gf16, self.gf27]
+
+
+    def testEvaluate(self):
+        for field in self.fields:
+            points = self.rng.permutation(field.dim)[:field.dim - 2]
+            tree = SubproductTree(field, points)
+            for length in [0, 1, 10, 200]:
+                f = Polynomial(field, self.rng.randint(0, field.dim, length))
+                self.assertEqual(tree.evaluate(f).tolist(), f(points).tolist())
+
+
+    def testRoot(self):
+        gf = self.gf16
+        root = SubproductTree(gf, [gf[3], gf[5]]).root()
+        self.assertEqual(root, Polynomial(gf, [gf[3], 1]) * Polynomial(gf, [gf[5], 1]))  # -a = a in characteristic 2
+
+
+    def testInterpolate(self):
+        for field in self.fields:
+            for count in [1, 4, field.dim]:
+                points = self.rng.permutation(field.dim)[:count]
+                values = self.rng.randint(0, field.dim, count)
+                f = interpolate(field, points, values)
+                self.assertLess(f.degree(), count)
+                self.assertEqual(f(points).tolist(), values.tolist())
+
+
+    def testLargeField(self):
+        gf = GaloisField(2, 12, [1, 1, 0, 0, 1, 0, 1, 0, 0, 0, 0, 0, 1])
+        points = np.arange(gf.dim)
+        f = Polynomial(gf, self.rng.randint(0, gf.dim, 3000))
+        tree = SubproductTree(gf, points)
+        values = tree.evaluate(f)
+        self.assertEqual(values[:50].tolist(), f(points[:50]).tolist())
+        self.assertEqual(tree.interpolate(values), f)
+
+
+    def testInvalidPoints(self):
+        with self.assertRaises(ValueError):
+            interpolate(self.gf7, [1, 2, 1], [3, 4, 5])
+        with self.assertRaises(ValueError):
+            interpolate(self.gf7, [1, 2], [3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import numpy as np
+from pynitefields import *
+from pynitefields import towerfield
+
+class TowerFieldTests(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.RandomState(46)
+        self.gf3 = GaloisField(3)
+        self.gf4 = GaloisField(2, 2, [1, 1, 1])
+        self.gf9 = GaloisField(3, 2, [2, 2, 1])
+        self.gf16 = GaloisField(2, 4, [1, 1, 0, 0, 1])
+        self.gf256 = GaloisField(2, 8, [1, 0, 1, 1, 1, 0, 0, 0, 1])
+        self.gf729 = GaloisField(3, 6, [2, 1, 0, 0, 0, 0, 1])
+        # (tower, flat field of the same order)
+        self.pairs = [(self.gf4.extend([1, 1, 3]), self.gf16),
+                      (self.gf16.extend([1, 1, 15]), self.gf256),
+                      (self.gf9.extend([1, 0, 1, 8]), self.gf729),
+                      (self.gf3.extend([1, 0, 1]), self.gf9)]
+
+
+    def testIsomorphism(self):
+        for tower, flat in self.pairs:
+            self.assertEqual(tower.dim, flat.dim)
+            indices = np.arange(flat.dim)
+            elements = tower.from_flat(indices, flat)
+            self.assertEqual(elements.shape, (flat.dim, tower.degree))
+            self.assertTrue(np.array_equal(tower.to_flat(elements, flat), indices))
+            self.assertIs(tower.isomorphism(flat), tower.isomorphism(flat))
+
+            a = self.rng.randint(0, flat.dim, 200)
+            b = self.rng.randint(0, flat.dim, 200)
+            x, y = tower.from_flat(a, flat), tower.from_flat(b, flat)
+            self.assertTrue(np.array_equal(tower.to_flat(tower.mul(x, y), flat), flat.mul(a, b)))
+            self.assertTrue(np.array_equal(tower.to_flat(tower.add(x, y), flat), flat.add(a, b)))
+            self.assertTrue(np.array_equal(tower.to_flat(tower.sub(x, y), flat), flat.sub(a, b)))
+
+
+    def testInversionAndFrobenius(self):
+        for tower, flat in self.pairs:
+            non_zero = tower.from_flat(np.arange(1, flat.dim), flat)
+            inverses = tower.invert(non_zero)
+            self.assertTrue(np.array_equal(tower.mul(non_zero, inverses), tower.one((flat.dim - 1,))))
+            self.assertTrue(np.array_equal(tower.to_flat(inverses, flat), flat.invert(np.arange(1, flat.dim))))
+            self.assertTrue(np.array_equal(tower.frobenius(non_zero), tower.power(non_zero, tower.base.dim)))
+            # Norms lie in the base field, and are multiplicative
+            norms = tower.norm(non_zero)
+            self.assertTrue(np.all(norms != 0))
+            self.assertTrue(np.array_equal(tower.norm(tower.mul(non_zero, inverses)),
+                                           np.full(flat.dim - 1, tower.base._one)))
+            with self.assertRaises(ZeroDivisionError):
+                tower.invert(tower.zero((2,)))
+
+
+    def testStorageAndTables(self):
+        tower = self.gf16.extend([1, 1, 15])
+        x = tower.from_flat(np.arange(1, 256), self.gf256)
+        self.assertEqual(x.dtype, np.uint8)
+        self.assertEqual(tower.mul(x, x).dtype, np.uint8)
+
+        # Base fields too large for tables use their own arithmetic
+        old = towerfield.TABLE_SIZE
+        try:
+            towerfield.TABLE_SIZE = 0
+            untabled = self.gf16.extend([1, 1, 15])
+        finally:
+            towerfield.TABLE_SIZE = old
+        self.assertIsNone(untabled._mul_table)
+        y = x[::-1]
+        self.assertTrue(np.array_equal(untabled.mul(x, y), tower.mul(x, y)))
+        self.assertTrue(np.array_equal(untabled.invert(x), tower.invert(x)))
+        self.assertTrue(np.array_equal(untabled.norm(x), tower.norm(x)))
+        self.assertTrue(np.array_equal(untabled.sub(x, y), tower.sub(x, y)))
+
+
+    def testErrors(self):
+        with self.assertRaises(ValueError):
+            self.gf4.extend([3, 0, 3])  # (x + 1)^2
+        with self.assertRaises(ValueError):
+            self.gf4.extend([1, 1, 2])  # Not monic
+        with self.assertRaises(ValueError):
+            self.gf4.extend([1, 1, 3]).isomorphism(self.gf256)
+
+
+if __name__ == '__main__':
+    unittest.main()